@@ -0,0 +1,28 @@
+"""Paintings (year, id) index for keyset pagination
+
+Revision ID: 5c1d7e2a9f41
+Revises: 3bb9ed2393b0
+Create Date: 2026-10-17 10:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d7e2a9f41'
+down_revision: Union[str, Sequence[str], None] = '3bb9ed2393b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_paintings_year_id', 'paintings', ['year', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_paintings_year_id', table_name='paintings')
@@ -0,0 +1,37 @@
+"""Trigram index on artists.artist_short_name
+
+Revision ID: 8e4b0f6c2d17
+Revises: 5c1d7e2a9f41
+Create Date: 2026-10-17 11:02:47.905361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b0f6c2d17'
+down_revision: Union[str, Sequence[str], None] = '5c1d7e2a9f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_artists_short_name_trgm',
+        'artists',
+        ['artist_short_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'artist_short_name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_artists_short_name_trgm', table_name='artists')
+    # Расширение не удаляется: им могут пользоваться другие объекты базы
@@ -0,0 +1,66 @@
+"""Museum collection summaries and museums country/city index
+
+Revision ID: a6e9d3f1b824
+Revises: f1c3b7d92a40
+Create Date: 2026-10-17 17:40:52.117390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e9d3f1b824'
+down_revision: Union[str, Sequence[str], None] = 'f1c3b7d92a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'museum_collection_summaries',
+        sa.Column('museum_id', sa.Integer(), nullable=False),
+        sa.Column('painting_count', sa.Integer(), nullable=False),
+        sa.Column('first_year', sa.Integer(), nullable=True),
+        sa.Column('last_year', sa.Integer(), nullable=True),
+        sa.Column('top_genres', sa.JSON(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['museum_id'], ['museums.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('museum_id'),
+    )
+    op.create_index('ix_museums_country_city', 'museums', ['country', 'city'], unique=False)
+
+    # Те же сводки, что строит app.summaries: три самых частых жанра по убыванию числа картин
+    op.execute(
+        """
+        INSERT INTO museum_collection_summaries (museum_id, painting_count, first_year, last_year, top_genres)
+        SELECT
+            p.museum_id,
+            count(*),
+            min(p.year),
+            max(p.year),
+            coalesce((
+                SELECT json_agg(json_build_object('genre', g.genre, 'count', g.n) ORDER BY g.n DESC, g.genre)
+                FROM (
+                    SELECT genre, count(*) AS n
+                    FROM paintings
+                    WHERE museum_id = p.museum_id AND genre IS NOT NULL
+                    GROUP BY genre
+                    ORDER BY n DESC, genre
+                    LIMIT 3
+                ) g
+            ), '[]'::json)
+        FROM paintings p
+        WHERE p.museum_id IS NOT NULL
+        GROUP BY p.museum_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_museums_country_city', table_name='museums')
+    op.drop_table('museum_collection_summaries')
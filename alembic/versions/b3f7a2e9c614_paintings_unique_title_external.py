@@ -0,0 +1,33 @@
+"""Paintings flag for unique_title set by catalogue sync
+
+Revision ID: b3f7a2e9c614
+Revises: e5b9d1c3a872
+Create Date: 2026-10-17 21:05:12.338471
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7a2e9c614'
+down_revision: Union[str, Sequence[str], None] = 'e5b9d1c3a872'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'paintings',
+        sa.Column('unique_title_external', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    # Строки, уже записанные синхронизацией, узнаются по content_hash
+    op.execute("UPDATE paintings SET unique_title_external = true WHERE content_hash IS NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('paintings', 'unique_title_external')
@@ -0,0 +1,35 @@
+"""Pattern index on paintings.unique_title for prefix lookups
+
+Revision ID: b7a3c91e5f08
+Revises: 8e4b0f6c2d17
+Create Date: 2026-10-17 11:48:10.227164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a3c91e5f08'
+down_revision: Union[str, Sequence[str], None] = '8e4b0f6c2d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс уникальности использует правила сортировки базы и не подходит для LIKE 'prefix%'
+    op.create_index(
+        'ix_paintings_unique_title_pattern',
+        'paintings',
+        ['unique_title'],
+        unique=False,
+        postgresql_ops={'unique_title': 'varchar_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_paintings_unique_title_pattern', table_name='paintings')
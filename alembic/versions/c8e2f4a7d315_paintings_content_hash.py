@@ -0,0 +1,29 @@
+"""Paintings content hash for idempotent upserts by unique_title
+
+Revision ID: c8e2f4a7d315
+Revises: a6e9d3f1b824
+Create Date: 2026-10-17 18:52:03.481206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f4a7d315'
+down_revision: Union[str, Sequence[str], None] = 'a6e9d3f1b824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Без бэкфилла: NULL не совпадает ни с одним хэшем, первая синхронизация запишет строки
+    op.add_column('paintings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('paintings', 'content_hash')
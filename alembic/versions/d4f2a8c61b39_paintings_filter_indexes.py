@@ -0,0 +1,71 @@
+"""Filter indexes on paintings and jsonb style/materials
+
+Revision ID: d4f2a8c61b39
+Revises: b7a3c91e5f08
+Create Date: 2026-10-17 14:05:31.508214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f2a8c61b39'
+down_revision: Union[str, Sequence[str], None] = 'b7a3c91e5f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # json не поддерживает ни @>, ни GIN-индексы
+    for column in ('style', 'materials'):
+        op.alter_column(
+            'paintings',
+            column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb',
+        )
+
+    # year уже ведущая колонка ix_paintings_year_id, отдельный индекс не нужен
+    op.create_index('ix_paintings_artist_id', 'paintings', ['artist_id'], unique=False)
+    op.create_index('ix_paintings_museum_id', 'paintings', ['museum_id'], unique=False)
+    op.create_index('ix_paintings_genre', 'paintings', ['genre'], unique=False)
+    op.create_index(
+        'ix_paintings_style_gin',
+        'paintings',
+        ['style'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'style': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_paintings_materials_gin',
+        'paintings',
+        ['materials'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'materials': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_paintings_materials_gin', table_name='paintings')
+    op.drop_index('ix_paintings_style_gin', table_name='paintings')
+    op.drop_index('ix_paintings_genre', table_name='paintings')
+    op.drop_index('ix_paintings_museum_id', table_name='paintings')
+    op.drop_index('ix_paintings_artist_id', table_name='paintings')
+
+    for column in ('style', 'materials'):
+        op.alter_column(
+            'paintings',
+            column,
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json',
+        )
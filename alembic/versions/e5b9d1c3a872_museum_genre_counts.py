@@ -0,0 +1,45 @@
+"""Museum genre counts for incremental collection summaries
+
+Revision ID: e5b9d1c3a872
+Revises: c8e2f4a7d315
+Create Date: 2026-10-17 20:14:36.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9d1c3a872'
+down_revision: Union[str, Sequence[str], None] = 'c8e2f4a7d315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'museum_genre_counts',
+        sa.Column('museum_id', sa.Integer(), nullable=False),
+        sa.Column('genre', sa.String(length=100), nullable=False),
+        sa.Column('painting_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['museum_id'], ['museums.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('museum_id', 'genre'),
+    )
+
+    op.execute(
+        """
+        INSERT INTO museum_genre_counts (museum_id, genre, painting_count)
+        SELECT museum_id, genre, count(*)
+        FROM paintings
+        WHERE museum_id IS NOT NULL AND genre IS NOT NULL
+        GROUP BY museum_id, genre
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('museum_genre_counts')
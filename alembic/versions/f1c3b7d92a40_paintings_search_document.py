@@ -0,0 +1,59 @@
+"""Search document, tsvector and trigram indexes on paintings
+
+Revision ID: f1c3b7d92a40
+Revises: d4f2a8c61b39
+Create Date: 2026-10-17 16:12:08.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3b7d92a40'
+down_revision: Union[str, Sequence[str], None] = 'd4f2a8c61b39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('paintings', sa.Column('search_document', sa.Text(), nullable=True))
+
+    # Тот же текст, что app.search.search_document: название, жанр, период, имя художника
+    op.execute(
+        """
+        UPDATE paintings
+        SET search_document = coalesce(title, '') || ' ' || coalesce(genre, '') || ' '
+            || coalesce(period, '') || ' '
+            || coalesce((SELECT artist_long_name FROM artists WHERE artists.id = paintings.artist_id), '')
+        """
+    )
+
+    op.execute(
+        """
+        ALTER TABLE paintings ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('russian'::regconfig, coalesce(search_document, ''))
+            || to_tsvector('simple'::regconfig, coalesce(search_document, ''))
+        ) STORED
+        """
+    )
+    op.create_index('ix_paintings_search_vector', 'paintings', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_paintings_search_document_trgm',
+        'paintings',
+        ['search_document'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_document': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_paintings_search_document_trgm', table_name='paintings')
+    op.drop_index('ix_paintings_search_vector', table_name='paintings')
+    op.drop_column('paintings', 'search_vector')
+    op.drop_column('paintings', 'search_document')
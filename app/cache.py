@@ -0,0 +1,159 @@
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+from app.metrics import cache_lookup_counters
+
+class CacheBackend(ABC):
+    """Интерфейс хранилища кэша.
+
+    Реализация по умолчанию - TTLCache в памяти процесса; внешнее хранилище
+    (например, общее для всех воркеров) подключается через ResponseCache.configure().
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Значение по ключу или None, если его нет или оно устарело"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение по ключу"""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Удаляет значение по ключу, если оно есть"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удаляет все значения"""
+
+class TTLCache(CacheBackend):
+    """Потокобезопасный LRU-кэш в памяти процесса с временем жизни записей.
+
+    Если задано name, попадания и промахи учитываются в метрике cache_lookups.
+    generation увеличивается при каждом clear(), как у ResponseCache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits, self._misses = cache_lookup_counters(name) if name else (None, None)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._get(key)
+        if self._hits is not None:
+            (self._misses if value is None else self._hits).inc()
+        return value
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Сохраняет значение.
+
+        generation - значение self.generation на момент начала чтения из базы:
+        если с тех пор кэш сбрасывался записью, значение могло устареть и не сохраняется.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+class ResponseCache:
+    """Кэш сериализованных JSON-ответов со строгими ETag"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.generation = 0
+
+    def configure(self, backend: CacheBackend) -> None:
+        """Подменяет хранилище, например на общее для нескольких воркеров"""
+        self.backend = backend
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        value = self.backend.get(key)
+        return CachedResponse(*value) if value is not None else None
+
+    def set(self, key: Hashable, body: bytes, generation: Optional[int] = None) -> CachedResponse:
+        """Сохраняет ответ и возвращает его с ETag.
+
+        generation - значение self.generation на момент начала чтения из базы:
+        если с тех пор кэш сбрасывался записью, ответ мог устареть и не сохраняется.
+        """
+        cached = CachedResponse(body, make_etag(body))
+        if generation is None or generation == self.generation:
+            self.backend.set(key, tuple(cached))
+        return cached
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.backend.clear()
+
+def make_etag(body: bytes) -> str:
+    """Строгий ETag по содержимому: одинаковые ответы разных воркеров совпадают"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверка If-None-Match (слабое сравнение, RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+# Количество картин по нормализованному набору фильтров. Сбрасывается при
+# любой записи в paintings этого процесса; TTL ограничивает устаревание
+# из-за записей, сделанных другими воркерами.
+count_cache = TTLCache(
+    maxsize=int(os.getenv("COUNT_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("COUNT_CACHE_TTL", "30")),
+    name="paintings_count",
+)
+
+# Готовые JSON-ответы чтения картин (список и детальная карточка)
+response_cache = ResponseCache(TTLCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_MAXSIZE", "2048")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "60")),
+    name="paintings_response",
+))
+
+def invalidate_painting_caches() -> None:
+    """Сбрасывает все кэши, зависящие от таблицы paintings"""
+    count_cache.clear()
+    response_cache.clear()
@@ -1,20 +1,219 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
+import bisect
 import os
+import threading
+import time
+
+from .metrics import (
+    DB_POOL_CAPACITY,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+    POOL_WAIT_BUCKETS,
+)
+from .slow_queries import instrument_slow_queries
+from .timing import instrument_engine, record_pool_wait
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Подставляет асинхронный драйвер в URL базы данных.
+
+    postgresql://... -> postgresql+asyncpg://..., sqlite://... -> sqlite+aiosqlite://...
+    Явно указанный драйвер (например, postgresql+psycopg2) заменяется.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+# Параметры пула соединений. Значения по умолчанию совпадают с SQLAlchemy;
+# размер пула задается на воркер, т.е. к базе открывается до
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) соединений.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", False)
+
+class PoolMetrics:
+    """Счетчики пула соединений приложения.
+
+    Число выдач и возвратов собирается событиями пула checkout/checkin,
+    ожидание соединения и таймауты - в InstrumentedAsyncQueuePool.connect().
+    Те же события обновляют метрики Prometheus, общие для всех воркеров.
+    """
+
+    WAIT_BUCKETS = POOL_WAIT_BUCKETS
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_sum = 0.0
+            self.wait_bucket_counts = [0] * (len(self.WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_bucket_counts[bisect.bisect_left(self.WAIT_BUCKETS, seconds)] += 1
+        DB_POOL_WAIT.observe(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        DB_POOL_TIMEOUTS.inc()
+
+    def instrument(self, pool) -> None:
+        @event.listens_for(pool, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+            DB_POOL_CHECKOUTS.inc()
+            DB_POOL_CHECKED_OUT.inc()
+
+        @event.listens_for(pool, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+            DB_POOL_CHECKED_OUT.dec()
+
+    def snapshot(self, pool) -> dict:
+        """Текущее состояние пула и накопленные счетчики.
+
+        Гистограмма ожидания кумулятивная, как в Prometheus: le -> число
+        выдач, ждавших не дольше le секунд.
+        """
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip((*self.WAIT_BUCKETS, "+Inf"), self.wait_bucket_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            stats = {
+                "checkouts_total": self.checkouts,
+                "checkins_total": self.checkins,
+                "timeouts_total": self.timeouts,
+                "wait_seconds": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum, 6),
+                    "buckets": buckets,
+                },
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": POOL_MAX_OVERFLOW,
+            })
+        return stats
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул asyncio-движка, замеряющий ожидание свободного соединения"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            pool_metrics.observe_wait(waited)
+            record_pool_wait(waited)
+
+def _pool_options(url: str, poolclass=None) -> dict:
+    # Для SQLite диалект сам выбирает подходящий пул (NullPool/StaticPool)
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    options = {
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+    if poolclass is not None:
+        options["poolclass"] = poolclass
+    return options
+
+# Синхронный движок нужен скриптам (seed_database.py, Alembic),
+# приложение работает через асинхронный.
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_pool_options(ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool)
+)
+pool_metrics.instrument(async_engine.sync_engine.pool)
+if isinstance(async_engine.sync_engine.pool, QueuePool):
+    DB_POOL_CAPACITY.set(POOL_SIZE + POOL_MAX_OVERFLOW)
+instrument_engine(async_engine.sync_engine)
+instrument_slow_queries(async_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+def _unicode_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+def register_sqlite_functions(sync_engine) -> None:
+    """Выравнивает поведение SQLite с PostgreSQL там, где на это полагаются запросы.
+
+    Встроенная lower() в SQLite меняет регистр только у ASCII, поэтому ILIKE
+    (в SQLite это lower(x) LIKE lower(y)) не находит "Гончарова" по "гончарова".
+    Функция переопределяется на соединении версией, понимающей Unicode.
+    """
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("lower", 1, _unicode_lower, deterministic=True)
+
+register_sqlite_functions(engine)
+register_sqlite_functions(async_engine.sync_engine)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+def get_pool_metrics() -> dict:
+    return pool_metrics.snapshot(async_engine.sync_engine.pool)
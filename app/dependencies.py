@@ -1 +1,37 @@
-from app.database import get_db
\ No newline at end of file
+from typing import List, Optional
+
+from fastapi import HTTPException, Query
+
+from app import schemas
+from app.database import get_db
+
+def get_painting_filters(
+    artist_name: Optional[str] = Query(None, description="Фильтр по фамилии художника (частичное совпадение)"),
+    genre: Optional[str] = Query(None, description="Жанр (точное совпадение)"),
+    type: Optional[str] = Query(None, description="Тип (точное совпадение)"),
+    year_from: Optional[int] = Query(None, description="Год создания не раньше"),
+    year_to: Optional[int] = Query(None, description="Год создания не позже"),
+    artist_id: Optional[int] = Query(None, description="ID художника"),
+    museum_id: Optional[int] = Query(None, description="ID музея"),
+    style: Optional[List[str]] = Query(None, description="Стиль; при повторении - картины со всеми стилями"),
+    materials: Optional[List[str]] = Query(None, description="Материал; при повторении - картины со всеми материалами"),
+) -> schemas.PaintingFilters:
+    """Фильтры списка картин из query-параметров.
+
+    Исключения:
+    - 400: Если year_from больше year_to
+    """
+    if year_from is not None and year_to is not None and year_from > year_to:
+        raise HTTPException(status_code=400, detail="year_from не может быть больше year_to")
+
+    return schemas.PaintingFilters(
+        artist_name=artist_name or None,
+        genre=genre,
+        type=type,
+        year_from=year_from,
+        year_to=year_to,
+        artist_id=artist_id,
+        museum_id=museum_id,
+        style=style or None,
+        materials=materials or None,
+    )
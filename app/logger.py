@@ -1,36 +1,73 @@
 import functools
 import logging
+import os
+import random
 from typing import Any, Callable
 
+from app.timing import current_timings
+
+# Доля вызовов, для которых пишутся записи о начале и успешном завершении.
+# Ошибки логируются всегда.
+LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "1.0"))
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f"app.{name}")
 
+def _sample_success() -> bool:
+    return LOG_SUCCESS_SAMPLE_RATE >= 1.0 or random.random() < LOG_SUCCESS_SAMPLE_RATE
+
+def _start_timing(route: str) -> None:
+    timings = current_timings()
+    if timings is not None:
+        timings.route = route
+
+def _timing_fields() -> dict:
+    """Замеры запроса для extra записи лога (пусто вне HTTP-запроса)"""
+    timings = current_timings()
+    return timings.as_fields() if timings is not None else {}
+
+def _format_timing(fields: dict) -> str:
+    if not fields:
+        return ""
+    return f" за {fields['duration_ms']} мс (SQL: {fields['db_queries']} запр., {fields['db_ms']} мс)"
+
 def log_execution(logger_name: str = None):
     def decorator(func: Callable) -> Callable:
-        logger = get_logger(logger_name or func.__module__)
+        route = logger_name or func.__module__
+        logger = get_logger(route)
         
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            logger.info(f"🚀 Начало выполнения {func.__name__}")
+            _start_timing(route)
+            sampled = _sample_success()
+            if sampled:
+                logger.info(f"🚀 Начало выполнения {func.__name__}")
             
             try:
                 result = await func(*args, **kwargs)
-                logger.info(f"✅ Успешное завершение {func.__name__}")
+                if sampled:
+                    fields = _timing_fields()
+                    logger.info(f"✅ Успешное завершение {func.__name__}{_format_timing(fields)}", extra=fields)
                 return result
             except Exception as e:
-                logger.error(f"❌ Ошибка в {func.__name__}: {str(e)}", exc_info=True)
+                logger.error(f"❌ Ошибка в {func.__name__}: {str(e)}", exc_info=True, extra=_timing_fields())
                 raise
         
         @functools.wraps(func)  
         def sync_wrapper(*args, **kwargs):
-            logger.info(f"🚀 Начало выполнения {func.__name__}")
+            _start_timing(route)
+            sampled = _sample_success()
+            if sampled:
+                logger.info(f"🚀 Начало выполнения {func.__name__}")
             
             try:
                 result = func(*args, **kwargs)
-                logger.info(f"✅ Успешное завершение {func.__name__}")
+                if sampled:
+                    fields = _timing_fields()
+                    logger.info(f"✅ Успешное завершение {func.__name__}{_format_timing(fields)}", extra=fields)
                 return result
             except Exception as e:
-                logger.error(f"❌ Ошибка в {func.__name__}: {str(e)}", exc_info=True)
+                logger.error(f"❌ Ошибка в {func.__name__}: {str(e)}", exc_info=True, extra=_timing_fields())
                 raise
         
         if func.__code__.co_flags & 0x80: 
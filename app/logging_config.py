@@ -1,6 +1,9 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 from pathlib import Path
 
 log_dir = Path("logs")
@@ -38,6 +41,15 @@ LOGGING_CONFIG = {
             "backupCount": 5,
             "encoding": "utf8"
         },
+        "slow_query_file": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "level": "WARNING",
+            "formatter": "default",
+            "filename": "logs/slow_queries.log",
+            "maxBytes": 10485760,  # 10MB
+            "backupCount": 5,
+            "encoding": "utf8"
+        },
         "console": {
             "class": "logging.StreamHandler",
             "level": "INFO",
@@ -52,6 +64,11 @@ LOGGING_CONFIG = {
             "handlers": ["console", "file", "error_file"],
             "propagate": False
         },
+        "app.sql.slow": {
+            "level": "WARNING",
+            "handlers": ["console", "slow_query_file"],
+            "propagate": False
+        },
         "uvicorn": {
             "level": "INFO",
             "handlers": ["console", "file"],
@@ -65,5 +82,77 @@ LOGGING_CONFIG = {
     }
 }
 
-def setup_logging():
-    logging.config.dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+# Запись в файлы и консоль выполняется фоновым потоком QueueListener,
+# а обработчик запроса только кладет запись в ограниченную очередь.
+LOG_QUEUE_ENABLED = _env_flag("LOG_QUEUE_ENABLED", True)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# drop  - при переполнении отбрасывать записи ниже WARNING (WARNING и выше ждут места)
+# block - ждать места в очереди для любой записи
+LOG_QUEUE_OVERFLOW = os.getenv("LOG_QUEUE_OVERFLOW", "drop")
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler с ограниченной очередью и явной политикой переполнения"""
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop"):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Неизвестная политика переполнения очереди логов: {overflow}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._unreported_drops = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block" or record.levelno >= logging.WARNING:
+            self.queue.put(record)
+        else:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                self._unreported_drops += 1
+                return
+
+        if self._unreported_drops:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+            self.queue.put(self.prepare(logging.makeLogRecord({
+                "name": record.name,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"⚠️ Очередь логов переполнена, пропущено записей: {dropped}",
+            })))
+
+_listeners = []
+
+def _start_queue_listener(logger: logging.Logger) -> None:
+    """Переносит обработчики логгера в фоновый поток за BoundedQueueHandler"""
+    handlers = list(logger.handlers)
+    if not handlers:
+        return
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(BoundedQueueHandler(log_queue, LOG_QUEUE_OVERFLOW))
+    listener.start()
+    _listeners.append(listener)
+
+def stop_logging() -> None:
+    """Дописывает накопленные в очередях записи и останавливает фоновые потоки"""
+    while _listeners:
+        _listeners.pop().stop()
+
+def setup_logging(use_queue: bool = LOG_QUEUE_ENABLED, config: dict = None):
+    config = config or LOGGING_CONFIG
+    stop_logging()
+    logging.config.dictConfig(config)
+
+    if use_queue:
+        for name in config["loggers"]:
+            _start_queue_listener(logging.getLogger(name))
+        _start_queue_listener(logging.getLogger())
+
+atexit.register(stop_logging)
\ No newline at end of file
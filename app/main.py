@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 import logging
 
-from .database import get_db
+from .database import get_db, get_pool_metrics
 from .logging_config import setup_logging
+from .metrics import MetricsMiddleware, render_metrics
+from .timing import ServerTimingMiddleware
 from app.logger import log_execution
-from app.routers import paintings
+from app.routers import artists, museums, paintings
 
 setup_logging()  
 logger = logging.getLogger("app.main")
@@ -14,10 +16,23 @@ app = FastAPI(
     description="API для галереи картин",
     version="1.0.0"
 )
+# ServerTimingMiddleware - внешний: MetricsMiddleware берет имя маршрута из его замеров
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ServerTimingMiddleware)
 
 @app.get("/")
 @log_execution("root")
 async def root():
     return {"message": "Добро пожаловать в Art Gallery API!"}
 
-app.include_router(paintings.router)
\ No newline at end of file
+@app.get("/metrics/pool", summary="Состояние пула соединений с базой данных")
+async def pool_metrics():
+    return get_pool_metrics()
+
+@app.get("/metrics", summary="Метрики Prometheus", include_in_schema=False)
+async def metrics():
+    return render_metrics()
+
+app.include_router(paintings.router)
+app.include_router(artists.router)
+app.include_router(museums.router)
\ No newline at end of file
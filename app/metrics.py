@@ -0,0 +1,130 @@
+"""Метрики Prometheus.
+
+Счетчики и гистограммы prometheus_client копят значения в памяти воркера
+без обращения к сети и к базе. При нескольких воркерах uvicorn нужно задать
+PROMETHEUS_MULTIPROC_DIR (пустой каталог, до запуска процессов): значения
+пишутся в mmap-файлы каталога, а /metrics суммирует их по всем воркерам.
+"""
+import atexit
+import os
+import time
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.timing import current_timings
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+HTTP_REQUESTS = Counter(
+    "http_requests",
+    "Число HTTP-запросов",
+    ["route", "method", "status"],
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "http_request_errors",
+    "Число HTTP-запросов, завершившихся ошибкой сервера (5xx)",
+    ["route", "method", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса до отправки заголовков ответа",
+    ["route", "method"],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Соединения, выданные из пула",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Максимум соединений пула (pool_size + max_overflow)",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts", "Выдачи соединений из пула")
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts", "Таймауты ожидания соединения из пула")
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Ожидание свободного соединения из пула",
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Обращения к кэшам; доля попаданий - rate(hit) / rate(hit + miss)",
+    ["cache", "result"],
+)
+
+def cache_lookup_counters(cache: str):
+    """Счетчики (hit, miss) кэша с заранее привязанными метками"""
+    return CACHE_LOOKUPS.labels(cache, "hit"), CACHE_LOOKUPS.labels(cache, "miss")
+
+class MetricsMiddleware:
+    """Учитывает запросы по имени маршрута из log_execution.
+
+    Для маршрутов без log_execution используется имя функции-обработчика,
+    для ненайденных путей - "unmatched", чтобы число меток оставалось ограниченным.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        duration = None
+
+        async def send_with_metrics(message):
+            nonlocal status_code, duration
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = time.perf_counter() - started
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if duration is None:
+                duration = time.perf_counter() - started
+            _observe_request(scope, status_code, duration)
+
+def _route_name(scope) -> str:
+    timings = current_timings()
+    if timings is not None and timings.route:
+        return timings.route
+    endpoint = scope.get("endpoint")
+    return getattr(endpoint, "__name__", "unmatched")
+
+def _observe_request(scope, status_code: int, duration: float) -> None:
+    route, method, status = _route_name(scope), scope["method"], str(status_code)
+    HTTP_REQUESTS.labels(route, method, status).inc()
+    HTTP_REQUEST_DURATION.labels(route, method).observe(duration)
+    if status_code >= 500:
+        HTTP_REQUEST_ERRORS.labels(route, method, status).inc()
+
+def render_metrics() -> Response:
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+if PROMETHEUS_MULTIPROC_DIR:
+    # livesum-метрики завершившегося воркера не должны учитываться
+    atexit.register(multiprocess.mark_process_dead, os.getpid())
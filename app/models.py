@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index, DDL, event, false
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -18,6 +19,16 @@ class Artist(Base):
     
     paintings = relationship("Painting", back_populates="artist")
 
+    __table_args__ = (
+        # ILIKE '%...%' по фамилии (фильтр artist_name), требует pg_trgm
+        Index(
+            "ix_artists_short_name_trgm",
+            "artist_short_name",
+            postgresql_using="gin",
+            postgresql_ops={"artist_short_name": "gin_trgm_ops"},
+        ),
+    )
+
 class Museum(Base):
     __tablename__ = "museums"
     
@@ -38,6 +49,31 @@ class Museum(Base):
     
     paintings = relationship("Painting", back_populates="museum")
 
+    __table_args__ = (
+        # Фильтры и группировка справочника музеев
+        Index("ix_museums_country_city", "country", "city"),
+    )
+
+class MuseumCollectionSummary(Base):
+    """Сводка коллекции музея, пересчитываемая при записи картин (app/summaries.py)"""
+    __tablename__ = "museum_collection_summaries"
+
+    museum_id = Column(Integer, ForeignKey("museums.id", ondelete="CASCADE"), primary_key=True)
+    painting_count = Column(Integer, nullable=False, default=0)
+    first_year = Column(Integer)
+    last_year = Column(Integer)
+    # [{"genre": ..., "count": ...}] по убыванию числа картин
+    top_genres = Column(JSON, nullable=False, default=list)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class MuseumGenreCount(Base):
+    """Число картин жанра в музее: из него пересчитывается top_genres сводки без агрегации картин"""
+    __tablename__ = "museum_genre_counts"
+
+    museum_id = Column(Integer, ForeignKey("museums.id", ondelete="CASCADE"), primary_key=True)
+    genre = Column(String(100), primary_key=True)
+    painting_count = Column(Integer, nullable=False)
+
 class Painting(Base):
     __tablename__ = "paintings"
     
@@ -46,13 +82,23 @@ class Painting(Base):
     unique_title = Column(String(100), unique=True)
     type = Column(String(50))
     genre = Column(String(100))
-    materials = Column(JSON)
+    # В PostgreSQL - jsonb: фильтр @> по GIN-индексу
+    materials = Column(JSON().with_variant(JSONB, "postgresql"))
     size = Column(String(100))
     profile = Column(String(255))
     profile_path = Column(String(500))
     year = Column(Integer)
     period = Column(String(100))
-    style = Column(JSON)
+    style = Column(JSON().with_variant(JSONB, "postgresql"))
+    # Денормализованный текст для поиска (app/search.py): название, жанр, период
+    # и полное имя художника. В ответы не входит, поэтому не загружается по умолчанию
+    search_document = deferred(Column(Text))
+    # sha256 данных последней синхронизации (upsert по unique_title); любая
+    # другая запись сбрасывает его, чтобы следующая синхронизация перезаписала строку
+    content_hash = deferred(Column(String(64)))
+    # unique_title - ключ внешнего каталога (задан синхронизацией), а не производное
+    # от названия и года: правки названия и года его не пересчитывают
+    unique_title_external = Column(Boolean, nullable=False, default=False, server_default=false())
     
     artist_id = Column(Integer, ForeignKey("artists.id"))
     museum_id = Column(Integer, ForeignKey("museums.id"))
@@ -61,4 +107,74 @@ class Painting(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     artist = relationship("Artist", back_populates="paintings")
-    museum = relationship("Museum", back_populates="paintings")
\ No newline at end of file
+    museum = relationship("Museum", back_populates="paintings")
+
+    __table_args__ = (
+        # Ключ keyset-пагинации списка картин
+        Index("ix_paintings_year_id", "year", "id"),
+        # LIKE 'base\_%' при подборе свободного unique_title
+        Index(
+            "ix_paintings_unique_title_pattern",
+            "unique_title",
+            postgresql_ops={"unique_title": "varchar_pattern_ops"},
+        ),
+        # Фильтры списка картин; year покрывает ix_paintings_year_id
+        Index("ix_paintings_artist_id", "artist_id"),
+        Index("ix_paintings_museum_id", "museum_id"),
+        Index("ix_paintings_genre", "genre"),
+        Index(
+            "ix_paintings_style_gin",
+            "style",
+            postgresql_using="gin",
+            postgresql_ops={"style": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_paintings_materials_gin",
+            "materials",
+            postgresql_using="gin",
+            postgresql_ops={"materials": "jsonb_path_ops"},
+        ),
+        # Поиск с опечатками: search_document <% 'запрос' (pg_trgm)
+        Index(
+            "ix_paintings_search_document_trgm",
+            "search_document",
+            postgresql_using="gin",
+            postgresql_ops={"search_document": "gin_trgm_ops"},
+        ),
+    )
+
+# Полнотекстовый индекс картин. В PostgreSQL - генерируемая колонка tsvector
+# (русская и simple конфигурации) с GIN-индексом, в SQLite - внешняя таблица
+# FTS5 над search_document, которую синхронизируют триггеры
+PAINTINGS_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE paintings ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "to_tsvector('russian'::regconfig, coalesce(search_document, '')) || "
+        "to_tsvector('simple'::regconfig, coalesce(search_document, ''))) STORED",
+        "CREATE INDEX ix_paintings_search_vector ON paintings USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS paintings_fts USING fts5("
+        "search_document, content='paintings', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER paintings_fts_insert AFTER INSERT ON paintings BEGIN "
+        "INSERT INTO paintings_fts(rowid, search_document) VALUES (new.id, new.search_document); END",
+        "CREATE TRIGGER paintings_fts_delete AFTER DELETE ON paintings BEGIN "
+        "INSERT INTO paintings_fts(paintings_fts, rowid, search_document) "
+        "VALUES ('delete', old.id, old.search_document); END",
+        "CREATE TRIGGER paintings_fts_update AFTER UPDATE OF search_document ON paintings BEGIN "
+        "INSERT INTO paintings_fts(paintings_fts, rowid, search_document) "
+        "VALUES ('delete', old.id, old.search_document); "
+        "INSERT INTO paintings_fts(rowid, search_document) VALUES (new.id, new.search_document); END",
+    ],
+}
+
+for dialect, statements in PAINTINGS_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Painting.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+# Триггеры удаляются вместе с paintings, виртуальная таблица - нет
+event.listen(
+    Painting.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS paintings_fts").execute_if(dialect="sqlite"),
+)
\ No newline at end of file
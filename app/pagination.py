@@ -0,0 +1,164 @@
+import base64
+import binascii
+import json
+import operator
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, literal, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+def encode_cursor(values: List[Any], direction: str) -> str:
+    """Кодирует ключ строки и направление в непрозрачный URL-safe курсор"""
+    payload = json.dumps([direction, *values], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> Tuple[str, List[Any]]:
+    """Декодирует курсор в (направление, значения ключа).
+
+    Исключения:
+    - 400: Если курсор поврежден или не соответствует ожидаемому ключу
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, *values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    if direction not in (CURSOR_NEXT, CURSOR_PREV) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+    return direction, values
+
+def nullable_keyset_order(column, id_column, ascending: bool):
+    """Порядок (column, id), при котором NULL идут после значений при ASC.
+
+    Совпадает с порядком B-tree индекса (column, id) в PostgreSQL:
+    DESC-вариант - точное обращение ASC, поэтому индекс читается в обе стороны.
+    """
+    if ascending:
+        return column.asc().nulls_last(), id_column.asc()
+    return column.desc().nulls_first(), id_column.desc()
+
+def nullable_keyset_ranges(column, id_column, key: Optional[List[Any]], ascending: bool) -> List[Tuple[Any, tuple]]:
+    """Диапазоны индекса (column, id) после ключа key в порядке nullable_keyset_order.
+
+    Строки со значением и строки с NULL - два отдельных диапазона: одно условие
+    с OR по обоим не дает базе искать по индексу, и она читает его с начала.
+    Каждый элемент - (условие, ORDER BY) одного диапазона; диапазоны читаются
+    по очереди, пока не наберется страница. Без key - все строки.
+    """
+    after = operator.gt if ascending else operator.lt
+    values_order = (column.asc(), id_column.asc()) if ascending else (column.desc(), id_column.desc())
+    nulls_order = (id_column.asc() if ascending else id_column.desc(),)
+
+    if key is None:
+        values = (column.isnot(None), values_order)
+        nulls = (column.is_(None), nulls_order)
+        return [values, nulls] if ascending else [nulls, values]
+
+    value, row_id = key
+    if value is None:
+        nulls = (and_(column.is_(None), after(id_column, row_id)), nulls_order)
+        return [nulls] if ascending else [nulls, (column.isnot(None), values_order)]
+
+    bound = tuple_(literal(value, column.type), literal(row_id, id_column.type))
+    values = (after(tuple_(column, id_column), bound), values_order)
+    return [values, (column.is_(None), nulls_order)] if ascending else [values]
+
+async def get_paintings_page_by_cursor(
+    query,
+    db: AsyncSession,
+    page_size: int,
+    sort_order: str,
+    cursor: Optional[str]
+) -> dict:
+    """Страница картин по ключу (year, id) без OFFSET.
+
+    query - выборка models.Painting с фильтрами и опциями загрузки.
+    Для prev-курсора индекс читается в обратную сторону, а строки
+    разворачиваются обратно. Лишняя строка в LIMIT показывает, есть ли еще страницы.
+    """
+    direction, key = decode_cursor(cursor, 2) if cursor else (CURSOR_NEXT, None)
+    if key is not None and (not isinstance(key[1], int) or not (key[0] is None or isinstance(key[0], int))):
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    ascending = (sort_order == "asc") == (direction == CURSOR_NEXT)
+
+    # Следующий диапазон читается, только если страница закончилась на границе NULL
+    paintings = []
+    for condition, order_by in nullable_keyset_ranges(models.Painting.year, models.Painting.id, key, ascending):
+        result = await db.execute(
+            query.filter(condition).order_by(*order_by).limit(page_size + 1 - len(paintings))
+        )
+        paintings.extend(result.scalars().all())
+        if len(paintings) > page_size:
+            break
+
+    has_more = len(paintings) > page_size
+    paintings = paintings[:page_size]
+
+    if direction == CURSOR_PREV:
+        paintings.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, key is not None
+
+    return {
+        "data": paintings,
+        "page": None,
+        "page_size": page_size,
+        "total_pages": None,
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "next_cursor": _painting_cursor(paintings[-1], CURSOR_NEXT) if has_next and paintings else None,
+        "prev_cursor": _painting_cursor(paintings[0], CURSOR_PREV) if has_prev and paintings else None
+    }
+
+def decode_id_cursor(cursor: Optional[str]) -> Tuple[str, Optional[int]]:
+    """(направление, id) курсора пагинации по id; без курсора - первая страница"""
+    if not cursor:
+        return CURSOR_NEXT, None
+    direction, key = decode_cursor(cursor, 1)
+    if not isinstance(key[0], int) or isinstance(key[0], bool):
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+    return direction, key[0]
+
+def id_keyset_after(id_column, direction: str, row_id: Optional[int]):
+    """Условие "после row_id" в направлении курсора; без row_id - все строки"""
+    if row_id is None:
+        return true()
+    return id_column > row_id if direction == CURSOR_NEXT else id_column < row_id
+
+def id_keyset_page(rows: List[Any], page_size: int, direction: str, row_id: Optional[int], key: Callable[[Any], int]) -> dict:
+    """Поля страницы по выборке из page_size + 1 строк, упорядоченных в направлении курсора.
+
+    key возвращает id строки для курсоров. Для prev-курсора строки
+    разворачиваются обратно в порядок возрастания id.
+    """
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if direction == CURSOR_PREV:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, row_id is not None
+
+    return {
+        "data": rows,
+        "page": None,
+        "page_size": page_size,
+        "total_pages": None,
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "next_cursor": encode_cursor([key(rows[-1])], CURSOR_NEXT) if has_next and rows else None,
+        "prev_cursor": encode_cursor([key(rows[0])], CURSOR_PREV) if has_prev and rows else None
+    }
+
+def _painting_cursor(painting: models.Painting, direction: str) -> str:
+    return encode_cursor([painting.year, painting.id], direction)
@@ -0,0 +1,19 @@
+from typing import Callable, Optional
+
+from fastapi import Response
+
+from app.cache import CachedResponse, etag_matches
+from app.serialization import dump_json
+from app.timing import measure_serialization
+
+def render_json(to_dict: Callable[[object], dict], content) -> bytes:
+    """Сериализует ответ побайтно так же, как FastAPI по response_model и JSONResponse"""
+    with measure_serialization():
+        return dump_json(to_dict(content))
+
+def etag_response(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """Ответ из кэша с ETag; при совпадении If-None-Match - 304 без тела"""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
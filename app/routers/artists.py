@@ -0,0 +1,237 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app import models, schemas
+from app.cache import response_cache
+from app.dependencies import get_db
+from app.logger import log_execution, get_logger
+from app.pagination import (
+    CURSOR_NEXT,
+    decode_id_cursor,
+    get_paintings_page_by_cursor,
+    id_keyset_after,
+    id_keyset_page,
+)
+from app.responses import etag_response, render_json
+from app.serialization import artist_to_dict, artists_page_to_dict, paintings_page_to_dict
+
+router = APIRouter(tags=["artists"])
+logger = get_logger("routers.artists")
+
+@router.get(
+        "/artists",
+        response_model=schemas.PaginatedResponse[schemas.ArtistWithStatsResponse],
+        summary="Получить список художников",
+        description="Возвращает художников с числом картин и годами первой и последней картины"
+)
+@log_execution("/artists")
+async def get_all_artists(
+    db: AsyncSession = Depends(get_db),
+    page_size: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор next_cursor/prev_cursor из предыдущего ответа"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить список художников с курсорной пагинацией.
+
+    Параметры:
+    - **page_size**: Количество художников на странице (1-100)
+    - **cursor**: Курсор из next_cursor/prev_cursor
+
+    Особенности:
+    - Художники упорядочены по id
+    - painting_count, first_year и last_year считаются одним запросом: агрегат по
+      ix_paintings_artist_id только для художников текущей страницы, без загрузки
+      Artist.paintings
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag
+
+    Возвращает:
+    - Paginated список художников со статистикой картин
+    """
+    cache_key = ("artists", page_size, cursor)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        content = await _get_artists_page(db, page_size, cursor)
+        body = render_json(artists_page_to_dict, content)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при получении художников"
+        )
+
+@router.get(
+        "/artists/{artist_id}",
+        response_model=schemas.ArtistWithStatsResponse,
+        summary="Получить художника по ID",
+        description="Возвращает художника с числом картин и годами первой и последней картины"
+)
+@log_execution("/artists/{artist_id}")
+async def get_artist_by_id(
+    artist_id: int,
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить художника по его идентификатору.
+
+    Параметры:
+    - **artist_id**: ID художника (целое число)
+
+    Возвращает:
+    - Объект художника со статистикой картин
+
+    Исключения:
+    - 404: Если художник с указанным ID не найден
+    - 500: При внутренней ошибке сервера
+    """
+    cache_key = ("artist", artist_id)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        row = (await db.execute(_artists_with_stats(models.Artist.id == artist_id))).first()
+        if row is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Художник с ID {artist_id} не найден"
+            )
+
+        artist, *stats = row
+        body = render_json(lambda artist: artist_to_dict(artist, stats), artist)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при получении художника"
+        )
+
+@router.get(
+        "/artists/{artist_id}/paintings",
+        response_model=schemas.PaginatedResponse[schemas.PaintingResponse],
+        summary="Получить картины художника",
+        description="Возвращает картины художника с курсорной пагинацией"
+)
+@log_execution("/artists/{artist_id}/paintings")
+async def get_artist_paintings(
+    artist_id: int,
+    db: AsyncSession = Depends(get_db),
+    page_size: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Порядок сортировки по году"),
+    cursor: Optional[str] = Query(None, description="Курсор next_cursor/prev_cursor из предыдущего ответа"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить картины художника.
+
+    Параметры:
+    - **artist_id**: ID художника
+    - **page_size**: Количество картин на странице (1-100)
+    - **sort_order**: Порядок сортировки по году ("asc" или "desc")
+    - **cursor**: Курсор из next_cursor/prev_cursor
+
+    Особенности:
+    - Та же курсорная пагинация по (year, id), что у GET /paintings?pagination=cursor
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag
+
+    Возвращает:
+    - Paginated список картин художника без total
+
+    Исключения:
+    - 404: Если художник с указанным ID не найден
+    """
+    cache_key = ("artist_paintings", artist_id, page_size, sort_order, cursor)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        if await db.scalar(select(models.Artist.id).filter(models.Artist.id == artist_id)) is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Художник с ID {artist_id} не найден"
+            )
+
+        query = (
+            select(models.Painting)
+            .options(joinedload(models.Painting.artist), joinedload(models.Painting.museum))
+            .filter(models.Painting.artist_id == artist_id)
+        )
+        page_data = await get_paintings_page_by_cursor(query, db, page_size, sort_order, cursor)
+        content = {**page_data, "total": None, "count_type": "none"}
+
+        body = render_json(paintings_page_to_dict, content)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при получении картин художника"
+        )
+
+def _artists_with_stats(condition, limit: Optional[int] = None, ascending: bool = True):
+    """Художники с (painting_count, first_year, last_year).
+
+    Сначала выбираются id художников страницы, затем одна агрегация картин
+    только по этим id (ix_paintings_artist_id) присоединяется к художникам.
+    """
+    artist = models.Artist
+    painting = models.Painting
+
+    page_ids = select(artist.id).filter(condition).order_by(artist.id.asc() if ascending else artist.id.desc())
+    if limit is not None:
+        page_ids = page_ids.limit(limit)
+    page_ids = page_ids.subquery("page_ids")
+
+    stats = (
+        select(
+            painting.artist_id,
+            func.count().label("painting_count"),
+            func.min(painting.year).label("first_year"),
+            func.max(painting.year).label("last_year"),
+        )
+        .filter(painting.artist_id.in_(select(page_ids.c.id)))
+        .group_by(painting.artist_id)
+        .subquery("stats")
+    )
+
+    return (
+        select(
+            artist,
+            func.coalesce(stats.c.painting_count, 0),
+            stats.c.first_year,
+            stats.c.last_year,
+        )
+        .join(page_ids, page_ids.c.id == artist.id)
+        .outerjoin(stats, stats.c.artist_id == artist.id)
+        .order_by(artist.id.asc() if ascending else artist.id.desc())
+    )
+
+async def _get_artists_page(db: AsyncSession, page_size: int, cursor: Optional[str]) -> dict:
+    """Страница художников по ключу id без OFFSET"""
+    direction, artist_id = decode_id_cursor(cursor)
+    condition = id_keyset_after(models.Artist.id, direction, artist_id)
+    query = _artists_with_stats(condition, page_size + 1, ascending=direction == CURSOR_NEXT)
+
+    rows = list((await db.execute(query)).all())
+    page = id_keyset_page(rows, page_size, direction, artist_id, key=lambda row: row[0].id)
+    return {**page, "total": None, "count_type": "none"}
@@ -0,0 +1,201 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.cache import response_cache
+from app.dependencies import get_db
+from app.logger import log_execution, get_logger
+from app.pagination import CURSOR_NEXT, decode_id_cursor, id_keyset_after, id_keyset_page
+from app.responses import etag_response, render_json
+from app.serialization import museum_to_dict, museums_page_to_dict
+
+router = APIRouter(tags=["museums"])
+logger = get_logger("routers.museums")
+
+@router.get(
+        "/museums",
+        response_model=schemas.PaginatedResponse[schemas.MuseumWithSummaryResponse],
+        summary="Получить список музеев",
+        description="Возвращает музеи со сводкой коллекции с фильтрами по стране и городу"
+)
+@log_execution("/museums")
+async def get_all_museums(
+    db: AsyncSession = Depends(get_db),
+    country: Optional[str] = Query(None, description="Страна (точное совпадение)"),
+    city: Optional[str] = Query(None, description="Город (точное совпадение)"),
+    page_size: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор next_cursor/prev_cursor из предыдущего ответа"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить список музеев с курсорной пагинацией.
+
+    Параметры:
+    - **country**, **city**: Фильтры по стране и городу
+    - **page_size**: Количество музеев на странице (1-100)
+    - **cursor**: Курсор из next_cursor/prev_cursor
+
+    Особенности:
+    - Музеи упорядочены по id; фильтры обслуживает индекс ix_museums_country_city
+    - painting_count, first_year, last_year и top_genres читаются из готовых сводок
+      museum_collection_summaries, таблица картин при чтении не агрегируется
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag
+
+    Возвращает:
+    - Paginated список музеев со сводками коллекций
+    """
+    cache_key = ("museums", country, city, page_size, cursor)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        direction, museum_id = decode_id_cursor(cursor)
+        ascending = direction == CURSOR_NEXT
+        query = _museums_with_summaries().filter(id_keyset_after(models.Museum.id, direction, museum_id))
+        if country is not None:
+            query = query.filter(models.Museum.country == country)
+        if city is not None:
+            query = query.filter(models.Museum.city == city)
+
+        result = await db.execute(
+            query.order_by(models.Museum.id.asc() if ascending else models.Museum.id.desc()).limit(page_size + 1)
+        )
+        page = id_keyset_page(list(result.all()), page_size, direction, museum_id, key=lambda row: row[0].id)
+        content = {**page, "total": None, "count_type": "none"}
+
+        body = render_json(museums_page_to_dict, content)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при получении музеев"
+        )
+
+@router.get(
+        "/museums/locations",
+        response_model=List[schemas.MuseumLocation],
+        summary="Музеи по странам и городам",
+        description="Возвращает число музеев и картин в каждом городе"
+)
+@log_execution("/museums/locations")
+async def get_museum_locations(
+    db: AsyncSession = Depends(get_db),
+    country: Optional[str] = Query(None, description="Страна (точное совпадение)"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить группировку музеев по стране и городу.
+
+    Параметры:
+    - **country**: Только города указанной страны
+
+    Особенности:
+    - Число картин суммируется по сводкам коллекций, а не по таблице картин
+    - Города упорядочены по стране и названию
+
+    Возвращает:
+    - Список {country, city, museum_count, painting_count}
+    """
+    cache_key = ("museum_locations", country)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        museum = models.Museum
+        summary = models.MuseumCollectionSummary
+        query = (
+            select(
+                museum.country,
+                museum.city,
+                func.count(museum.id),
+                func.coalesce(func.sum(summary.painting_count), 0),
+            )
+            .outerjoin(summary, summary.museum_id == museum.id)
+            .group_by(museum.country, museum.city)
+            .order_by(museum.country, museum.city)
+        )
+        if country is not None:
+            query = query.filter(museum.country == country)
+
+        rows = (await db.execute(query)).all()
+        body = render_json(_locations_to_list, rows)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при группировке музеев"
+        )
+
+@router.get(
+        "/museums/{museum_id}",
+        response_model=schemas.MuseumWithSummaryResponse,
+        summary="Получить музей по ID",
+        description="Возвращает музей со сводкой коллекции"
+)
+@log_execution("/museums/{museum_id}")
+async def get_museum_by_id(
+    museum_id: int,
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить музей по его идентификатору.
+
+    Параметры:
+    - **museum_id**: ID музея (целое число)
+
+    Возвращает:
+    - Объект музея со сводкой коллекции
+
+    Исключения:
+    - 404: Если музей с указанным ID не найден
+    - 500: При внутренней ошибке сервера
+    """
+    cache_key = ("museum", museum_id)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        row = (await db.execute(_museums_with_summaries().filter(models.Museum.id == museum_id))).first()
+        if row is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Музей с ID {museum_id} не найден"
+            )
+
+        museum, summary = row
+        body = render_json(lambda museum: museum_to_dict(museum, summary), museum)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при получении музея"
+        )
+
+def _museums_with_summaries():
+    summary = models.MuseumCollectionSummary
+    return select(models.Museum, summary).outerjoin(summary, summary.museum_id == models.Museum.id)
+
+def _locations_to_list(rows) -> list:
+    return [
+        {"country": country, "city": city, "museum_count": museum_count, "painting_count": painting_count}
+        for country, city, museum_count, painting_count in rows
+    ]
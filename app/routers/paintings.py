@@ -1,17 +1,62 @@
+import csv
+import io
 import re
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import String, and_, cast, delete, func, insert, literal_column, null, or_, select, text, true, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
 import logging
 import transliterate
 
 from app import models, schemas
-from app.dependencies import get_db
+from app.cache import count_cache, invalidate_painting_caches, response_cache
+from app.dependencies import get_db, get_painting_filters
 from app.logger import log_execution, get_logger
+from app.pagination import (
+    CURSOR_NEXT,
+    decode_cursor,
+    encode_cursor,
+    get_paintings_page_by_cursor,
+    nullable_keyset_order,
+)
+from app.responses import etag_response, render_json
+from app.serialization import (
+    PAINTING_FIELDS,
+    PAINTING_RELATIONS,
+    ORJSONResponse,
+    content_hash,
+    dump_json,
+    painting_to_dict,
+    paintings_page_to_dict,
+)
+from app.search import search_document, search_document_expression, search_matches, search_terms
+from app.summaries import apply_museum_summary_changes, refresh_museum_summaries, summary_facts
+from app.sql import json_array_contains, json_array_elements, upsert
+from app.timing import measure_serialization
 
 router = APIRouter(tags=["paintings"])
 logger = get_logger("routers.paintings")
 
+UNIQUE_TITLE_ATTEMPTS = 3
+UNIQUE_TITLE_PREFETCH_BATCH = 200
+UNIQUE_TITLE_SUFFIX = re.compile(r"(.*)_(\d+)")
+BULK_IMPORT_CHUNK_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_PAINTING_COLUMNS = (
+    "id", "title", "unique_title", "type", "genre", "materials", "size",
+    "profile", "profile_path", "year", "period", "style", "created_at",
+)
+EXPORT_CSV_ARTIST_COLUMNS = ("id", "artist_short_name", "artist_long_name")
+EXPORT_CSV_MUSEUM_COLUMNS = ("id", "name", "name_unique", "city", "country")
+FACET_INTEGER_VALUES = ("museum", "decade")
+SEARCH_DOCUMENT_FIELDS = {"title", "genre", "period", "artist_id"}
+MUSEUM_SUMMARY_FIELDS = {"museum_id", "year", "genre"}
+
 @router.get(
         "/paintings",
         response_model=schemas.PaginatedResponse[schemas.PaintingResponse],
@@ -20,11 +65,17 @@ logger = get_logger("routers.paintings")
 )
 @log_execution("/paintings")
 async def get_all_paintings(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1, description="Номер страницы"),
     page_size: int = Query(20, ge=1, le=100, description="Размер страницы"),
-    sort_order: str = Query("asc", regex="^(asc|desc)$", description="Порядок сортировки по году"),
-    artist_name: str = Query(None, description="Фильтр по фамилии художника (частичное совпадение)")
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Порядок сортировки по году"),
+    filters: schemas.PaintingFilters = Depends(get_painting_filters),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Режим пагинации"),
+    cursor: Optional[str] = Query(None, description="Курсор next_cursor/prev_cursor из предыдущего ответа"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="Способ подсчета total"),
+    fields: Optional[str] = Query(None, description="Поля картины через запятую, например id,title,year,profile_path"),
+    include: Optional[str] = Query(None, description="Связанные объекты через запятую: artist, museum"),
+    if_none_match: Optional[str] = Header(None)
     ):
     """
     Получить список всех картин с пагинацией.
@@ -34,41 +85,241 @@ async def get_all_paintings(
     - **page_size**: Количество картин на странице (1-100)
     - **sort_order**: Порядок сортировки по году создания ("asc" или "desc")
     - **artist_name**: Фильтр по фамилии художника (регистронезависимый поиск)
+    - **genre**, **type**: Жанр и тип (точное совпадение)
+    - **year_from**, **year_to**: Диапазон года создания включительно
+    - **artist_id**, **museum_id**: Картины художника или музея
+    - **style**, **materials**: Картины, содержащие все перечисленные стили/материалы
+    - **pagination**: "offset" (по номеру страницы) или "cursor" (по курсору)
+    - **cursor**: Курсор из next_cursor/prev_cursor; включает режим "cursor"
+    - **count**: "exact" - точный total (кэшируется до записи в каталог),
+      "estimated" - оценка по статистике планировщика PostgreSQL без фильтров,
+      "none" - без total
+    - **fields**: Только перечисленные поля картины (id выводится всегда)
+    - **include**: Вложенные объекты artist и/или museum; если задан только fields -
+      вложенные объекты не выводятся
+
+    Особенности:
+    - Картины упорядочены по (year, id), картины без года идут последними при "asc"
+    - В режиме "cursor" page игнорируется, а стоимость запроса не зависит от глубины страницы
+    - Поле count_type ответа показывает, как получен total: exact, cached, estimated или none
+    - С fields/include из базы читаются только нужные колонки и связи
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag;
+      при совпадении If-None-Match возвращается 304 без обращения к базе
 
     Возвращает:
     - Paginated список картин с метаданными пагинации
     """
+    output_fields = _parse_fields(fields, include)
+    cache_key = ("paintings", page, page_size, sort_order, filters.cache_key(), pagination, cursor, count, output_fields)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
     try:
-        skip = (page - 1) * page_size
+        query = _apply_painting_filters(select(models.Painting), filters, db.get_bind().dialect.name)
+        total, count_type = await _count_paintings(query, filters, count, db)
 
-        query = db.query(models.Painting)
+        if pagination == "cursor" or cursor:
+            page_data = await get_paintings_page_by_cursor(
+                query.options(*_painting_load_options(output_fields)), db, page_size, sort_order, cursor
+            )
+            content = {**page_data, "total": total, "count_type": count_type}
+        else:
+            skip = (page - 1) * page_size
 
-        if artist_name:
-            query = query.join(models.Artist).filter(models.Artist.artist_short_name.ilike(f"%{artist_name}%"))
+            # Без total наличие следующей страницы определяется лишней строкой
+            result = await db.execute(
+                query.options(*_painting_load_options(output_fields))
+                .order_by(*nullable_keyset_order(models.Painting.year, models.Painting.id, sort_order == "asc"))
+                .offset(skip)
+                .limit(page_size + 1 if total is None else page_size)
+            )
+            paintings = result.scalars().all()
+            
+            if total is None:
+                total_pages = None
+                has_next = len(paintings) > page_size
+                paintings = paintings[:page_size]
+            else:
+                total_pages = (total + page_size - 1) // page_size
+                has_next = page < total_pages
+            
+            content = {
+                "data": paintings,
+                "total": total,
+                "count_type": count_type,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": total_pages,
+                "has_next": has_next,
+                "has_prev": page > 1
+            }
 
-        sort_direction = models.Painting.year.desc() if sort_order == "desc" else models.Painting.year.asc()
-
-        paintings = query.order_by(sort_direction).offset(skip).limit(page_size).all()
-        
-        total = query.count()
-        total_pages = (total + page_size - 1) // page_size
-        
-        return {
-            "data": paintings,
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+        body = render_json(lambda page: paintings_page_to_dict(page, output_fields), content)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
 
+    except HTTPException:
+        raise
     except Exception as e:          
         raise HTTPException(
             status_code=500, 
             detail="Ошибка при получении картин"
         )
     
+@router.get(
+        "/paintings/facets",
+        response_model=schemas.PaintingFacetsResponse,
+        summary="Фасеты каталога картин",
+        description="Возвращает число картин по жанрам, стилям, материалам, периодам, музеям и десятилетиям"
+)
+@log_execution("/paintings/facets")
+async def get_painting_facets(
+    db: AsyncSession = Depends(get_db),
+    filters: schemas.PaintingFilters = Depends(get_painting_filters),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить фасеты (число картин по значениям) для набора фильтров.
+
+    Параметры:
+    - Те же фильтры, что у списка картин: **artist_name**, **genre**, **type**,
+      **year_from**, **year_to**, **artist_id**, **museum_id**, **style**, **materials**
+
+    Особенности:
+    - Все фасеты считаются одним запросом: отфильтрованные картины читаются один раз
+      (CTE), группировки объединяются через UNION ALL
+    - style и materials разворачиваются по элементам массива: картина с двумя стилями
+      учитывается в обоих
+    - Пустые значения (NULL) в фасеты не попадают; значения упорядочены по убыванию числа картин
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag
+
+    Возвращает:
+    - total и списки {value, label, count} по каждому фасету; label - название музея
+    """
+    cache_key = ("facets", filters.cache_key())
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
+    try:
+        dialect = db.get_bind().dialect.name
+        result = await db.execute(_facets_query(filters, dialect))
+        body = render_json(_facets_to_dict, result.all())
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при подсчете фасетов"
+        )
+
+@router.get(
+        "/paintings/search",
+        response_model=schemas.PaginatedResponse[schemas.PaintingResponse],
+        summary="Поиск картин",
+        description="Полнотекстовый поиск по названию, жанру, периоду и имени художника с курсорной пагинацией"
+)
+@log_execution("/paintings/search")
+async def search_paintings(
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    page_size: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор next_cursor из предыдущего ответа"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Найти картины по тексту.
+
+    Параметры:
+    - **q**: Поисковый запрос - слова из названия, жанра, периода или полного имени художника
+    - **page_size**: Количество картин на странице (1-100)
+    - **cursor**: Курсор next_cursor из предыдущего ответа
+
+    Особенности:
+    - Поиск идет по денормализованному search_document картины без JOIN с художниками
+    - PostgreSQL: словоформы (russian) и точные слова (simple) по GIN-индексу tsvector,
+      а также триграммная похожесть - запрос с опечаткой тоже находит картину
+    - SQLite: FTS5, каждое слово запроса ищется как префикс
+    - Картины упорядочены по релевантности, затем по id; пагинация только вперед по курсору,
+      total не считается
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag
+
+    Возвращает:
+    - Страница найденных картин в формате списка картин
+
+    Исключения:
+    - 400: Если в запросе нет ни одного слова или курсор некорректен
+    """
+    cache_key = ("search", q, page_size, cursor)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    if not search_terms(q):
+        raise HTTPException(status_code=400, detail="В поисковом запросе нет слов")
+
+    generation = response_cache.generation
+    try:
+        content = await _search_paintings_page(q, db, page_size, cursor)
+        body = render_json(paintings_page_to_dict, content)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при поиске картин"
+        )
+
+@router.get(
+        "/paintings/export",
+        response_class=StreamingResponse,
+        summary="Выгрузить весь каталог картин",
+        description="Потоково отдает все картины с художниками и музеями в формате NDJSON или CSV",
+        responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}}
+)
+@log_execution("/paintings/export")
+async def export_paintings(
+    db: AsyncSession = Depends(get_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Формат выгрузки")
+):
+    """
+    Выгрузить весь каталог картин одним потоковым ответом.
+
+    Параметры:
+    - **format**: "ndjson" (по объекту PaintingResponse в строке) или "csv" (плоская таблица)
+
+    Особенности:
+    - Строки читаются серверным курсором пачками по EXPORT_BATCH_SIZE и сразу отправляются клиенту,
+      поэтому память не зависит от размера каталога
+    - Картины упорядочены по id; в CSV художник и музей разворачиваются в отдельные колонки
+
+    Возвращает:
+    - Файл paintings.ndjson или paintings.csv
+    """
+    query = (
+        select(models.Painting)
+        .options(*_painting_load_options())
+        .order_by(models.Painting.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if format == "csv":
+        content, media_type = _export_csv(query, db), "text/csv; charset=utf-8"
+    else:
+        content, media_type = _export_ndjson(query, db), "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="paintings.{format}"'}
+    )
+    
 @router.get(
         "/paintings/{painting_id}",
         response_model=schemas.PaintingResponse,
@@ -77,12 +328,22 @@ async def get_all_paintings(
 )
 @log_execution("/paintings/{painting_id}")
 async def get_painting_by_id(
-    painting_id: int, db: Session = Depends(get_db)):
+    painting_id: int,
+    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Поля картины через запятую, например id,title,year,profile_path"),
+    include: Optional[str] = Query(None, description="Связанные объекты через запятую: artist, museum"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Получить детальную информацию о картине по её идентификатору.
 
     Параметры:
     - **painting_id**: ID картины (целое число)
+    - **fields**, **include**: Сокращенный ответ, как в списке картин
+
+    Особенности:
+    - Ответ кэшируется до ближайшей записи в каталог и помечается ETag;
+      при совпадении If-None-Match возвращается 304 без обращения к базе
 
     Возвращает:
     - Объект картины со всей информацией
@@ -91,8 +352,15 @@ async def get_painting_by_id(
     - 404: Если картина с указанным ID не найдена
     - 500: При внутренней ошибке сервера
     """
+    output_fields = _parse_fields(fields, include)
+    cache_key = ("painting", painting_id, output_fields)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return etag_response(cached, if_none_match)
+
+    generation = response_cache.generation
     try:
-        painting = db.query(models.Painting).filter(models.Painting.id == painting_id).first()
+        painting = await _get_painting(painting_id, db, output_fields)
         
         if not painting:
             raise HTTPException(
@@ -100,7 +368,8 @@ async def get_painting_by_id(
                 detail=f"Картина с ID {painting_id} не найдена"
             )
         
-        return painting
+        body = render_json(lambda obj: painting_to_dict(obj, fields=output_fields), painting)
+        return etag_response(response_cache.set(cache_key, body, generation), if_none_match)
 
     except HTTPException:
         raise
@@ -118,7 +387,7 @@ async def get_painting_by_id(
         status_code=201
 )
 @log_execution("create_painting")
-async def create_painting(painting_data: schemas.PaintingCreate, db: Session = Depends(get_db)):
+async def create_painting(painting_data: schemas.PaintingCreate, db: AsyncSession = Depends(get_db)):
     """
     Создать новую картину в системе.
 
@@ -128,6 +397,7 @@ async def create_painting(painting_data: schemas.PaintingCreate, db: Session = D
     Особенности:
     - Поле `unique_title` генерируется автоматически на основе названия и года
     - Проверяет существование указанных artist_id и museum_id
+    - Заполняет поисковый документ картины (search_document) и обновляет сводку коллекции музея
 
     Возвращает:
     - Созданный объект картины с присвоенным ID
@@ -137,31 +407,373 @@ async def create_painting(painting_data: schemas.PaintingCreate, db: Session = D
     - 500: При ошибке создания в базе данных
     """
     try:
-        _check_artist_exists(painting_data.artist_id, db)
+        artist_long_name = await _get_artist_long_name(painting_data.artist_id, db)
             
-        _check_museum_exists(painting_data.museum_id, db)
+        await _check_museum_exists(painting_data.museum_id, db)
 
-        unique_title = _generate_painting_unique_title(
+        painting = models.Painting(
+            **painting_data.model_dump(),
+            search_document=search_document(
+                painting_data.title, painting_data.genre, painting_data.period, artist_long_name
+            )
+        )
+
+        async def add_painting():
+            db.add(painting)
+            return painting
+
+        await _commit_with_unique_title(
+            db,
+            add_painting,
             title=painting_data.title,
             year=painting_data.year,
-            db=db
+            update_summaries=lambda: apply_museum_summary_changes(db, added=[summary_facts(painting)])
         )
-        
-        painting_dict = painting_data.model_dump()
-        painting_dict["unique_title"] = unique_title
-        
-        painting = models.Painting(**painting_dict)
-        db.add(painting)
-        db.commit()
-        db.refresh(painting)
-        return painting
+        invalidate_painting_caches()
+        return _painting_response(await _get_painting(painting.id, db), status_code=201)
     
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Ошибка при создании картины")
     
+@router.post(
+        "/paintings/batch-get",
+        response_model=schemas.PaintingBatchGetResponse,
+        summary="Получить несколько картин по ID",
+        description="Возвращает картины по списку ID одним запросом к базе в порядке запроса"
+)
+@log_execution("batch_get_paintings")
+async def batch_get_paintings(
+    request_data: schemas.PaintingBatchGetRequest,
+    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Поля картины через запятую, например id,title,year,profile_path"),
+    include: Optional[str] = Query(None, description="Связанные объекты через запятую: artist, museum")
+):
+    """
+    Получить до 500 картин одним запросом.
+
+    Параметры:
+    - **ids**: Список ID картин в нужном порядке (1-500)
+    - **fields**, **include**: Сокращенный ответ, как в списке картин
+
+    Особенности:
+    - Все картины вместе с художниками и музеями читаются одним SELECT ... WHERE id IN (...)
+    - Картины возвращаются в порядке ids; повторные ID выводятся один раз
+    - Ненайденные ID перечисляются в not_found, а не приводят к 404
+
+    Возвращает:
+    - data - найденные картины, not_found - ID, которых нет в каталоге
+    """
+    output_fields = _parse_fields(fields, include)
+    try:
+        ids = list(dict.fromkeys(request_data.ids))
+        result = await db.execute(
+            select(models.Painting)
+            .options(*_painting_load_options(output_fields))
+            .filter(models.Painting.id.in_(ids))
+        )
+        found = {painting.id: painting for painting in result.scalars().all()}
+
+        content = {
+            "data": [found[painting_id] for painting_id in ids if painting_id in found],
+            "not_found": [painting_id for painting_id in ids if painting_id not in found],
+        }
+        with measure_serialization():
+            return ORJSONResponse(_batch_to_dict(content, output_fields))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Ошибка при получении картин"
+        )
+
+@router.post(
+        "/paintings/bulk",
+        response_model=schemas.BulkImportResponse,
+        summary="Массовый импорт картин",
+        description="Импортирует картины из тела запроса в формате JSON Lines / NDJSON",
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {"application/x-ndjson": {"schema": {"type": "string"}}}
+            }
+        }
+)
+@log_execution("bulk_import_paintings")
+async def bulk_import_paintings(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Импортировать каталог картин одним запросом.
+
+    Тело запроса: по одному объекту PaintingCreate в строке (JSON Lines / NDJSON).
+    Пустые строки пропускаются.
+
+    Особенности:
+    - Строки обрабатываются пакетами по BULK_IMPORT_CHUNK_SIZE, каждый пакет - отдельная транзакция
+    - Существование artist_id и museum_id проверяется одним запросом IN (...) на пакет
+    - unique_title подбирается в памяти по одной предварительной выборке занятых названий
+    - Ошибочные строки не прерывают импорт и перечисляются в ответе с номером строки
+
+    Возвращает:
+    - Количество вставленных и отклоненных строк и ошибки по строкам
+
+    Исключения:
+    - 500: При ошибке чтения запроса или работы с базой данных
+    """
+    try:
+        inserted = 0
+        errors = []
+
+        async for chunk in _ndjson_chunks(request, schemas.PaintingCreate, errors):
+            chunk_inserted = await _import_paintings_chunk(chunk, db, errors)
+            # Пакет уже закоммичен: кэш сбрасывается сразу, даже если следующий пакет упадет
+            if chunk_inserted:
+                invalidate_painting_caches()
+            inserted += chunk_inserted
+
+        errors.sort(key=lambda error: error["line"])
+        return {"inserted": inserted, "failed": len(errors), "errors": errors}
+
+    except Exception as e:
+        logger.error(f"Ошибка при массовом импорте картин: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Ошибка при массовом импорте картин")
+    
+@router.patch(
+        "/paintings/bulk",
+        response_model=schemas.PaintingBulkUpdateResponse,
+        summary="Массовое изменение картин",
+        description="Изменяет картины по списку ID или фильтру одним UPDATE в одной транзакции"
+)
+@log_execution("bulk_update_paintings")
+async def bulk_update_paintings(
+    request_data: schemas.PaintingBulkUpdateRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Изменить много картин одним запросом.
+
+    Тело запроса:
+    - **ids** или **filter**: Список ID (до 10000) или фильтр как у списка картин (непустой)
+    - **changes**: Изменяемые поля (объект PaintingUpdate)
+
+    Особенности:
+    - Все выбранные картины меняются одним UPDATE ... WHERE в одной транзакции
+    - search_document пересчитывается тем же UPDATE
+    - При изменении названия или года unique_title пересчитываются пакетно: одна выборка
+      занятых названий и одно обновление по первичному ключу; картина сохраняет свой
+      unique_title, если он уже соответствует новым названию и году или задан
+      синхронизацией по unique_title
+    - Сводки затронутых музеев пересчитываются в той же транзакции
+
+    Возвращает:
+    - Число измененных картин и картин с новым unique_title
+
+    Исключения:
+    - 400: Если не передано ни одного изменяемого поля или title равен null
+    - 404: Если новый художник или музей не найдены
+    - 500: При ошибке обновления в базе данных
+    """
+    changes = request_data.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="Нет изменяемых полей")
+    if "title" in changes and changes["title"] is None:
+        raise HTTPException(status_code=400, detail="Название картины не может быть пустым")
+
+    changes["content_hash"] = None
+
+    try:
+        if changes.get("museum_id") is not None:
+            await _check_museum_exists(changes["museum_id"], db)
+
+        overrides = {field: changes[field] for field in ("title", "genre", "period") if field in changes}
+        if "artist_id" in changes:
+            artist_id = changes["artist_id"]
+            overrides["artist_long_name"] = await _get_artist_long_name(artist_id, db) if artist_id is not None else None
+        if overrides:
+            changes["search_document"] = search_document_expression(**overrides)
+
+        condition = _selection_condition(request_data, db.get_bind().dialect.name)
+        updated, unique_titles_changed = await _bulk_update_with_unique_titles(db, condition, changes)
+        if updated:
+            invalidate_painting_caches()
+        return {"updated": updated, "unique_titles_changed": unique_titles_changed}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ошибка при массовом изменении картин: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Ошибка при массовом изменении картин")
+
+@router.delete(
+        "/paintings/bulk",
+        response_model=schemas.PaintingBulkDeleteResponse,
+        summary="Массовое удаление картин",
+        description="Удаляет картины по списку ID или фильтру одним DELETE в одной транзакции"
+)
+@log_execution("bulk_delete_paintings")
+async def bulk_delete_paintings(
+    request_data: schemas.PaintingSelection,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Удалить много картин одним запросом.
+
+    Тело запроса:
+    - **ids** или **filter**: Список ID (до 10000) или фильтр как у списка картин (непустой)
+
+    Особенности:
+    - Картины удаляются одним DELETE ... WHERE, сводки затронутых музеев
+      пересчитываются в той же транзакции
+
+    Возвращает:
+    - Число удаленных картин
+
+    Исключения:
+    - 400: Если фильтр не дает ни одного условия
+    - 500: При ошибке удаления из базы данных
+    """
+    try:
+        condition = _selection_condition(request_data, db.get_bind().dialect.name)
+        museum_ids = await db.scalars(select(models.Painting.museum_id).filter(condition).distinct())
+
+        result = await db.execute(
+            delete(models.Painting).filter(condition).execution_options(synchronize_session=False)
+        )
+        await refresh_museum_summaries(db, museum_ids.all())
+        await db.commit()
+
+        if result.rowcount:
+            invalidate_painting_caches()
+        return {"deleted": result.rowcount}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ошибка при массовом удалении картин: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Ошибка при массовом удалении картин")
+
+@router.put(
+        "/paintings/by-unique-title/{unique_title}",
+        response_model=schemas.PaintingResponse,
+        summary="Создать или обновить картину по unique_title",
+        description="Идемпотентная запись картины: INSERT ... ON CONFLICT (unique_title) DO UPDATE",
+        responses={201: {"model": schemas.PaintingResponse, "description": "Картина создана"}}
+)
+@log_execution("upsert_painting")
+async def upsert_painting(
+    unique_title: str,
+    painting_data: schemas.PaintingCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Создать картину с заданным unique_title или обновить существующую.
+
+    Параметры:
+    - **unique_title**: Ключ картины во внешнем каталоге (до 100 символов)
+    - **painting_data**: Полные данные картины (объект PaintingCreate)
+
+    Особенности:
+    - unique_title не генерируется и не получает суффиксов: повторный вызов обновляет ту же картину;
+      правки названия и года через PUT /paintings/{painting_id} его не меняют
+    - Если данные совпадают с последней записью (content_hash), строка не перезаписывается
+    - search_document и сводка музея обновляются в той же транзакции
+
+    Возвращает:
+    - Картину; 201 - если она создана, 200 - если обновлена или не изменилась
+
+    Исключения:
+    - 404: Если указанный художник или музей не существуют
+    - 422: Если unique_title длиннее 100 символов
+    - 500: При ошибке записи в базу данных
+    """
+    try:
+        try:
+            item = schemas.PaintingUpsert(**painting_data.model_dump(), unique_title=unique_title)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=_format_validation_error(e))
+
+        await _get_artist_long_name(item.artist_id, db)
+        await _check_museum_exists(item.museum_id, db)
+
+        errors = []
+        counts = await _upsert_paintings_chunk([(1, item)], db, errors)
+        if errors:
+            raise HTTPException(status_code=500, detail="Ошибка при записи картины")
+        if counts["created"] or counts["updated"]:
+            invalidate_painting_caches()
+
+        painting_id = await db.scalar(select(models.Painting.id).filter(models.Painting.unique_title == unique_title))
+        return _painting_response(
+            await _get_painting(painting_id, db),
+            status_code=201 if counts["created"] else 200
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ошибка при записи картины по unique_title: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Ошибка при записи картины")
+
+@router.put(
+        "/paintings/by-unique-title",
+        response_model=schemas.BulkUpsertResponse,
+        summary="Синхронизация каталога по unique_title",
+        description="Создает или обновляет картины из тела запроса в формате JSON Lines / NDJSON",
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {"application/x-ndjson": {"schema": {"type": "string"}}}
+            }
+        }
+)
+@log_execution("bulk_upsert_paintings")
+async def bulk_upsert_paintings(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Синхронизировать каталог картин одним запросом.
+
+    Тело запроса: по одному объекту PaintingUpsert (PaintingCreate и unique_title) в строке.
+
+    Особенности:
+    - Строки обрабатываются пакетами по BULK_IMPORT_CHUNK_SIZE, каждый пакет - один
+      INSERT ... ON CONFLICT (unique_title) DO UPDATE в отдельной транзакции
+    - Строки, данные которых не изменились с прошлой синхронизации (content_hash),
+      отсеиваются по одной выборке хэшей на пакет и не записываются
+    - Если unique_title повторяется в пакете, применяется последняя строка
+    - Ошибочные строки не прерывают синхронизацию и перечисляются в ответе
+
+    Возвращает:
+    - Число созданных, обновленных и неизмененных картин и ошибки по строкам
+
+    Исключения:
+    - 500: При ошибке чтения запроса или работы с базой данных
+    """
+    try:
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        errors = []
+
+        async for chunk in _ndjson_chunks(request, schemas.PaintingUpsert, errors):
+            chunk_counts = await _upsert_paintings_chunk(chunk, db, errors)
+            # Пакет уже закоммичен: кэш сбрасывается сразу, даже если следующий пакет упадет
+            if chunk_counts["created"] or chunk_counts["updated"]:
+                invalidate_painting_caches()
+            for name, value in chunk_counts.items():
+                counts[name] += value
+
+        errors.sort(key=lambda error: error["line"])
+        return {**counts, "failed": len(errors), "errors": errors}
+
+    except Exception as e:
+        logger.error(f"Ошибка при синхронизации картин: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Ошибка при синхронизации картин")
+
 @router.put(
         "/paintings/{painting_id}",
         response_model=schemas.PaintingResponse,
@@ -172,7 +784,7 @@ async def create_painting(painting_data: schemas.PaintingCreate, db: Session = D
 async def update_painting(
     painting_id: int, 
     painting_data: schemas.PaintingUpdate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Обновить информацию о существующей картине.
@@ -183,8 +795,11 @@ async def update_painting(
 
     Особенности:
     - Поддерживает частичное обновление (только переданные поля)
-    - При изменении названия или года автоматически генерируется новый unique_title
+    - При изменении названия или года автоматически генерируется новый unique_title,
+      кроме картин, чей unique_title задан синхронизацией (PUT /paintings/by-unique-title)
     - Проверяет существование новых artist_id и museum_id если они переданы
+    - При изменении названия, жанра, периода или художника пересчитывает search_document
+    - При изменении музея, года или жанра применяет приращения к сводкам затронутых музеев
 
     Возвращает:
     - Обновленный объект картины
@@ -194,48 +809,71 @@ async def update_painting(
     - 500: При ошибке обновления в базе данных
     """
     try:
-        painting = db.query(models.Painting).filter(models.Painting.id == painting_id).first()
+        # Блокировка строки: старые значения для приращений сводки не изменятся до commit
+        painting = await db.get(models.Painting, painting_id, with_for_update=True)
         if not painting:
             raise HTTPException(status_code=404, detail=f"Картина с ID {painting_id} не найдена")
+        previous_facts = summary_facts(painting)
 
-        if painting_data.artist_id is not None:
-            _check_artist_exists(painting_data.artist_id, db)
-        
         if painting_data.museum_id is not None:
-            _check_museum_exists(painting_data.museum_id, db)
+            await _check_museum_exists(painting_data.museum_id, db)
         
-        need_new_unique_title = (
+        need_new_unique_title = not painting.unique_title_external and (
             painting_data.title is not None and painting_data.title != painting.title or
             painting_data.year is not None and painting_data.year != painting.year
         )
         
+        update_data = painting_data.model_dump(exclude_unset=True)
+        # Следующая синхронизация по unique_title перезапишет локальную правку
+        update_data["content_hash"] = None
+
+        if SEARCH_DOCUMENT_FIELDS & update_data.keys():
+            # Заодно проверяет существование нового artist_id
+            values = {field: update_data.get(field, getattr(painting, field)) for field in SEARCH_DOCUMENT_FIELDS}
+            update_data["search_document"] = search_document(
+                values["title"],
+                values["genre"],
+                values["period"],
+                await _get_artist_long_name(values["artist_id"], db) if values["artist_id"] is not None else None
+            )
+
+        async def apply_changes():
+            # После rollback изменения объекта сбрасываются, поэтому применяются заново
+            painting = await db.get(models.Painting, painting_id)
+            for field, value in update_data.items():
+                setattr(painting, field, value)
+            return painting
+
+        async def update_summaries():
+            if MUSEUM_SUMMARY_FIELDS & update_data.keys():
+                painting = await db.get(models.Painting, painting_id)
+                await apply_museum_summary_changes(db, added=[summary_facts(painting)], removed=[previous_facts])
+
         if need_new_unique_title:
             new_title = painting_data.title if painting_data.title is not None else painting.title
             new_year = painting_data.year if painting_data.year is not None else painting.year
             
-            unique_title = _generate_painting_unique_title(
+            await _commit_with_unique_title(
+                db,
+                apply_changes,
                 title=new_title,
                 year=new_year,
-                db=db,
-                exclude_id=painting_id
+                exclude_id=painting_id,
+                update_summaries=update_summaries
             )
-            painting.unique_title = unique_title
-        
-        update_data = painting_data.model_dump(exclude_unset=True)
-
-        for field, value in update_data.items():
-            setattr(painting, field, value)
-        
-        db.commit()
-        db.refresh(painting)
-        return painting
+        else:
+            await apply_changes()
+            await update_summaries()
+            await db.commit()
+        invalidate_painting_caches()
+        return _painting_response(await _get_painting(painting_id, db))
         
     except HTTPException as e: 
         logger.warning(f"HTTPException при обновлении картины: {e.detail}")
         raise
     except Exception as e:
         logger.error(f"Ошибка при обновлении картины: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Ошибка при обновлении картины")
     
 @router.delete(
@@ -246,7 +884,7 @@ async def update_painting(
 @log_execution("delete_painting")
 async def delete_painting(
     painting_id: int, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Удалить картину из системы.
@@ -262,15 +900,17 @@ async def delete_painting(
     - 500: При ошибке удаления из базы данных
     """
     try:
-        painting = db.query(models.Painting).filter(models.Painting.id == painting_id).first()
+        painting = await db.get(models.Painting, painting_id, with_for_update=True)
         if not painting:
             raise HTTPException(
                 status_code=404, 
                 detail=f"Картина с ID {painting_id} не найдена"
             )
         
-        db.delete(painting)
-        db.commit()
+        await db.delete(painting)
+        await apply_museum_summary_changes(db, removed=[summary_facts(painting)])
+        await db.commit()
+        invalidate_painting_caches()
         
         return {
             "message": f"Картина '{painting.title}' успешно удалена",
@@ -282,30 +922,597 @@ async def delete_painting(
         raise
     except Exception as e:
         logger.error(f"Ошибка при удалении картины: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500, 
             detail="Ошибка при удалении картины"
         )
 
-def _check_artist_exists(artist_id: int, db: Session) -> bool:
-    artist = db.query(models.Artist).filter(models.Artist.id == artist_id).first()
-    if not artist:
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Разбивает поток тела запроса на строки, нумеруя их с 1"""
+    buffer = b""
+    line_number = 0
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line
+    if buffer:
+        yield line_number + 1, buffer
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc'])) or 'body'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+async def _import_paintings_chunk(
+    chunk: List[Tuple[int, schemas.PaintingCreate]],
+    db: AsyncSession,
+    errors: List[dict]
+) -> int:
+    """Проверяет и вставляет пакет строк импорта, возвращает число вставленных.
+
+    Ошибки строк добавляются в errors. Если параллельная запись заняла один из
+    подобранных unique_title, пакет откатывается и подбирается заново.
+    """
+    artist_ids = {painting.artist_id for _, painting in chunk}
+    museum_ids = {painting.museum_id for _, painting in chunk}
+    artist_names = dict((await db.execute(
+        select(models.Artist.id, models.Artist.artist_long_name).filter(models.Artist.id.in_(artist_ids))
+    )).all())
+    existing_museums = set(await db.scalars(select(models.Museum.id).filter(models.Museum.id.in_(museum_ids))))
+
+    valid = []
+    for line_number, painting in chunk:
+        if painting.artist_id not in artist_names:
+            errors.append({"line": line_number, "detail": "Художник не найден"})
+        elif painting.museum_id not in existing_museums:
+            errors.append({"line": line_number, "detail": "Музей не найден"})
+        else:
+            valid.append((line_number, painting, _unique_title_base(painting.title, painting.year)))
+
+    if not valid:
+        return 0
+
+    for attempt in range(1, UNIQUE_TITLE_ATTEMPTS + 1):
+        taken = _group_titles_by_base(await _taken_unique_titles(db, {base for _, _, base in valid}))
+
+        rows = []
+        for _, painting, base in valid:
+            unique_title = _next_free_unique_title(base, taken[base])
+            _register_unique_title(taken, unique_title)
+            rows.append({
+                **painting.model_dump(),
+                "unique_title": unique_title,
+                "search_document": search_document(
+                    painting.title, painting.genre, painting.period, artist_names[painting.artist_id]
+                ),
+            })
+
+        try:
+            await db.execute(insert(models.Painting), rows)
+            await apply_museum_summary_changes(db, added=[summary_facts(row) for row in rows])
+            await db.commit()
+            return len(rows)
+        except IntegrityError as e:
+            await db.rollback()
+            if attempt == UNIQUE_TITLE_ATTEMPTS:
+                logger.error(f"Не удалось вставить пакет импорта: {str(e)}")
+                errors.extend(
+                    {"line": line_number, "detail": "Ошибка записи пакета в базу данных"}
+                    for line_number, _, _ in valid
+                )
+                return 0
+            logger.warning(f"Конфликт unique_title при импорте пакета, попытка {attempt + 1}")
+
+async def _ndjson_chunks(
+    request: Request,
+    schema: Type[BaseModel],
+    errors: List[dict]
+) -> AsyncIterator[List[Tuple[int, BaseModel]]]:
+    """Пакеты по BULK_IMPORT_CHUNK_SIZE провалидированных строк NDJSON с номерами строк.
+
+    Пустые строки пропускаются, ошибки валидации добавляются в errors.
+    """
+    chunk = []
+    async for line_number, line in _iter_lines(request.stream()):
+        if not line.strip():
+            continue
+        try:
+            chunk.append((line_number, schema.model_validate_json(line)))
+        except ValidationError as e:
+            errors.append({"line": line_number, "detail": _format_validation_error(e)})
+
+        if len(chunk) >= BULK_IMPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+async def _upsert_paintings_chunk(
+    chunk: List[Tuple[int, schemas.PaintingUpsert]],
+    db: AsyncSession,
+    errors: List[dict]
+) -> Dict[str, int]:
+    """Создает или обновляет пакет картин по unique_title, возвращает счетчики created/updated/unchanged.
+
+    Одна выборка по unique_title отсеивает строки с тем же content_hash. Остальные
+    пишутся одним INSERT ... ON CONFLICT DO UPDATE WHERE content_hash отличается:
+    RETURNING отдает только записанные строки, а updated_at IS NULL отличает
+    созданные от обновленных.
+    """
+    counts = {"created": 0, "updated": 0, "unchanged": 0}
+
+    # ON CONFLICT не может изменить одну строку дважды: действует последняя строка пакета
+    latest = {}
+    for line_number, item in chunk:
+        if item.unique_title in latest:
+            errors.append({"line": latest[item.unique_title][0], "detail": "unique_title повторяется ниже в пакете"})
+        latest[item.unique_title] = (line_number, item)
+
+    items = list(latest.values())
+    artist_ids = {item.artist_id for _, item in items}
+    museum_ids = {item.museum_id for _, item in items}
+    artist_names = dict((await db.execute(
+        select(models.Artist.id, models.Artist.artist_long_name).filter(models.Artist.id.in_(artist_ids))
+    )).all())
+    existing_museums = set(await db.scalars(select(models.Museum.id).filter(models.Museum.id.in_(museum_ids))))
+    existing = {
+        row.unique_title: row
+        for row in (await db.execute(
+            select(models.Painting.unique_title, models.Painting.museum_id, models.Painting.content_hash)
+            .filter(models.Painting.unique_title.in_(latest))
+        )).all()
+    }
+
+    rows, lines = [], []
+    for line_number, item in items:
+        if item.artist_id not in artist_names:
+            errors.append({"line": line_number, "detail": "Художник не найден"})
+            continue
+        if item.museum_id not in existing_museums:
+            errors.append({"line": line_number, "detail": "Музей не найден"})
+            continue
+
+        data = item.model_dump()
+        digest = content_hash(data)
+        previous = existing.get(item.unique_title)
+        if previous is not None and previous.content_hash == digest:
+            counts["unchanged"] += 1
+            continue
+
+        rows.append({
+            **data,
+            "content_hash": digest,
+            "unique_title_external": True,
+            "search_document": search_document(item.title, item.genre, item.period, artist_names[item.artist_id]),
+        })
+        lines.append(line_number)
+
+    if not rows:
+        return counts
+
+    painting = models.Painting
+    try:
+        result = await db.execute(
+            upsert(
+                painting, rows, "unique_title", db.get_bind().dialect.name,
+                changed="content_hash", extra_set={"updated_at": func.now()}
+            ).returning(painting.unique_title, painting.museum_id, painting.updated_at)
+        )
+        written = result.all()
+
+        # Перенесенные картины меняют сводки и старого, и нового музея
+        affected_museums = {row.museum_id for row in written}
+        affected_museums.update(
+            existing[row.unique_title].museum_id for row in written if row.unique_title in existing
+        )
+        await refresh_museum_summaries(db, affected_museums)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        logger.error(f"Не удалось записать пакет синхронизации: {str(e)}")
+        errors.extend({"line": line_number, "detail": "Ошибка записи пакета в базу данных"} for line_number in lines)
+        return counts
+
+    for row in written:
+        counts["created" if row.updated_at is None else "updated"] += 1
+    counts["unchanged"] += len(rows) - len(written)
+    return counts
+
+async def _stream_painting_batches(query, db: AsyncSession) -> AsyncIterator[List[models.Painting]]:
+    """Читает картины серверным курсором пачками по yield_per.
+
+    Ошибка посреди выгрузки уже не может стать HTTP-статусом, поэтому она
+    логируется, а поток обрывается.
+    """
+    try:
+        result = await db.stream(query)
+        async for batch in result.scalars().partitions():
+            yield batch
+    except Exception as e:
+        logger.error(f"Ошибка при выгрузке картин: {str(e)}", exc_info=True)
+        raise
+
+async def _export_ndjson(query, db: AsyncSession) -> AsyncIterator[bytes]:
+    async for batch in _stream_painting_batches(query, db):
+        yield b"".join(dump_json(painting_to_dict(painting)) + b"\n" for painting in batch)
+
+def _painting_csv_row(painting: models.Painting) -> list:
+    row = []
+    for column in EXPORT_CSV_PAINTING_COLUMNS:
+        value = getattr(painting, column)
+        row.append("; ".join(value) if isinstance(value, list) else value)
+    for relation, columns in (("artist", EXPORT_CSV_ARTIST_COLUMNS), ("museum", EXPORT_CSV_MUSEUM_COLUMNS)):
+        related = getattr(painting, relation)
+        row.extend(getattr(related, column) if related else None for column in columns)
+    return row
+
+async def _export_csv(query, db: AsyncSession) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([
+        *EXPORT_CSV_PAINTING_COLUMNS,
+        *(f"artist_{column}" for column in EXPORT_CSV_ARTIST_COLUMNS),
+        *(f"museum_{column}" for column in EXPORT_CSV_MUSEUM_COLUMNS),
+    ])
+
+    async for batch in _stream_painting_batches(query, db):
+        writer.writerows(_painting_csv_row(painting) for painting in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _painting_response(painting: models.Painting, status_code: int = 200) -> ORJSONResponse:
+    with measure_serialization():
+        return ORJSONResponse(painting_to_dict(painting), status_code=status_code)
+
+def _batch_to_dict(content: dict, fields: Tuple[str, ...]) -> dict:
+    """Ответ batch-get в форме PaintingBatchGetResponse"""
+    related = {}
+    return {
+        "data": [painting_to_dict(painting, related, fields) for painting in content["data"]],
+        "not_found": content["not_found"],
+    }
+
+def _painting_load_options(fields: Tuple[str, ...] = PAINTING_FIELDS) -> tuple:
+    """Опции загрузки картины под выводимые поля.
+
+    Обе связи many-to-one, поэтому joinedload подтягивает их в том же
+    SELECT, что и страницу картин, вместо отдельного запроса на каждую строку.
+    Для сокращенного ответа load_only оставляет в SELECT только нужные колонки
+    и ключ пагинации (id, year); ненужные связи не присоединяются.
+    """
+    options = [
+        joinedload(getattr(models.Painting, relation))
+        for relation in PAINTING_RELATIONS
+        if relation in fields
+    ]
+    if fields != PAINTING_FIELDS:
+        columns = {"id", "year", *fields} - set(PAINTING_RELATIONS)
+        options.append(load_only(*(getattr(models.Painting, column) for column in sorted(columns))))
+    return tuple(options)
+
+def _parse_fields(fields: Optional[str], include: Optional[str]) -> Tuple[str, ...]:
+    """Выводимые поля картины по параметрам fields= и include=.
+
+    Без параметров - полный PaintingResponse. Поля возвращаются в порядке схемы,
+    поэтому fields=year,title и fields=title,year дают один ключ кэша.
+
+    Исключения:
+    - 400: Если запрошено неизвестное поле или связь
+    """
+    if fields is None and include is None:
+        return PAINTING_FIELDS
+
+    columns = [name for name in PAINTING_FIELDS if name not in PAINTING_RELATIONS]
+    requested = set(_split_list(fields)) if fields is not None else set(columns)
+    relations = set(_split_list(include)) if include is not None else set()
+
+    unknown = (requested - set(PAINTING_FIELDS)) | (relations - set(PAINTING_RELATIONS))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Неизвестные поля: {', '.join(sorted(unknown))}"
+        )
+
+    requested |= relations | {"id"}
+    return tuple(name for name in PAINTING_FIELDS if name in requested)
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _facets_query(filters: schemas.PaintingFilters, dialect: str):
+    """Один запрос со всеми фасетами: строки (facet, value, label, count).
+
+    Отфильтрованные картины - CTE, которую PostgreSQL материализует один раз
+    для всех ветвей UNION ALL. Значения приводятся к строке, чтобы ветви
+    имели одинаковые типы колонок.
+    """
+    painting = models.Painting
+    filtered = _apply_painting_filters(
+        select(
+            painting.genre,
+            painting.period,
+            painting.museum_id,
+            (painting.year // 10 * 10).label("decade"),
+            painting.style,
+            painting.materials,
+        ),
+        filters,
+        dialect,
+    ).cte("filtered")
+
+    def facet(name: str, value, label=None):
+        return select(
+            literal_column(f"'{name}'").label("facet"),
+            cast(value, String).label("value"),
+            (label if label is not None else null()).label("label"),
+            func.count().label("count"),
+        )
+
+    branches = [
+        facet("total", null()).select_from(filtered),
+        *(
+            facet(name, filtered.c[name]).filter(filtered.c[name].isnot(None)).group_by(filtered.c[name])
+            for name in ("genre", "period", "decade")
+        ),
+        facet("museum", filtered.c.museum_id, models.Museum.name)
+        .join_from(filtered, models.Museum, models.Museum.id == filtered.c.museum_id)
+        .group_by(filtered.c.museum_id, models.Museum.name),
+    ]
+    for name in ("style", "materials"):
+        elements = json_array_elements(filtered.c[name], dialect)
+        branches.append(
+            facet(name, elements.c.value)
+            .select_from(filtered)
+            .join(elements, true())
+            .filter(elements.c.value.isnot(None))
+            .group_by(elements.c.value)
+        )
+    return union_all(*branches)
+
+def _facets_to_dict(rows) -> dict:
+    """Строки _facets_query в форме PaintingFacetsResponse"""
+    content = {name: [] for name in schemas.PaintingFacetsResponse.model_fields}
+    content["total"] = 0
+    for facet, value, label, count in rows:
+        if facet == "total":
+            content["total"] = count
+            continue
+        content[facet].append({
+            "value": int(value) if facet in FACET_INTEGER_VALUES else value,
+            "label": label,
+            "count": count,
+        })
+    for name, buckets in content.items():
+        if name != "total":
+            buckets.sort(key=lambda bucket: (-bucket["count"], str(bucket["value"])))
+    return content
+
+def _apply_painting_filters(query, filters: schemas.PaintingFilters, dialect: str):
+    """Добавляет к запросу картин условия фильтров списка"""
+    return query.filter(*_painting_filter_conditions(filters, dialect))
+
+def _painting_filter_conditions(filters: schemas.PaintingFilters, dialect: str) -> list:
+    """Условия фильтров списка по колонкам paintings (для SELECT, UPDATE и DELETE)"""
+    painting = models.Painting
+    conditions = []
+    if filters.artist_name:
+        conditions.append(_artist_name_condition(filters.artist_name))
+    if filters.genre is not None:
+        conditions.append(painting.genre == filters.genre)
+    if filters.type is not None:
+        conditions.append(painting.type == filters.type)
+    if filters.year_from is not None:
+        conditions.append(painting.year >= filters.year_from)
+    if filters.year_to is not None:
+        conditions.append(painting.year <= filters.year_to)
+    if filters.artist_id is not None:
+        conditions.append(painting.artist_id == filters.artist_id)
+    if filters.museum_id is not None:
+        conditions.append(painting.museum_id == filters.museum_id)
+    if filters.style:
+        conditions.append(json_array_contains(painting.style, filters.style, dialect))
+    if filters.materials:
+        conditions.append(json_array_contains(painting.materials, filters.materials, dialect))
+    return conditions
+
+def _artist_name_condition(artist_name: str):
+    """Фильтр по частичному совпадению фамилии художника.
+
+    ILIKE '%...%' в PostgreSQL обслуживается GIN-индексом pg_trgm
+    ix_artists_short_name_trgm: сначала по индексу находятся подходящие
+    художники, затем их картины. Спецсимволы LIKE в запросе экранируются.
+    """
+    matching_artists = select(models.Artist.id).filter(
+        models.Artist.artist_short_name.ilike(f"%{_escape_like(artist_name)}%", escape="\\")
+    )
+    return models.Painting.artist_id.in_(matching_artists)
+
+def _escape_like(value: str) -> str:
+    """Экранирует спецсимволы LIKE для использования с escape='\\'"""
+    return re.sub(r"([\\%_])", r"\\\1", value)
+
+async def _count_paintings(
+    query,
+    filters: schemas.PaintingFilters,
+    mode: str,
+    db: AsyncSession
+) -> Tuple[Optional[int], str]:
+    """Возвращает (total, count_type) для списка картин.
+
+    Точный подсчет кэшируется по нормализованному набору фильтров до ближайшей
+    записи в каталог. Оценка по pg_class.reltuples возможна только без фильтров
+    и только в PostgreSQL, иначе используется точный подсчет.
+    """
+    if mode == "none":
+        return None, "none"
+
+    key = filters.cache_key()
+
+    if mode == "estimated" and not key and db.get_bind().dialect.name == "postgresql":
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'paintings'::regclass")
+        )
+        # -1: таблица еще ни разу не анализировалась
+        if estimate is not None and estimate >= 0:
+            return int(estimate), "estimated"
+
+    total = count_cache.get(key)
+    if total is not None:
+        return total, "cached"
+
+    generation = count_cache.generation
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    count_cache.set(key, total, generation)
+    return total, "exact"
+
+async def _get_painting(
+    painting_id: int,
+    db: AsyncSession,
+    fields: Tuple[str, ...] = PAINTING_FIELDS
+) -> Optional[models.Painting]:
+    result = await db.execute(
+        select(models.Painting)
+        .options(*_painting_load_options(fields))
+        .filter(models.Painting.id == painting_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+def _selection_condition(selection: schemas.PaintingSelection, dialect: str):
+    """Условие WHERE по списку ID или фильтру массовой операции.
+
+    Исключения:
+    - 400: Если фильтр не дает ни одного условия (выбрал бы весь каталог)
+    """
+    if selection.ids is not None:
+        return models.Painting.id.in_(selection.ids)
+    conditions = _painting_filter_conditions(selection.filter, dialect)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Фильтр не может быть пустым")
+    return and_(*conditions)
+
+async def _bulk_update_with_unique_titles(db: AsyncSession, condition, changes: dict) -> Tuple[int, int]:
+    """UPDATE ... WHERE condition с пакетным пересчетом unique_title; возвращает (изменено, новых unique_title).
+
+    UPDATE ... RETURNING отдает новые название и год каждой строки; новые
+    unique_title (кроме ключей внешнего каталога) подбираются в памяти по одной выборке занятых и записываются
+    одним executemany по первичному ключу. Если параллельная запись заняла одно
+    из подобранных названий, транзакция повторяется.
+    """
+    painting = models.Painting
+    renames_titles = bool({"title", "year"} & changes.keys())
+
+    for attempt in range(1, UNIQUE_TITLE_ATTEMPTS + 1):
+        museum_ids = []
+        if MUSEUM_SUMMARY_FIELDS & changes.keys():
+            museum_ids = list(await db.scalars(select(painting.museum_id).filter(condition).distinct()))
+            museum_ids.append(changes.get("museum_id"))
+
+        result = await db.execute(
+            update(painting)
+            .filter(condition)
+            .values(**changes)
+            .returning(painting.id, painting.title, painting.year, painting.unique_title, painting.unique_title_external)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+
+        renamed = []
+        if renames_titles and rows:
+            bases = {row.id: _unique_title_base(row.title, row.year) for row in rows}
+            taken = _group_titles_by_base(await _taken_unique_titles(db, set(bases.values())))
+            for row in rows:
+                base = bases[row.id]
+                # Внешний ключ синхронизации не пересчитывается
+                if row.unique_title_external or row.unique_title in taken[base]:
+                    continue
+                unique_title = _next_free_unique_title(base, taken[base])
+                _register_unique_title(taken, unique_title)
+                renamed.append({"id": row.id, "unique_title": unique_title})
+
+        try:
+            if renamed:
+                await db.execute(update(painting), renamed)
+            await refresh_museum_summaries(db, museum_ids)
+            await db.commit()
+            return len(rows), len(renamed)
+        except IntegrityError:
+            await db.rollback()
+            if attempt == UNIQUE_TITLE_ATTEMPTS:
+                raise
+            logger.warning(f"Конфликт unique_title при массовом изменении, попытка {attempt + 1}")
+
+async def _search_paintings_page(
+    q: str,
+    db: AsyncSession,
+    page_size: int,
+    cursor: Optional[str]
+) -> dict:
+    """Страница результатов поиска по ключу (rank, id) без OFFSET"""
+    key = None
+    if cursor:
+        direction, key = decode_cursor(cursor, 2)
+        if (
+            direction != CURSOR_NEXT
+            or not isinstance(key[0], (int, float))
+            or isinstance(key[0], bool)
+            or not isinstance(key[1], int)
+        ):
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    matches = search_matches(q, db.get_bind().dialect.name)
+    query = select(models.Painting, matches.c.rank).join(matches, matches.c.id == models.Painting.id)
+    if key is not None:
+        query = query.filter(or_(
+            matches.c.rank < key[0],
+            and_(matches.c.rank == key[0], models.Painting.id > key[1])
+        ))
+
+    result = await db.execute(
+        query.options(*_painting_load_options())
+        .order_by(matches.c.rank.desc(), models.Painting.id.asc())
+        .limit(page_size + 1)
+    )
+    rows = result.all()
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    return {
+        "data": [painting for painting, _ in rows],
+        "total": None,
+        "count_type": "none",
+        "page": None,
+        "page_size": page_size,
+        "total_pages": None,
+        "has_next": has_next,
+        "has_prev": key is not None,
+        "next_cursor": encode_cursor([rows[-1][1], rows[-1][0].id], CURSOR_NEXT) if has_next else None,
+    }
+
+async def _get_artist_long_name(artist_id: int, db: AsyncSession) -> str:
+    artist_long_name = await db.scalar(
+        select(models.Artist.artist_long_name).filter(models.Artist.id == artist_id)
+    )
+    if artist_long_name is None:
         raise HTTPException(status_code=404, detail="Художник не найден")
-    return True
+    return artist_long_name
 
-def _check_museum_exists(museum_id: int, db: Session) -> bool:
-    museum = db.query(models.Museum).filter(models.Museum.id == museum_id).first()
+async def _check_museum_exists(museum_id: int, db: AsyncSession) -> bool:
+    museum = await db.scalar(select(models.Museum.id).filter(models.Museum.id == museum_id))
     if not museum:
         raise HTTPException(status_code=404, detail="Музей не найден")
     return True
 
-def _generate_painting_unique_title(
-    title: str, 
-    year: Optional[int] = None, 
-    db: Session = None, 
-    exclude_id: Optional[int] = None
-) -> str:
+def _unique_title_base(title: str, year: Optional[int] = None) -> str:
     try:
         base_title = transliterate.translit(title, 'ru', reversed=True).lower()
     except:
@@ -319,29 +1526,107 @@ def _generate_painting_unique_title(
     clean_title = re.sub(r'[^a-zа-яё0-9_]', '', base_title)
     
     if year:
-        unique_title_base = f"{clean_title}_{year}"
-    else:
-        unique_title_base = clean_title
-    
-    unique_title = unique_title_base
+        return f"{clean_title}_{year}"
+    return clean_title
+
+def _next_free_unique_title(base: str, taken: Set[str]) -> str:
+    """Первый свободный вариант из base, base_1, base_2, ... среди занятых"""
+    if base not in taken:
+        return base
+
+    suffix_pattern = re.compile(rf"{re.escape(base)}_(\d+)")
+    used = {
+        int(match.group(1))
+        for match in map(suffix_pattern.fullmatch, taken)
+        if match
+    }
     counter = 1
+    while counter in used:
+        counter += 1
+    return f"{base}_{counter}"
 
-    if db is None:
-        return unique_title
-    
-    while True:
-        query = db.query(models.Painting).filter(models.Painting.unique_title == unique_title)
+def _register_unique_title(groups: Dict[str, Set[str]], unique_title: str) -> None:
+    """Относит unique_title к базе, равной ему самому, и к базе до суффикса _N"""
+    groups[unique_title].add(unique_title)
+    match = UNIQUE_TITLE_SUFFIX.fullmatch(unique_title)
+    if match:
+        groups[match.group(1)].add(unique_title)
+
+def _group_titles_by_base(titles: Iterable[str]) -> Dict[str, Set[str]]:
+    """Группирует занятые unique_title по базам за один проход"""
+    groups = defaultdict(set)
+    for unique_title in titles:
+        _register_unique_title(groups, unique_title)
+    return groups
+
+async def _taken_unique_titles(
+    db: AsyncSession,
+    bases: Iterable[str],
+    exclude_id: Optional[int] = None
+) -> Set[str]:
+    """Все занятые unique_title вида base и base_N для набора баз.
+
+    LIKE по префиксу обслуживается индексом ix_paintings_unique_title_pattern;
+    базы перебираются группами, чтобы условие OR не разрасталось.
+    """
+    bases = sorted(set(bases))
+    taken = set()
+    for start in range(0, len(bases), UNIQUE_TITLE_PREFETCH_BATCH):
+        batch = bases[start:start + UNIQUE_TITLE_PREFETCH_BATCH]
+        query = select(models.Painting.unique_title).filter(
+            or_(
+                models.Painting.unique_title.in_(batch),
+                *(
+                    models.Painting.unique_title.like(f"{_escape_like(base)}\\_%", escape="\\")
+                    for base in batch
+                )
+            )
+        )
         if exclude_id:
             query = query.filter(models.Painting.id != exclude_id)
-        
-        if not query.first():
-            break
-        
-        unique_title = f"{unique_title_base}_{counter}"
-        counter += 1
-        
-        if counter > 100:
-            raise Exception("Слишком много попыток генерации unique_title")
-    
-    return unique_title
-        
+        taken.update(await db.scalars(query))
+    return taken
+
+async def _generate_painting_unique_title(
+    title: str, 
+    year: Optional[int] = None, 
+    db: AsyncSession = None, 
+    exclude_id: Optional[int] = None
+) -> str:
+    unique_title_base = _unique_title_base(title, year)
+
+    if db is None:
+        return unique_title_base
+
+    taken = await _taken_unique_titles(db, [unique_title_base], exclude_id)
+    return _next_free_unique_title(unique_title_base, taken)
+
+async def _commit_with_unique_title(
+    db: AsyncSession,
+    apply_changes: Callable[[], Awaitable[models.Painting]],
+    title: str,
+    year: Optional[int] = None,
+    exclude_id: Optional[int] = None,
+    update_summaries: Optional[Callable[[], Awaitable[None]]] = None
+) -> models.Painting:
+    """Присваивает unique_title и коммитит, повторяя попытку при гонке писателей.
+
+    Если параллельный запрос успел занять тот же unique_title, commit падает
+    с IntegrityError; тогда транзакция откатывается, apply_changes() заново
+    применяет изменения к сессии, и свободное имя подбирается еще раз.
+    update_summaries() обновляет сводки музеев в той же транзакции.
+    """
+    for attempt in range(1, UNIQUE_TITLE_ATTEMPTS + 1):
+        painting = await apply_changes()
+        unique_title = await _generate_painting_unique_title(title, year, db, exclude_id)
+        painting.unique_title = unique_title
+        try:
+            if update_summaries is not None:
+                await update_summaries()
+            await db.commit()
+            return painting
+        except IntegrityError:
+            await db.rollback()
+            if attempt == UNIQUE_TITLE_ATTEMPTS:
+                raise
+            logger.warning(f"Конфликт unique_title '{unique_title}', попытка {attempt + 1}")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List, Generic, TypeVar
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Generic, TypeVar, Union
 from datetime import datetime
 
 class ArtistBase(BaseModel):
@@ -23,6 +23,16 @@ class MuseumBase(BaseModel):
     zipcode: Optional[int] = None
     website: Optional[str] = None
 
+class GenreCount(BaseModel):
+    genre: str
+    count: int
+
+class MuseumLocation(BaseModel):
+    country: Optional[str] = None
+    city: Optional[str] = None
+    museum_count: int
+    painting_count: int
+
 class PaintingBase(BaseModel):
     title: str
     type: Optional[str] = None
@@ -42,6 +52,11 @@ class ArtistResponse(ArtistBase):
     class Config:
         from_attributes = True
 
+class ArtistWithStatsResponse(ArtistResponse):
+    painting_count: int = 0
+    first_year: Optional[int] = None
+    last_year: Optional[int] = None
+
 class MuseumResponse(MuseumBase):
     id: int
     created_at: Optional[datetime] = None
@@ -49,6 +64,12 @@ class MuseumResponse(MuseumBase):
     class Config:
         from_attributes = True
 
+class MuseumWithSummaryResponse(MuseumResponse):
+    painting_count: int = 0
+    first_year: Optional[int] = None
+    last_year: Optional[int] = None
+    top_genres: List[GenreCount] = []
+
 class PaintingResponse(PaintingBase):
     id: int
     unique_title: str
@@ -63,21 +84,122 @@ T = TypeVar('T')
 
 class PaginatedResponse(BaseModel, Generic[T]):
     data: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    count_type: str = "exact"
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+class PaintingFilters(BaseModel):
+    """Фильтры списка картин (общие для списка и фасетов)"""
+    artist_name: Optional[str] = None
+    genre: Optional[str] = None
+    type: Optional[str] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    artist_id: Optional[int] = None
+    museum_id: Optional[int] = None
+    style: Optional[List[str]] = None
+    materials: Optional[List[str]] = None
+
+    @field_validator("artist_name", "style", "materials")
+    @classmethod
+    def empty_to_none(cls, value):
+        # Пустые значения не дают условий фильтра - как и незаданные
+        return value or None
+
+    def cache_key(self) -> tuple:
+        """Нормализованный набор заданных фильтров для ключей кэша"""
+        key = []
+        for name, value in self:
+            if value is None:
+                continue
+            # style/materials - "содержит все", порядок значений не важен
+            key.append((name, tuple(sorted(set(value))) if isinstance(value, list) else value))
+        return tuple(key)
+
+class FacetBucket(BaseModel):
+    value: Union[int, str]
+    label: Optional[str] = None
+    count: int
+
+class PaintingFacetsResponse(BaseModel):
+    """Число картин по значениям фасетов для набора фильтров"""
+    total: int
+    genre: List[FacetBucket]
+    style: List[FacetBucket]
+    materials: List[FacetBucket]
+    period: List[FacetBucket]
+    museum: List[FacetBucket]
+    decade: List[FacetBucket]
+
 class PaintingCreate(PaintingBase):
     artist_id: int
     museum_id: int
 
+class PaintingUpsert(PaintingCreate):
+    unique_title: str = Field(..., min_length=1, max_length=100)
+
 class PaintingUpdate(PaintingBase):  
     title: Optional[str] = None
     artist_id: Optional[int] = None  
-    museum_id: Optional[int] = None 
\ No newline at end of file
+    museum_id: Optional[int] = None
+
+class PaintingBatchGetRequest(BaseModel):
+    # Верхняя граница - один IN (...) разумного размера на запрос
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class PaintingBatchGetResponse(BaseModel):
+    data: List[PaintingResponse]
+    not_found: List[int]
+
+class PaintingSelection(BaseModel):
+    """Картины для массовой операции: список ID или непустой фильтр списка картин"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[PaintingFilters] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Нужно указать ровно одно из ids и filter")
+        if self.filter is not None:
+            # Фильтр без условий выбрал бы весь каталог
+            if not self.filter.cache_key():
+                raise ValueError("Фильтр не может быть пустым")
+            year_from, year_to = self.filter.year_from, self.filter.year_to
+            if year_from is not None and year_to is not None and year_from > year_to:
+                raise ValueError("year_from не может быть больше year_to")
+        return self
+
+class PaintingBulkUpdateRequest(PaintingSelection):
+    changes: PaintingUpdate
+
+class PaintingBulkUpdateResponse(BaseModel):
+    updated: int
+    unique_titles_changed: int
+
+class PaintingBulkDeleteResponse(BaseModel):
+    deleted: int
+
+class BulkImportError(BaseModel):
+    line: int
+    detail: str
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportError]
+
+class BulkUpsertResponse(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    errors: List[BulkImportError]
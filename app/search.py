@@ -0,0 +1,94 @@
+"""Полнотекстовый поиск картин.
+
+Каждая картина хранит денормализованный search_document - название, жанр,
+период и полное имя художника, - который пересчитывается при записи картины.
+Поиск поэтому не присоединяет художников во время запроса:
+
+- PostgreSQL: генерируемая колонка search_vector (to_tsvector russian || simple)
+  с GIN-индексом и pg_trgm-индекс search_document для запросов с опечатками;
+- SQLite: внешняя таблица FTS5 paintings_fts, синхронизируемая триггерами.
+
+DDL обоих вариантов - models.PAINTINGS_SEARCH_DDL и миграция.
+"""
+import re
+from typing import List, Optional
+
+from sqlalchemy import Float, String, column, func, literal, literal_column, or_, select, table
+
+from app import models
+
+SEARCH_TERM = re.compile(r"\w+")
+PAINTINGS_FTS = table("paintings_fts", column("rowid"), column("paintings_fts"))
+
+def search_document(
+    title: Optional[str],
+    genre: Optional[str],
+    period: Optional[str],
+    artist_long_name: Optional[str],
+) -> str:
+    """Текст поискового документа картины; совпадает с search_document_expression()"""
+    return " ".join(part or "" for part in (title, genre, period, artist_long_name))
+
+def search_document_expression(**overrides):
+    """SQL-выражение search_document для UPDATE ... по строке paintings.
+
+    overrides - новые значения title, genre, period или artist_long_name,
+    которые тот же UPDATE записывает в строку: в SET справа видны старые
+    значения колонок, поэтому новые подставляются литералами.
+    """
+    painting = models.Painting
+    columns = {
+        "title": painting.title,
+        "genre": painting.genre,
+        "period": painting.period,
+        "artist_long_name": (
+            select(models.Artist.artist_long_name)
+            .where(models.Artist.id == painting.artist_id)
+            .scalar_subquery()
+        ),
+    }
+    parts = [
+        func.coalesce(literal(overrides[name], String) if name in overrides else column, "")
+        for name, column in columns.items()
+    ]
+    document = parts[0]
+    for part in parts[1:]:
+        document = document.concat(" ").concat(part)
+    return document
+
+def search_terms(query: str) -> List[str]:
+    return SEARCH_TERM.findall(query)
+
+def search_matches(query: str, dialect: str):
+    """Подзапрос (id, rank) подходящих картин; больший rank - более релевантная картина"""
+    if dialect == "postgresql":
+        return _postgresql_matches(query)
+    return _sqlite_matches(query)
+
+def _postgresql_matches(query: str):
+    # Совпадения по словоформам (russian), по словам как есть (simple)
+    # и по похожести триграмм, которая прощает опечатки
+    document = models.Painting.search_document
+    vector = literal_column("paintings.search_vector")
+    tsquery = func.websearch_to_tsquery(literal_column("'russian'::regconfig"), query).op("||")(
+        func.websearch_to_tsquery(literal_column("'simple'::regconfig"), query)
+    )
+    rank = func.ts_rank_cd(vector, tsquery, type_=Float) + func.word_similarity(query, document, type_=Float)
+    return (
+        select(models.Painting.id.label("id"), rank.label("rank"))
+        .where(or_(vector.op("@@")(tsquery), literal(query, String).op("<%")(document)))
+        .subquery("matches")
+    )
+
+def _sqlite_matches(query: str):
+    # Каждое слово запроса - префикс в кавычках: спецсинтаксис FTS5 из запроса
+    # не интерпретируется. bm25 меньше у более релевантных строк
+    fts_query = " ".join(f'"{term}"*' for term in search_terms(query))
+    return (
+        select(
+            PAINTINGS_FTS.c.rowid.label("id"),
+            (-func.bm25(literal_column("paintings_fts"), type_=Float)).label("rank"),
+        )
+        .where(PAINTINGS_FTS.c.paintings_fts.match(fts_query))
+        .subquery("matches")
+    )
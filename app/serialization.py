@@ -0,0 +1,119 @@
+"""Сериализация картин в JSON без pydantic.
+
+Ответы собираются прямо из ORM-объектов в порядке полей схем ответа и
+кодируются orjson. Повторная валидация PaintingResponse и вложенных
+ArtistResponse/MuseumResponse на каждую строку не выполняется, а результат
+побайтно совпадает с тем, что FastAPI отдает по response_model через
+JSONResponse (orjson.OPT_UTC_Z пишет UTC как "Z", как pydantic).
+"""
+import hashlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import orjson
+from fastapi import Response
+
+from app import schemas
+
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+ARTIST_FIELDS = tuple(schemas.ArtistResponse.model_fields)
+ARTIST_STATS_FIELDS = tuple(
+    name for name in schemas.ArtistWithStatsResponse.model_fields if name not in ARTIST_FIELDS
+)
+MUSEUM_FIELDS = tuple(schemas.MuseumResponse.model_fields)
+MUSEUM_SUMMARY_DEFAULTS = {
+    name: field.default
+    for name, field in schemas.MuseumWithSummaryResponse.model_fields.items()
+    if name not in MUSEUM_FIELDS
+}
+PAINTING_FIELDS = tuple(schemas.PaintingResponse.model_fields)
+PAINTING_RELATIONS = ("artist", "museum")
+PAGE_DEFAULTS = {
+    name: field.default
+    for name, field in schemas.PaginatedResponse[schemas.PaintingResponse].model_fields.items()
+}
+
+def dump_json(content: Any) -> bytes:
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+def content_hash(content: Any) -> str:
+    """sha256 канонического JSON (ключи отсортированы): одинаковые данные - одинаковый хэш"""
+    return hashlib.sha256(orjson.dumps(content, option=JSON_OPTIONS | orjson.OPT_SORT_KEYS)).hexdigest()
+
+class ORJSONResponse(Response):
+    """JSON-ответ, кодируемый orjson с теми же правилами, что dump_json"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+def _object_to_dict(obj, fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+    if obj is None:
+        return None
+    # Загруженные колонки лежат в __dict__ экземпляра: чтение оттуда минует
+    # дескрипторы ORM; незагруженные атрибуты читаются обычным getattr
+    loaded = obj.__dict__
+    return {name: loaded[name] if name in loaded else getattr(obj, name) for name in fields}
+
+def painting_to_dict(
+    painting,
+    related: Optional[Dict[int, Any]] = None,
+    fields: Tuple[str, ...] = PAINTING_FIELDS,
+) -> Dict[str, Any]:
+    """Картина с художником и музеем в форме PaintingResponse.
+
+    Связи artist и museum должны быть загружены заранее (_painting_load_options).
+    related - общий для страницы кэш словарей художников и музеев: один и тот же
+    объект на странице сериализуется один раз.
+    fields - выводимые поля в порядке PaintingResponse (для fields=/include=).
+    """
+    if related is None:
+        related = {}
+    data = _object_to_dict(painting, fields)
+    for name, relation_fields in (("artist", ARTIST_FIELDS), ("museum", MUSEUM_FIELDS)):
+        obj = data.get(name)
+        if obj is not None:
+            key = id(obj)
+            if key not in related:
+                related[key] = _object_to_dict(obj, relation_fields)
+            data[name] = related[key]
+    return data
+
+def paintings_page_to_dict(content: Dict[str, Any], fields: Tuple[str, ...] = PAINTING_FIELDS) -> Dict[str, Any]:
+    """Страница картин в форме PaginatedResponse[PaintingResponse]"""
+    page = {name: content.get(name, default) for name, default in PAGE_DEFAULTS.items()}
+    related = {}
+    page["data"] = [painting_to_dict(painting, related, fields) for painting in content["data"]]
+    return page
+
+def artist_to_dict(artist, stats: Tuple[int, Optional[int], Optional[int]]) -> Dict[str, Any]:
+    """Художник в форме ArtistWithStatsResponse; stats - (painting_count, first_year, last_year)"""
+    data = _object_to_dict(artist, ARTIST_FIELDS)
+    data.update(zip(ARTIST_STATS_FIELDS, stats))
+    return data
+
+def artists_page_to_dict(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Страница художников в форме PaginatedResponse[ArtistWithStatsResponse].
+
+    content["data"] - строки (Artist, painting_count, first_year, last_year).
+    """
+    page = {name: content.get(name, default) for name, default in PAGE_DEFAULTS.items()}
+    page["data"] = [artist_to_dict(artist, stats) for artist, *stats in content["data"]]
+    return page
+
+def museum_to_dict(museum, summary=None) -> Dict[str, Any]:
+    """Музей в форме MuseumWithSummaryResponse; без сводки - коллекция пуста"""
+    data = _object_to_dict(museum, MUSEUM_FIELDS)
+    for name, default in MUSEUM_SUMMARY_DEFAULTS.items():
+        data[name] = getattr(summary, name) if summary is not None else default
+    return data
+
+def museums_page_to_dict(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Страница музеев в форме PaginatedResponse[MuseumWithSummaryResponse].
+
+    content["data"] - строки (Museum, MuseumCollectionSummary или None).
+    """
+    page = {name: content.get(name, default) for name, default in PAGE_DEFAULTS.items()}
+    page["data"] = [museum_to_dict(museum, summary) for museum, summary in content["data"]]
+    return page
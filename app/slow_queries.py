@@ -0,0 +1,93 @@
+"""Журнал медленных SQL-запросов.
+
+Запросы дольше SLOW_QUERY_THRESHOLD_MS пишутся в логгер app.sql.slow
+(отдельный файл logs/slow_queries.log) с параметрами и маршрутом из
+log_execution. С SLOW_QUERY_EXPLAIN=true для PostgreSQL дополнительно
+снимается план EXPLAIN (ANALYZE, BUFFERS): отдельным asyncio-заданием на
+другом соединении пула, не задерживая ответ на исходный запрос.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+
+from sqlalchemy import event
+
+from app.timing import current_timings
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").strip().lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_PARAMS_LIMIT = 1000
+
+logger = logging.getLogger("app.sql.slow")
+
+# EXPLAIN ANALYZE выполняет запрос, поэтому план снимается только для чтения
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+_explaining = set()
+_explain_tasks = set()
+
+def instrument_slow_queries(async_engine) -> None:
+    """Подключает журнал медленных запросов к асинхронному движку"""
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.slow_query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context.slow_query_started) * 1000
+        if elapsed_ms < SLOW_QUERY_THRESHOLD_MS or context.execution_options.get("skip_slow_query_log"):
+            return
+
+        timings = current_timings()
+        route = timings.route if timings is not None else None
+        logger.warning(
+            f"🐢 Медленный запрос {elapsed_ms:.1f} мс (маршрут: {route or '-'}): {statement} "
+            f"| параметры: {_format_parameters(parameters)}",
+            extra={"route": route, "duration_ms": round(elapsed_ms, 3), "statement": statement},
+        )
+        if SLOW_QUERY_EXPLAIN and sync_engine.dialect.name == "postgresql" and _explainable(statement):
+            _schedule_explain(async_engine, statement, parameters, route)
+
+def _explainable(statement: str) -> bool:
+    return bool(_READ_ONLY.match(statement)) and not _WRITES.search(statement)
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    if len(text) > SLOW_QUERY_PARAMS_LIMIT:
+        return text[:SLOW_QUERY_PARAMS_LIMIT] + "..."
+    return text
+
+def _schedule_explain(async_engine, statement: str, parameters, route) -> None:
+    # Один и тот же запрос, медленный у многих клиентов сразу, объясняется один раз
+    if statement in _explaining:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    _explaining.add(statement)
+    task = loop.create_task(_explain(async_engine, statement, parameters, route))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+async def _explain(async_engine, statement: str, parameters, route) -> None:
+    try:
+        async with async_engine.connect() as connection:
+            connection = await connection.execution_options(skip_slow_query_log=True)
+            result = await connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in result)
+            await connection.rollback()
+        logger.warning(
+            f"📋 План медленного запроса (маршрут: {route or '-'}): {statement}\n{plan}",
+            extra={"route": route, "statement": statement, "plan": plan},
+        )
+    except Exception as e:
+        logger.error(f"❌ Не удалось получить план медленного запроса: {str(e)}")
+    finally:
+        _explaining.discard(statement)
@@ -0,0 +1,48 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, case, exists, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+
+def json_array_contains(column, values: Sequence, dialect: str):
+    """Условие "JSON-массив column содержит все values".
+
+    В PostgreSQL - column @> '[...]'::jsonb (использует GIN-индекс по jsonb),
+    в SQLite - EXISTS по json_each для каждого значения.
+    """
+    if dialect == "postgresql":
+        return column.op("@>")(literal(list(values), JSONB))
+
+    conditions = []
+    for value in values:
+        elements = func.json_each(column).table_valued("value")
+        conditions.append(exists(select(1).select_from(elements).where(elements.c.value == value)))
+    return and_(*conditions)
+
+def json_array_elements(column, dialect: str):
+    """Табличная функция "элементы JSON-массива" с колонкой value.
+
+    В PostgreSQL - jsonb_array_elements_text; не-массивы (jsonb null) дают
+    пустой набор вместо ошибки. В SQLite - json_each.
+    """
+    if dialect == "postgresql":
+        array = case((func.jsonb_typeof(column) == "array", column))
+        return func.jsonb_array_elements_text(array).table_valued("value")
+    return func.json_each(column).table_valued("value")
+
+def dialect_insert(model, dialect: str):
+    """INSERT с поддержкой on_conflict_do_update для PostgreSQL и SQLite"""
+    return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(model)
+
+def upsert(model, rows: Sequence[dict], key: str, dialect: str, changed: Optional[str] = None, extra_set: Optional[dict] = None):
+    """INSERT ... ON CONFLICT (key) DO UPDATE для PostgreSQL и SQLite.
+
+    Конфликтующая строка получает все колонки rows, кроме key, и extra_set.
+    Если задано changed, строка обновляется только при отличающемся значении
+    этой колонки, иначе запись пропускается и RETURNING ее не возвращает.
+    """
+    statement = dialect_insert(model, dialect).values(list(rows))
+    values = {column: statement.excluded[column] for column in rows[0] if column != key}
+    values.update(extra_set or {})
+    where = getattr(model, changed).is_distinct_from(statement.excluded[changed]) if changed else None
+    return statement.on_conflict_do_update(index_elements=[key], set_=values, where=where)
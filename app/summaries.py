@@ -0,0 +1,270 @@
+"""Сводки коллекций музеев.
+
+Справочник музеев не агрегирует таблицу картин при чтении: число картин,
+годы первой и последней картины и самые частые жанры хранятся в
+museum_collection_summaries, число картин каждого жанра - в museum_genre_counts.
+
+Запись одной картины применяет к сводке приращения (apply_museum_summary_changes):
+painting_count +- 1, границы лет по добавленным годам и счетчики жанров.
+Коллекция музея целиком перечитывается, только если удаленная картина
+держала first_year или last_year. Массовые операции пересчитывают сводки
+затронутых музеев полностью (refresh_museum_summaries), полный пересчет всех
+музеев - rebuild_museum_summaries.
+
+Обе записи в одну сводку начинаются с upsert ее строки, поэтому строка
+сводки блокируется раньше остальных изменений, и приращения не теряются
+при параллельном полном пересчете.
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.sql import dialect_insert
+
+TOP_GENRES = 3
+
+# (museum_id, year, genre) картины - все, от чего зависит сводка
+SummaryFacts = Tuple[Optional[int], Optional[int], Optional[str]]
+
+def summary_facts(painting) -> SummaryFacts:
+    """Значения картины (объекта или словаря колонок), от которых зависит сводка музея"""
+    if isinstance(painting, dict):
+        return painting.get("museum_id"), painting.get("year"), painting.get("genre")
+    return painting.museum_id, painting.year, painting.genre
+
+async def apply_museum_summary_changes(
+    db: AsyncSession,
+    added: Iterable[SummaryFacts] = (),
+    removed: Iterable[SummaryFacts] = ()
+) -> None:
+    """Применяет к сводкам музеев добавление картин added и удаление картин removed.
+
+    Изменение картины - удаление старых значений и добавление новых.
+    Стоимость не зависит от размера коллекции, кроме случая, когда удаленный
+    год был first_year или last_year музея: тогда границы лет перечитываются.
+    """
+    deltas = _summary_deltas(added, removed)
+    if not deltas:
+        return
+
+    await db.flush()
+    dialect = db.get_bind().dialect.name
+    ids = sorted(deltas)
+    summary = models.MuseumCollectionSummary
+
+    statement = dialect_insert(summary, dialect).values([
+        {
+            "museum_id": museum_id,
+            "painting_count": deltas[museum_id]["count"],
+            "first_year": min(_added(deltas[museum_id]["years"]), default=None),
+            "last_year": max(_added(deltas[museum_id]["years"]), default=None),
+            "top_genres": [],
+        }
+        for museum_id in ids
+    ])
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[summary.museum_id],
+        set_={
+            "painting_count": summary.painting_count + excluded.painting_count,
+            "first_year": case((excluded.first_year < summary.first_year, excluded.first_year),
+                               else_=func.coalesce(summary.first_year, excluded.first_year)),
+            "last_year": case((excluded.last_year > summary.last_year, excluded.last_year),
+                              else_=func.coalesce(summary.last_year, excluded.last_year)),
+            "refreshed_at": func.now(),
+        }
+    ).returning(summary.museum_id, summary.first_year, summary.last_year)
+    bounds = {row.museum_id: row for row in (await db.execute(statement)).all()}
+
+    # Удаленный год мог быть границей: после слияния с добавленными годами граница
+    # не меньше (не больше) удаленного года только в этом случае
+    stale = []
+    for museum_id in ids:
+        removed_years = _removed(deltas[museum_id]["years"])
+        row = bounds[museum_id]
+        if removed_years and (row.first_year is None or min(removed_years) <= row.first_year
+                              or max(removed_years) >= row.last_year):
+            stale.append(museum_id)
+    if stale:
+        years = {museum_id: (first, last) for museum_id, _, first, last in (await db.execute(_stats_query(stale))).all()}
+        await db.execute(update(summary), [
+            {"museum_id": museum_id, "first_year": years.get(museum_id, (None, None))[0],
+             "last_year": years.get(museum_id, (None, None))[1]}
+            for museum_id in stale
+        ])
+
+    genre_rows = [
+        {"museum_id": museum_id, "genre": genre, "painting_count": count}
+        for museum_id in ids
+        for genre, count in sorted(deltas[museum_id]["genres"].items())
+        if count
+    ]
+    if genre_rows:
+        await _apply_genre_deltas(db, dialect, genre_rows)
+
+async def refresh_museum_summaries(db: AsyncSession, museum_ids: Iterable[int]) -> None:
+    """Полностью пересчитывает сводки музеев museum_ids в текущей транзакции.
+
+    Для массовых операций, где приращения по строкам дороже пересчета.
+    Изменения сессии сначала сбрасываются в базу, затем строки сводок
+    блокируются upsert'ом в порядке id: параллельные приращения к тем же
+    музеям ждут конца транзакции или уже видны агрегатам.
+    """
+    ids = sorted({museum_id for museum_id in museum_ids if museum_id is not None})
+    if not ids:
+        return
+
+    await db.flush()
+    summary = models.MuseumCollectionSummary
+    statement = dialect_insert(summary, db.get_bind().dialect.name).values([
+        {"museum_id": museum_id, "painting_count": 0, "top_genres": []} for museum_id in ids
+    ])
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[summary.museum_id],
+        set_={"painting_count": summary.painting_count}
+    ))
+
+    stats = (await db.execute(_stats_query(ids))).all()
+    genres = (await db.execute(_genres_query(ids))).all()
+
+    genre_counts = models.MuseumGenreCount
+    await db.execute(delete(genre_counts).filter(genre_counts.museum_id.in_(ids)))
+    if genres:
+        await db.execute(insert(genre_counts), _genre_count_rows(genres))
+
+    refreshed_at = datetime.now(timezone.utc)
+    await db.execute(update(summary), [
+        {**row, "refreshed_at": refreshed_at} for row in _summary_rows(stats, genres, ids)
+    ])
+
+def rebuild_museum_summaries(connection) -> int:
+    """Пересчитывает сводки всех музеев на синхронном соединении, возвращает число сводок"""
+    stats = connection.execute(_stats_query()).all()
+    genres = connection.execute(_genres_query()).all()
+
+    connection.execute(delete(models.MuseumGenreCount))
+    if genres:
+        connection.execute(insert(models.MuseumGenreCount), _genre_count_rows(genres))
+
+    connection.execute(delete(models.MuseumCollectionSummary))
+    rows = _summary_rows(stats, genres)
+    if rows:
+        connection.execute(insert(models.MuseumCollectionSummary), rows)
+    return len(rows)
+
+def _summary_deltas(added: Iterable[SummaryFacts], removed: Iterable[SummaryFacts]) -> Dict[int, dict]:
+    """Приращения по музеям: count, years и genres (Counter значение -> +-число картин)"""
+    deltas: Dict[int, dict] = defaultdict(lambda: {"count": 0, "years": Counter(), "genres": Counter()})
+    for facts, sign in ((added, 1), (removed, -1)):
+        for museum_id, year, genre in facts:
+            if museum_id is None:
+                continue
+            delta = deltas[museum_id]
+            delta["count"] += sign
+            if year is not None:
+                delta["years"][year] += sign
+            if genre is not None:
+                delta["genres"][genre] += sign
+
+    # Изменение, не затронувшее музей, год и жанр, сокращается до нуля
+    return {
+        museum_id: delta
+        for museum_id, delta in deltas.items()
+        if delta["count"] or any(delta["years"].values()) or any(delta["genres"].values())
+    }
+
+def _added(years: Counter) -> List[int]:
+    return [year for year, count in years.items() if count > 0]
+
+def _removed(years: Counter) -> List[int]:
+    return [year for year, count in years.items() if count < 0]
+
+async def _apply_genre_deltas(db: AsyncSession, dialect: str, rows: List[dict]) -> None:
+    """Применяет приращения счетчиков жанров и пересчитывает top_genres их музеев"""
+    genre_counts = models.MuseumGenreCount
+    museum_ids = sorted({row["museum_id"] for row in rows})
+
+    statement = dialect_insert(genre_counts, dialect).values(rows)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[genre_counts.museum_id, genre_counts.genre],
+        set_={"painting_count": genre_counts.painting_count + statement.excluded.painting_count}
+    ))
+    await db.execute(
+        delete(genre_counts).filter(genre_counts.museum_id.in_(museum_ids), genre_counts.painting_count <= 0)
+    )
+
+    genres = (await db.execute(
+        select(genre_counts.museum_id, genre_counts.genre, genre_counts.painting_count)
+        .filter(genre_counts.museum_id.in_(museum_ids))
+    )).all()
+    top = _top_genres(genres)
+    await db.execute(update(models.MuseumCollectionSummary), [
+        {"museum_id": museum_id, "top_genres": top[museum_id]} for museum_id in museum_ids
+    ])
+
+def _stats_query(museum_ids: Optional[Iterable[int]] = None):
+    painting = models.Painting
+    query = (
+        select(painting.museum_id, func.count(), func.min(painting.year), func.max(painting.year))
+        .filter(painting.museum_id.isnot(None))
+        .group_by(painting.museum_id)
+    )
+    if museum_ids is not None:
+        query = query.filter(painting.museum_id.in_(museum_ids))
+    return query
+
+def _genres_query(museum_ids: Optional[Iterable[int]] = None):
+    painting = models.Painting
+    query = (
+        select(painting.museum_id, painting.genre, func.count())
+        .filter(painting.museum_id.isnot(None), painting.genre.isnot(None))
+        .group_by(painting.museum_id, painting.genre)
+    )
+    if museum_ids is not None:
+        query = query.filter(painting.museum_id.in_(museum_ids))
+    return query
+
+def _genre_count_rows(genres) -> List[Dict]:
+    return [
+        {"museum_id": museum_id, "genre": genre, "painting_count": count}
+        for museum_id, genre, count in genres
+    ]
+
+def _top_genres(genres) -> Dict[int, List[Dict]]:
+    """{museum_id: top_genres} по строкам (museum_id, genre, count)"""
+    by_museum: Dict[int, List[tuple]] = defaultdict(list)
+    for museum_id, genre, count in genres:
+        by_museum[museum_id].append((genre, count))
+
+    return defaultdict(list, {
+        museum_id: [
+            {"genre": genre, "count": count}
+            for genre, count in sorted(items, key=lambda item: (-item[1], item[0]))[:TOP_GENRES]
+        ]
+        for museum_id, items in by_museum.items()
+    })
+
+def _summary_rows(stats, genres, museum_ids: Iterable[int] = ()) -> List[Dict]:
+    """Строки сводок по агрегатам; museum_ids без картин получают пустую сводку"""
+    top = _top_genres(genres)
+    counted = set()
+    rows = []
+    for museum_id, painting_count, first_year, last_year in stats:
+        counted.add(museum_id)
+        rows.append({
+            "museum_id": museum_id,
+            "painting_count": painting_count,
+            "first_year": first_year,
+            "last_year": last_year,
+            "top_genres": top[museum_id],
+        })
+    rows.extend(
+        {"museum_id": museum_id, "painting_count": 0, "first_year": None, "last_year": None, "top_genres": []}
+        for museum_id in museum_ids
+        if museum_id not in counted
+    )
+    return rows
@@ -0,0 +1,108 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+class RequestTimings:
+    """Разбивка времени одного запроса: SQL, ожидание пула, сериализация"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.route: Optional[str] = None
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_fields(self) -> dict:
+        """Поля для structured-логов (extra записи)"""
+        return {
+            "route": self.route,
+            "duration_ms": round(self.elapsed() * 1000, 3),
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_seconds * 1000, 3),
+            "pool_wait_ms": round(self.pool_wait_seconds * 1000, 3),
+            "serialize_ms": round(self.serialize_seconds * 1000, 3),
+        }
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing (длительности в миллисекундах)"""
+        return ", ".join((
+            f"app;dur={self.elapsed() * 1000:.3f}",
+            f'db;dur={self.db_seconds * 1000:.3f};desc="{self.db_queries} queries"',
+            f"pool;dur={self.pool_wait_seconds * 1000:.3f}",
+            f"serialize;dur={self.serialize_seconds * 1000:.3f}",
+        ))
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current_timings() -> Optional[RequestTimings]:
+    """Замеры текущего HTTP-запроса или None вне запроса (скрипты, тесты хелперов)"""
+    return _current_timings.get()
+
+@contextmanager
+def measure_serialization():
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.serialize_seconds += time.perf_counter() - started
+
+def record_pool_wait(seconds: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+def instrument_engine(sync_engine) -> None:
+    """Считает число и время SQL-запросов движка в замерах текущего запроса.
+
+    Для асинхронного движка передается async_engine.sync_engine: события
+    выполняются в greenlet того же asyncio-задания, контекст запроса виден.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.db_queries += 1
+            timings.db_seconds += time.perf_counter() - context.query_started
+
+class ServerTimingMiddleware:
+    """ASGI-middleware: заводит замеры на запрос и добавляет заголовок Server-Timing.
+
+    Заголовок формируется в момент отправки http.response.start, поэтому для
+    потоковых ответов (экспорт) время учитывается до начала передачи тела.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
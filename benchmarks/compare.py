@@ -0,0 +1,63 @@
+"""Сравнение двух результатов benchmarks.harness.
+
+Печатает по каждому сценарию p50/p99 и RPS базового и нового прогона с
+изменением в процентах. Код возврата 1, если p99 какого-либо сценария вырос
+или RPS упал больше, чем на --threshold процентов.
+
+    python -m benchmarks.compare benchmarks/results/<до>.json benchmarks/results/<после>.json
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+METRICS = (
+    # метрика, рост - это ухудшение
+    ("p50_ms", True),
+    ("p99_ms", True),
+    ("rps", False),
+)
+
+def _change(before: float, after: float) -> Optional[float]:
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """Строки отчета и список регрессий"""
+    lines, regressions = [], []
+    lines.append(f"{'сценарий':<8} {'метрика':<7} {baseline['commit']:>10} {candidate['commit']:>10} {'изм.':>8}")
+    for scenario, before in baseline["scenarios"].items():
+        after = candidate["scenarios"].get(scenario)
+        if after is None:
+            continue
+        for metric, higher_is_worse in METRICS:
+            change = _change(before[metric], after[metric])
+            shown = f"{change:+.1f}%" if change is not None else "-"
+            lines.append(f"{scenario:<8} {metric:<7} {before[metric]:>10} {after[metric]:>10} {shown:>8}")
+            if metric == "p50_ms" or change is None:
+                continue
+            worse = change if higher_is_worse else -change
+            if worse > threshold:
+                regressions.append(f"{scenario}.{metric}: {shown}")
+    return lines, regressions
+
+def main(args) -> int:
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    if baseline["params"] != candidate["params"] or baseline["dialect"] != candidate["dialect"]:
+        print("⚠️ Прогоны выполнены с разными параметрами или на разных базах")
+
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n❌ Регрессии больше {args.threshold}%: " + ", ".join(regressions))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="допустимое ухудшение, %%")
+    raise SystemExit(main(parser.parse_args()))
@@ -0,0 +1,102 @@
+"""Сравнение пропускной способности синхронной и асинхронной сессии.
+
+Запускает N конкурентных корутин в одном event loop (как один воркер uvicorn),
+каждая выполняет запрос страницы картин с художниками и музеями:
+
+- sync  - через SessionLocal, как раньше делали обработчики: запрос блокирует loop,
+          поэтому корутины выполняются строго по очереди;
+- async - через AsyncSessionLocal: пока один запрос ждет базу, loop обслуживает остальные.
+
+Запуск (нужен PostgreSQL из docker-compose и DATABASE_URL в .env):
+
+    python -m benchmarks.concurrency --concurrency 50 --requests 1000 --sleep-ms 5
+
+--sleep-ms добавляет к каждому запросу pg_sleep, имитируя задержку сети/диска.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import joinedload
+
+from app import models
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+
+def _page_query():
+    return (
+        select(models.Painting)
+        .options(joinedload(models.Painting.artist), joinedload(models.Painting.museum))
+        .order_by(models.Painting.year)
+        .limit(20)
+    )
+
+def _sleep_statement(sleep_ms: float):
+    if sleep_ms and engine.dialect.name == "postgresql":
+        return select(func.pg_sleep(sleep_ms / 1000))
+    return None
+
+async def _run_sync(total: int, concurrency: int, sleep_ms: float) -> None:
+    sleep = _sleep_statement(sleep_ms)
+    queue = iter(range(total))
+
+    async def worker():
+        for _ in queue:
+            with SessionLocal() as db:
+                if sleep is not None:
+                    db.execute(sleep)
+                db.execute(_page_query()).scalars().all()
+            # Отдаем управление loop'у, как это происходит между запросами в uvicorn
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def _run_async(total: int, concurrency: int, sleep_ms: float) -> None:
+    sleep = _sleep_statement(sleep_ms)
+    queue = iter(range(total))
+
+    async def worker():
+        for _ in queue:
+            async with AsyncSessionLocal() as db:
+                if sleep is not None:
+                    await db.execute(sleep)
+                (await db.execute(_page_query())).scalars().all()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def _measure(runner, total: int, concurrency: int, sleep_ms: float) -> dict:
+    started = time.perf_counter()
+    await runner(total, concurrency, sleep_ms)
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1),
+    }
+
+async def main(args) -> dict:
+    # Прогрев пулов соединений
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+    results = {
+        "concurrency": args.concurrency,
+        "sleep_ms": args.sleep_ms,
+        "sync": await _measure(_run_sync, args.requests, args.concurrency, args.sleep_ms),
+        "async": await _measure(_run_async, args.requests, args.concurrency, args.sleep_ms),
+    }
+    results["speedup"] = round(
+        results["async"]["requests_per_second"] / results["sync"]["requests_per_second"], 2
+    )
+    await async_engine.dispose()
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--sleep-ms", type=float, default=5.0)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
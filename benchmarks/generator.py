@@ -0,0 +1,195 @@
+"""Генератор синтетического каталога для бенчмарков.
+
+Досоздает художников, музеи и картины до заданного числа пакетными INSERT
+(executemany по --chunk-size строк). Названия, имена и города - на русском,
+годы, жанры, стили и материалы распределены как в реальном каталоге.
+Поисковые документы новых картин заполняются одним UPDATE после вставки,
+сводки коллекций музеев пересчитываются целиком.
+Генерация детерминирована по --seed, работает с PostgreSQL и SQLite.
+
+    python -m benchmarks.generator --artists 10000 --museums 2000 --paintings 1000000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import func, insert, select, update
+
+from app import models
+from app.database import Base, engine
+from app.search import search_document_expression
+from app.summaries import rebuild_museum_summaries
+
+SURNAMES = [
+    "Гончарова", "Родченко", "Удальцова", "Малевич", "Кандинский", "Шагал", "Попова",
+    "Розанова", "Экстер", "Татлин", "Ларионов", "Филонов", "Лентулов", "Машков",
+    "Кончаловский", "Фальк", "Куприн", "Петров-Водкин", "Серебрякова", "Кустодиев",
+    "Билибин", "Рерих", "Васнецов", "Левитан", "Шишкин", "Куинджи", "Саврасов", "Репин",
+]
+FIRST_NAMES = [
+    "Наталья", "Александр", "Надежда", "Казимир", "Василий", "Марк", "Любовь", "Ольга",
+    "Александра", "Владимир", "Михаил", "Павел", "Аристарх", "Илья", "Роберт", "Кузьма",
+    "Зинаида", "Борис", "Иван", "Николай", "Виктор", "Архип", "Алексей", "Исаак",
+]
+PATRONYMICS = [
+    "Сергеевна", "Михайлович", "Андреевна", "Северинович", "Васильевич", "Захарович",
+    "Сергеевич", "Владимировна", "Петрович", "Евграфович", "Николаевич", "Ивановна",
+]
+CITIES = [
+    "Москва", "Санкт-Петербург", "Казань", "Нижний Новгород", "Самара", "Екатеринбург",
+    "Новосибирск", "Ярославль", "Тверь", "Пермь", "Саратов", "Томск", "Омск", "Владимир",
+]
+MUSEUM_KINDS = [
+    "Государственный музей", "Художественный музей", "Картинная галерея",
+    "Музей изобразительных искусств", "Музей современного искусства",
+]
+ADJECTIVES = [
+    "Вечерний", "Зимний", "Осенний", "Красный", "Черный", "Белый", "Старый", "Тихий",
+    "Северный", "Золотой", "Синий", "Лунный", "Утренний", "Весенний", "Городской",
+]
+NOUNS = [
+    "пейзаж", "портрет", "натюрморт", "сад", "берег", "лес", "город", "собор", "мост",
+    "рынок", "вокзал", "двор", "этюд", "композиция", "квадрат",
+]
+SUBJECTS = [
+    "с яблоками", "у реки", "в саду", "на закате", "с фигурой", "в Париже", "в Москве",
+    "после дождя", "с букетом", "у окна", "в снегу", "на берегу моря",
+]
+GENRES = ["Бытовой", "Абстрактный", "Городской пейзаж", "Пейзаж", "Портрет", "Натюрморт", "Исторический"]
+TYPES = ["живопись", "графика", "акварель", "гравюра"]
+PERIODS = ["Конец XIX - начало XX века", "Русский авангард", "Советское искусство", "Серебряный век"]
+STYLES = ["кубофутуризм", "авангард", "супрематизм", "конструктивизм", "кубизм", "футуризм", "импрессионизм", "символизм"]
+MATERIALS = ["холст", "масло", "картон", "бумага", "темпера", "гуашь", "акварель", "уголь"]
+IMAGE_HOST = "https://art-api.srvdev.ru/storage/app"
+
+def _artist_rows(rng: random.Random, count: int) -> Iterator[Dict]:
+    for _ in range(count):
+        surname, first, patronymic = rng.choice(SURNAMES), rng.choice(FIRST_NAMES), rng.choice(PATRONYMICS)
+        born = rng.randint(1840, 1920)
+        yield {
+            "artist_short_name": f"{surname} {first[0]}.{patronymic[0]}.",
+            "artist_long_name": f"{surname} {first} {patronymic}",
+            "dob": f"{born}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "dob_place": rng.choice(CITIES),
+            "dod": f"{born + rng.randint(30, 90)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "dod_place": rng.choice(CITIES),
+        }
+
+def _museum_rows(rng: random.Random, start: int, count: int) -> Iterator[Dict]:
+    for i in range(start, start + count):
+        city = rng.choice(CITIES)
+        slug = f"bench_museum_{i}"
+        yield {
+            "name": f"{rng.choice(MUSEUM_KINDS)} г. {city} №{i}",
+            "name_unique": slug,
+            "contact": f"+7-{rng.randint(300, 999)}-{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(10, 99)}",
+            "profile": f"{slug}.webp",
+            "profile_path": f"{IMAGE_HOST}/museum-images/{slug}.webp",
+            "city": city,
+            "state": city,
+            "country": "Россия",
+            "country_code": 7,
+            "zipcode": rng.randint(100000, 199999),
+            "website": f"https://{slug}.example.ru",
+        }
+
+def _painting_rows(rng: random.Random, start: int, count: int, artist_ids: List[int], museum_ids: List[int]) -> Iterator[Dict]:
+    for i in range(start, start + count):
+        year = rng.randint(1850, 1990) if rng.random() > 0.03 else None
+        slug = f"bench_{i}_{year or 'na'}"
+        yield {
+            "title": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(SUBJECTS)}",
+            "unique_title": slug,
+            "type": rng.choice(TYPES),
+            "genre": rng.choice(GENRES),
+            "materials": rng.sample(MATERIALS, rng.randint(1, 3)),
+            "size": f"{rng.randint(20, 200)} на {rng.randint(20, 200)}",
+            "profile": f"{slug}.webp",
+            "profile_path": f"{IMAGE_HOST}/painting-images/{slug}.webp",
+            "year": year,
+            "period": rng.choice(PERIODS),
+            "style": rng.sample(STYLES, rng.randint(1, 2)),
+            "artist_id": rng.choice(artist_ids),
+            "museum_id": rng.choice(museum_ids),
+        }
+
+def _chunks(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _plan(connection, model, target: int) -> Tuple[int, int]:
+    """(первый номер, сколько строк добавить), чтобы в таблице стало target строк.
+
+    Номер продолжает максимальный id, поэтому уникальные поля не пересекаются
+    со строками прошлых запусков.
+    """
+    have = connection.execute(select(func.count()).select_from(model)).scalar()
+    start = (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+    return start, max(target - have, 0)
+
+def _insert(model, rows: Iterator[Dict], chunk_size: int) -> int:
+    # Каждый пакет - отдельная транзакция: миллион строк не держит одну транзакцию
+    inserted = 0
+    for chunk in _chunks(rows, chunk_size):
+        with engine.begin() as connection:
+            connection.execute(insert(model), chunk)
+        inserted += len(chunk)
+    return inserted
+
+def _ids(connection, model) -> List[int]:
+    ids = list(connection.execute(select(model.id)).scalars())
+    if not ids:
+        raise SystemExit(f"Таблица {model.__tablename__} пуста")
+    return ids
+
+def populate(artists: int, museums: int, paintings: int, seed: int = 42, chunk_size: int = 5000) -> Dict[str, int]:
+    """Досоздает строки до заданного числа и возвращает число вставленных по таблицам"""
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    inserted = {}
+
+    with engine.connect() as connection:
+        _, count = _plan(connection, models.Artist, artists)
+    inserted["artists"] = _insert(models.Artist, _artist_rows(rng, count), chunk_size)
+
+    with engine.connect() as connection:
+        start, count = _plan(connection, models.Museum, museums)
+    inserted["museums"] = _insert(models.Museum, _museum_rows(rng, start, count), chunk_size)
+
+    with engine.connect() as connection:
+        artist_ids = _ids(connection, models.Artist)
+        museum_ids = _ids(connection, models.Museum)
+        start, count = _plan(connection, models.Painting, paintings)
+    rows = _painting_rows(rng, start, count, artist_ids, museum_ids)
+    inserted["paintings"] = _insert(models.Painting, rows, chunk_size)
+
+    with engine.begin() as connection:
+        connection.execute(
+            update(models.Painting)
+            .where(models.Painting.search_document.is_(None))
+            .values(search_document=search_document_expression())
+        )
+        rebuild_museum_summaries(connection)
+    return inserted
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artists", type=int, default=10_000)
+    parser.add_argument("--museums", type=int, default=2_000)
+    parser.add_argument("--paintings", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = populate(args.artists, args.museums, args.paintings, args.seed, args.chunk_size)
+    report["seconds"] = round(time.perf_counter() - started, 1)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,198 @@
+"""Нагрузочный прогон API через ASGI-приложение.
+
+Сценарии (каждый - --requests запросов в --concurrency конкурентных корутинах):
+
+- list   - GET /paintings, случайная страница;
+- filter - GET /paintings?artist_name=..., фамилия из генератора;
+- search - GET /paintings/search?q=..., слово названия из генератора;
+- detail - GET /paintings/{id}, случайная картина;
+- create - POST /paintings;
+- update - PUT /paintings/{id} для созданных картин;
+- delete - DELETE /paintings/{id} для созданных картин.
+
+Для каждого сценария считаются p50/p95/p99 задержки и пропускная способность.
+Результат сохраняется в benchmarks/results/<время>_<коммит>.json; два файла
+сравниваются benchmarks.compare. Данные заранее создает benchmarks.generator:
+
+    python -m benchmarks.generator --artists 10000 --museums 2000 --paintings 1000000
+    python -m benchmarks.harness --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy import func, select
+
+from app import models
+from app.cache import TTLCache, count_cache, response_cache
+from app.database import async_engine, engine
+from app.main import app
+from benchmarks.generator import NOUNS, SURNAMES
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SCENARIOS = ("list", "filter", "search", "detail", "create", "update", "delete")
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+class Catalog:
+    """Идентификаторы существующих строк и картин, созданных прогоном"""
+
+    def __init__(self):
+        with engine.connect() as connection:
+            self.painting_count = connection.execute(select(func.count()).select_from(models.Painting)).scalar()
+            self.painting_ids = list(connection.execute(
+                select(models.Painting.id).order_by(func.random()).limit(10_000)
+            ).scalars())
+            self.artist_ids = list(connection.execute(select(models.Artist.id).limit(1000)).scalars())
+            self.museum_ids = list(connection.execute(select(models.Museum.id).limit(1000)).scalars())
+        if not (self.painting_ids and self.artist_ids and self.museum_ids):
+            raise SystemExit("База пуста: сначала запустите python -m benchmarks.generator")
+        self.created: List[int] = []
+
+def _requests(catalog: Catalog, page_size: int, rng: random.Random) -> Dict[str, Request]:
+    pages = max(catalog.painting_count // page_size, 1)
+
+    async def list_page(client, i):
+        # count=none: total считается отдельно и кэшируется, сравнивается выборка страницы
+        return await client.get("/paintings", params={"page": rng.randint(1, min(pages, 500)), "page_size": page_size, "count": "none"})
+
+    async def filter_page(client, i):
+        return await client.get("/paintings", params={"artist_name": rng.choice(SURNAMES), "page_size": page_size})
+
+    async def search(client, i):
+        return await client.get("/paintings/search", params={"q": rng.choice(NOUNS), "page_size": page_size})
+
+    async def detail(client, i):
+        return await client.get(f"/paintings/{rng.choice(catalog.painting_ids)}")
+
+    async def create(client, i):
+        response = await client.post("/paintings", json={
+            "title": f"Бенчмарк {i}",
+            "year": rng.randint(1850, 1990),
+            "genre": "Пейзаж",
+            "materials": ["холст", "масло"],
+            "style": ["авангард"],
+            "artist_id": rng.choice(catalog.artist_ids),
+            "museum_id": rng.choice(catalog.museum_ids),
+        })
+        if response.status_code == 201:
+            catalog.created.append(response.json()["id"])
+        return response
+
+    async def update(client, i):
+        painting_id = catalog.created[i % len(catalog.created)]
+        return await client.put(f"/paintings/{painting_id}", json={"title": f"Бенчмарк {i} (изм.)", "genre": "Портрет"})
+
+    async def delete(client, i):
+        return await client.delete(f"/paintings/{catalog.created[i]}")
+
+    return {
+        "list": list_page,
+        "filter": filter_page,
+        "search": search,
+        "detail": detail,
+        "create": create,
+        "update": update,
+        "delete": delete,
+    }
+
+async def _run(client: httpx.AsyncClient, request: Request, total: int, concurrency: int) -> dict:
+    timings, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await request(client, i)
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 2),
+        "p99_ms": round(timings[max(int(len(timings) * 0.99) - 1, 0)], 2),
+    }
+
+async def run_scenarios(args) -> dict:
+    catalog = Catalog()
+    requests = _requests(catalog, args.page_size, random.Random(args.seed))
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for name in args.scenarios:
+            total = args.requests
+            if name in ("update", "delete"):
+                # Изменяются и удаляются только картины, созданные сценарием create
+                total = min(total, len(catalog.created))
+                if total == 0:
+                    continue
+            results[name] = await _run(client, requests[name], total, args.concurrency)
+    await async_engine.dispose()
+    return {"painting_count": catalog.painting_count, "scenarios": results}
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main(args) -> Path:
+    if args.no_cache:
+        response_cache.configure(TTLCache(maxsize=0))
+        count_cache.maxsize = 0
+    # Логи запросов не должны входить в измерение
+    logging.disable(logging.INFO)
+
+    started_at = datetime.now(timezone.utc)
+    report = {
+        "commit": _git_commit(),
+        "started_at": started_at.isoformat(),
+        "dialect": engine.dialect.name,
+        "python": platform.python_version(),
+        "params": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "page_size": args.page_size,
+            "no_cache": args.no_cache,
+        },
+        **asyncio.run(run_scenarios(args)),
+    }
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = args.output or RESULTS_DIR / f"{started_at:%Y%m%dT%H%M%S}_{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-cache", action="store_true", help="отключить кэш ответов и total")
+    parser.add_argument("--output", type=Path, help="файл результата вместо benchmarks/results/")
+    result = main(parser.parse_args())
+    print(result.read_text(encoding="utf-8"))
@@ -0,0 +1,79 @@
+"""Накладные расходы логирования log_execution на запрос.
+
+Через ASGI-приложение (без сети и базы) измеряет задержку GET / в трех режимах:
+
+- sync    - обработчики файлов и консоли вызываются прямо в event loop;
+- queue   - запись кладется в очередь, файлы пишет поток QueueListener;
+- sampled - очередь и LOG_SUCCESS_SAMPLE_RATE из --sample-rate.
+
+Логи пишутся во временный каталог, консольный вывод уходит в /dev/null.
+Небольшой --max-bytes учащает ротацию файлов, на которой синхронный режим
+дает выбросы p99.
+
+    python -m benchmarks.logging_overhead --requests 20000 --max-bytes 1048576
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from app import logger as app_logger
+from app.logging_config import LOGGING_CONFIG, setup_logging, stop_logging
+from app.main import app
+
+WARMUP_REQUESTS = 200
+
+def _config(log_dir: str, max_bytes: int, console) -> dict:
+    config = copy.deepcopy(LOGGING_CONFIG)
+    for handler in config["handlers"].values():
+        if "filename" not in handler:
+            continue
+        handler["filename"] = os.path.join(log_dir, os.path.basename(handler["filename"]))
+        handler["maxBytes"] = max_bytes
+    config["handlers"]["console"]["stream"] = console
+    return config
+
+async def _measure(requests: int) -> dict:
+    timings = []
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for _ in range(WARMUP_REQUESTS):
+            await client.get("/")
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/")
+            timings.append((time.perf_counter() - started) * 1_000_000)
+            response.raise_for_status()
+    timings.sort()
+    return {
+        "p50_us": round(statistics.median(timings), 1),
+        "p99_us": round(timings[int(len(timings) * 0.99) - 1], 1),
+        "max_us": round(timings[-1], 1),
+    }
+
+def main(args) -> dict:
+    report = {"requests": args.requests, "max_bytes": args.max_bytes}
+    modes = (
+        ("sync", False, 1.0),
+        ("queue", True, 1.0),
+        ("sampled", True, args.sample_rate),
+    )
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as console:
+        for label, use_queue, sample_rate in modes:
+            setup_logging(use_queue=use_queue, config=_config(log_dir, args.max_bytes, console))
+            app_logger.LOG_SUCCESS_SAMPLE_RATE = sample_rate
+            report[label] = asyncio.run(_measure(args.requests))
+        stop_logging()
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--max-bytes", type=int, default=1_048_576)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    print(json.dumps(main(parser.parse_args()), indent=2, ensure_ascii=False))
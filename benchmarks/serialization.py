@@ -0,0 +1,77 @@
+"""CPU-стоимость сериализации страницы картин.
+
+Сравнивает на одинаковых ORM-объектах (без базы):
+
+- pydantic - как FastAPI по response_model: валидация PaginatedResponse[PaintingResponse]
+             с вложенными художником и музеем, model_dump и json.dumps;
+- orjson   - app.serialization: словари прямо из ORM-объектов и orjson.
+
+Перед замером проверяется, что оба способа дают одинаковые байты.
+
+    python -m benchmarks.serialization --page-size 100 --repeat 2000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from app import models, schemas
+from app.serialization import dump_json, paintings_page_to_dict
+from benchmarks.generator import _museum_rows, _painting_rows
+
+def _page(page_size: int) -> dict:
+    # У каждой картины свой художник и музей - худший случай для сериализации связей
+    rng = random.Random(42)
+    created_at = datetime(2024, 11, 7, 11, 2, 55, 123456, tzinfo=timezone.utc)
+    museums = _museum_rows(rng, 1, page_size)
+    paintings = []
+    for i, row in enumerate(_painting_rows(rng, 1, page_size, [0], [0]), start=1):
+        painting = models.Painting(id=i, created_at=created_at, **row)
+        painting.artist = models.Artist(
+            id=i, artist_short_name="Гончарова Н.С.", artist_long_name="Гончарова Наталья Сергеевна",
+            dob="1881-07-03", dob_place="д.Нагаево Тульской губ", dod="1962-10-17", dod_place="Париж",
+            created_at=created_at,
+        )
+        painting.museum = models.Museum(id=i, created_at=created_at, **next(museums))
+        paintings.append(painting)
+    return {
+        "data": paintings,
+        "total": 1_000_000,
+        "count_type": "exact",
+        "page": 1,
+        "page_size": page_size,
+        "total_pages": 1_000_000 // page_size,
+        "has_next": True,
+        "has_prev": False,
+    }
+
+def _pydantic(content: dict) -> bytes:
+    data = schemas.PaginatedResponse[schemas.PaintingResponse].model_validate(content).model_dump(mode="json", by_alias=True)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def _orjson(content: dict) -> bytes:
+    return dump_json(paintings_page_to_dict(content))
+
+def _measure(serialize, content: dict, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serialize(content)
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+def main(args) -> dict:
+    content = _page(args.page_size)
+    if _pydantic(content) != _orjson(content):
+        raise SystemExit("Сериализации расходятся")
+
+    report = {"page_size": args.page_size, "bytes": len(_orjson(content))}
+    for label, serialize in (("pydantic", _pydantic), ("orjson", _orjson)):
+        report[f"{label}_us_per_page"] = round(_measure(serialize, content, args.repeat), 1)
+    report["speedup"] = round(report["pydantic_us_per_page"] / report["orjson_us_per_page"], 2)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    print(json.dumps(main(parser.parse_args()), indent=2, ensure_ascii=False))
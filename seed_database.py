@@ -6,6 +6,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app.database import SessionLocal, engine
 from app.models import Artist, Museum, Painting
 from app import models
+from app.search import search_document
+from app.summaries import rebuild_museum_summaries
 
 def seed_database():
     db = SessionLocal()
@@ -120,7 +122,17 @@ def seed_database():
             )
         ]
         
+            # Поисковый документ заполняется так же, как при записи через API
+            artist_names = {artist.id: artist.artist_long_name for artist in artists}
+            for painting in paintings:
+                painting.search_document = search_document(
+                    painting.title, painting.genre, painting.period, artist_names[painting.artist_id]
+                )
             db.add_all(paintings)
+            db.flush()
+
+            # Сводки коллекций музеев и счетчики жанров по добавленным картинам
+            rebuild_museum_summaries(db.connection())
         
         print("✅ База данных успешно заполнена!")
         print("🎨 Добавлено:")
@@ -1,13 +1,18 @@
+import logging
 import pytest
 import uuid
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.database import get_db
+from app.cache import invalidate_painting_caches
+from app.database import get_db, register_sqlite_functions, to_async_url
 from app.models import Base
+from app.slow_queries import instrument_slow_queries
+from app.timing import instrument_engine
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -18,6 +23,26 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Приложение работает с той же базой через асинхронный драйвер.
+# NullPool: соединения aiosqlite не переиспользуются между event loop'ами TestClient.
+async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+register_sqlite_functions(engine)
+register_sqlite_functions(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+instrument_slow_queries(async_engine)
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Кэши процесса не должны переживать пересоздание тестовой базы"""
+    invalidate_painting_caches()
+    yield
+
 @pytest.fixture(scope="function")
 def test_db():
     """Фикстура для тестовой базы данных"""
@@ -34,11 +59,9 @@ def test_db():
 @pytest.fixture(scope="function")
 def client(test_db):
     """Фикстура для тестового клиента FastAPI"""
-    def override_get_db():
-        try:
-            yield test_db
-        finally:
-            pass
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
     
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
@@ -114,4 +137,44 @@ def sample_data(sample_artist, sample_museum, sample_painting):
         "artist": sample_artist,
         "museum": sample_museum, 
         "painting": sample_painting
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture
+def sql_statements():
+    """Фикстура, собирающая SQL-запросы, выполненные приложением"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+@pytest.fixture
+def log_records():
+    """Фикстура, собирающая записи логгеров: log_records(name) возвращает список записей логгера name"""
+    attached = []
+
+    def capture(name: str) -> list:
+        handler = _ListHandler()
+        logger = logging.getLogger(name)
+        logger.addHandler(handler)
+        attached.append((logger, handler))
+        return handler.records
+
+    yield capture
+    for logger, handler in attached:
+        logger.removeHandler(handler)
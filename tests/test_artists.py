@@ -0,0 +1,89 @@
+import pytest
+from fastapi import status
+
+class TestArtistsEndpoints:
+    """Тесты API художников"""
+
+    @pytest.fixture
+    def artists(self, test_db, sample_artist, sample_painting):
+        """Второй художник с двумя картинами и третий - без картин"""
+        from app.models import Artist, Painting
+
+        prolific = Artist(artist_short_name="Малевич К.С.", artist_long_name="Малевич Казимир Северинович")
+        idle = Artist(artist_short_name="Без картин", artist_long_name="Художник Без Картин")
+        test_db.add_all([prolific, idle])
+        test_db.flush()
+        test_db.add_all([
+            Painting(title="Черный квадрат", unique_title="square_1915", year=1915, artist_id=prolific.id, museum_id=sample_painting.museum_id),
+            Painting(title="Без года", unique_title="no_year", year=None, artist_id=prolific.id, museum_id=sample_painting.museum_id),
+            Painting(title="Красный квадрат", unique_title="red_1915", year=1930, artist_id=prolific.id, museum_id=sample_painting.museum_id),
+        ])
+        test_db.commit()
+        return [sample_artist, prolific, idle]
+
+    def test_list_artists_with_stats(self, client, artists, sql_statements):
+        """Тест списка со статистикой картин одним запросом"""
+        response = client.get("/artists")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        stats = {row["id"]: (row["painting_count"], row["first_year"], row["last_year"]) for row in data}
+        assert stats == {
+            artists[0].id: (1, 1950, 1950),
+            artists[1].id: (3, 1915, 1930),
+            artists[2].id: (0, None, None),
+        }
+        assert data[0]["artist_long_name"] == "Тестовый Художник Полное Имя"
+        assert len(sql_statements) == 1
+
+    def test_list_artists_cursor_pagination(self, client, artists):
+        """Тест курсорной пагинации вперед и назад"""
+        first = client.get("/artists", params={"page_size": 2}).json()
+        assert [row["id"] for row in first["data"]] == [artists[0].id, artists[1].id]
+        assert first["has_next"] is True
+
+        second = client.get("/artists", params={"page_size": 2, "cursor": first["next_cursor"]}).json()
+        assert [row["id"] for row in second["data"]] == [artists[2].id]
+        assert second["has_next"] is False
+        assert second["has_prev"] is True
+
+        back = client.get("/artists", params={"page_size": 2, "cursor": second["prev_cursor"]}).json()
+        assert [row["id"] for row in back["data"]] == [artists[0].id, artists[1].id]
+
+    def test_get_artist_by_id(self, client, artists):
+        """Тест получения художника со статистикой"""
+        response = client.get(f"/artists/{artists[1].id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["artist_short_name"] == "Малевич К.С."
+        assert data["painting_count"] == 3
+
+    def test_get_artist_not_found(self, client):
+        """Тест получения несуществующего художника"""
+        assert client.get("/artists/999").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/artists/999/paintings").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_artist_paintings(self, client, artists):
+        """Тест картин художника с курсорной пагинацией по году"""
+        first = client.get(f"/artists/{artists[1].id}/paintings", params={"page_size": 2}).json()
+        assert [row["title"] for row in first["data"]] == ["Черный квадрат", "Красный квадрат"]
+        assert first["total"] is None
+
+        second = client.get(
+            f"/artists/{artists[1].id}/paintings",
+            params={"page_size": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert [row["title"] for row in second["data"]] == ["Без года"]
+        assert second["has_next"] is False
+
+    def test_artist_stats_follow_painting_writes(self, client, artists, sample_museum):
+        """Тест что кэш статистики сбрасывается при создании картины"""
+        assert client.get(f"/artists/{artists[2].id}").json()["painting_count"] == 0
+
+        client.post("/paintings", json={
+            "title": "Первая", "year": 1920, "artist_id": artists[2].id, "museum_id": sample_museum.id,
+        })
+
+        data = client.get(f"/artists/{artists[2].id}").json()
+        assert (data["painting_count"], data["first_year"], data["last_year"]) == (1, 1920, 1920)
@@ -62,4 +62,95 @@ class TestBusinessLogic:
         
         assert first_unique_title != second_unique_title
         
-        assert second_unique_title == f"{first_unique_title}_1"
\ No newline at end of file
+        assert second_unique_title == f"{first_unique_title}_1"
+
+    def test_unique_title_reuses_freed_suffix(self, client, sample_artist, sample_museum):
+        """Тест что освободившийся номер занимается снова"""
+        data = {
+            "title": "Композиция",
+            "year": 1915,
+            "artist_id": sample_artist.id,
+            "museum_id": sample_museum.id
+        }
+        titles = [client.post("/paintings", json=data).json() for _ in range(3)]
+        assert [item["unique_title"] for item in titles] == [
+            "kompozitsija_1915", "kompozitsija_1915_1", "kompozitsija_1915_2"
+        ]
+
+        client.delete(f"/paintings/{titles[1]['id']}")
+
+        response = client.post("/paintings", json=data)
+        assert response.json()["unique_title"] == "kompozitsija_1915_1"
+
+    def test_unique_title_update_keeps_own_title(self, client, sample_artist, sample_museum):
+        """Тест что при обновлении картина не конфликтует сама с собой"""
+        response = client.post("/paintings", json={
+            "title": "Композиция",
+            "year": 1915,
+            "artist_id": sample_artist.id,
+            "museum_id": sample_museum.id
+        })
+        painting = response.json()
+
+        response = client.put(f"/paintings/{painting['id']}", json={"title": "композиция"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["unique_title"] == "kompozitsija_1915"
+
+    def test_unique_title_retry_on_concurrent_insert(self, client, sample_painting, monkeypatch):
+        """Тест повторной попытки, если unique_title занят параллельной записью"""
+        from app.routers import paintings
+
+        original = paintings._generate_painting_unique_title
+        calls = []
+
+        async def racing_generate(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                # Имитация гонки: имя, которое "успел" занять другой писатель
+                return sample_painting.unique_title
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(paintings, "_generate_painting_unique_title", racing_generate)
+
+        response = client.post("/paintings", json={
+            "title": "Гонка",
+            "year": 1920,
+            "artist_id": sample_painting.artist_id,
+            "museum_id": sample_painting.museum_id
+        })
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["unique_title"] == "gonka_1920"
+        assert len(calls) == 2
+
+    def test_unique_title_retry_on_concurrent_update(self, client, sample_artist, sample_museum, monkeypatch):
+        """Тест повторной попытки обновления при конфликте unique_title"""
+        from app.routers import paintings
+
+        created = [
+            client.post("/paintings", json={
+                "title": title,
+                "artist_id": sample_artist.id,
+                "museum_id": sample_museum.id
+            }).json()
+            for title in ["Первая", "Вторая"]
+        ]
+
+        original = paintings._generate_painting_unique_title
+        calls = []
+
+        async def racing_generate(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                return created[1]["unique_title"]
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(paintings, "_generate_painting_unique_title", racing_generate)
+
+        response = client.put(f"/paintings/{created[0]['id']}", json={"title": "Третья", "year": 1930})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["unique_title"] == "tretja_1930"
+        assert response.json()["year"] == 1930
+        assert len(calls) == 2
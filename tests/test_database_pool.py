@@ -0,0 +1,59 @@
+import pytest
+from fastapi import status
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import InstrumentedAsyncQueuePool, pool_metrics
+
+class TestPoolMetrics:
+    @pytest.fixture
+    def metrics(self):
+        pool_metrics.reset()
+        yield pool_metrics
+        pool_metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_checkout_wait_and_timeout_are_recorded(self, metrics, tmp_path):
+        """Тест учета выдач, ожидания и таймаутов пула"""
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        metrics.instrument(engine.sync_engine.pool)
+        try:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+                snapshot = metrics.snapshot(engine.sync_engine.pool)
+                assert snapshot["checked_out"] == 1
+                assert snapshot["pool_size"] == 1
+
+                # Единственное соединение занято - второй запрос ждет и падает по таймауту
+                with pytest.raises(PoolTimeoutError):
+                    async with engine.connect():
+                        pass
+
+            snapshot = metrics.snapshot(engine.sync_engine.pool)
+            assert snapshot["checkouts_total"] == 1
+            assert snapshot["checkins_total"] == 1
+            assert snapshot["checked_out"] == 0
+            assert snapshot["timeouts_total"] == 1
+            assert snapshot["wait_seconds"]["count"] == 2
+            assert snapshot["wait_seconds"]["sum"] >= 0.05
+            assert snapshot["wait_seconds"]["buckets"]["+Inf"] == 2
+            assert snapshot["wait_seconds"]["buckets"]["0.01"] == 1
+        finally:
+            await engine.dispose()
+
+    def test_pool_metrics_endpoint(self, client):
+        """Тест эндпоинта состояния пула"""
+        response = client.get("/metrics/pool")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert "checkouts_total" in data
+        assert "+Inf" in data["wait_seconds"]["buckets"]
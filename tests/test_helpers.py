@@ -1,49 +1,73 @@
 import pytest
 from fastapi import HTTPException
-from unittest.mock import Mock
-from app.routers.paintings import _generate_painting_unique_title, _check_artist_exists, _check_museum_exists
+from unittest.mock import AsyncMock
+from app.routers.paintings import (
+    _generate_painting_unique_title,
+    _next_free_unique_title,
+    _check_museum_exists,
+    _get_artist_long_name,
+)
 
 class TestHelperFunctions:
-    def test_generate_unique_title_basic(self):
+    @pytest.mark.asyncio
+    async def test_generate_unique_title_basic(self):
         """Тест базовой генерации unique_title"""
-        result = _generate_painting_unique_title("Тест Картина", 2024, None, None)
+        result = await _generate_painting_unique_title("Тест Картина", 2024, None, None)
         assert result == "test_kartina_2024"
-    
-    def test_generate_unique_title_with_special_chars(self):
+
+    @pytest.mark.asyncio
+    async def test_generate_unique_title_with_special_chars(self):
         """Тест генерации с специальными символами"""
-        result = _generate_painting_unique_title("Картина #1!", 2024, None, None)
+        result = await _generate_painting_unique_title("Картина #1!", 2024, None, None)
         assert result == "kartina_1_2024"
-    
-    def test_generate_unique_title_without_year(self):
+
+    @pytest.mark.asyncio
+    async def test_generate_unique_title_without_year(self):
         """Тест генерации без года"""
-        result = _generate_painting_unique_title("Тест", None, None, None)
+        result = await _generate_painting_unique_title("Тест", None, None, None)
         assert result == "test"
-    
-    def test_generate_unique_title_unique_check(self):
+
+    @pytest.mark.asyncio
+    async def test_generate_unique_title_unique_check(self):
         """Тест проверки уникальности с базой данных"""
-        mock_db = Mock()
-        mock_painting = Mock()
-        
-        # Настройка mock чтобы первый вызов возвращал картину (уже существует), второй - None (уникально)
-        mock_db.query.return_value.filter.return_value.first.side_effect = [mock_painting, None]
-        
-        result = _generate_painting_unique_title("Тест", 2024, mock_db, None)
+        mock_db = AsyncMock()
+
+        # Базовое название уже занято
+        mock_db.scalars.return_value = ["test_2024"]
+
+        result = await _generate_painting_unique_title("Тест", 2024, mock_db, None)
         assert result == "test_2024_1"  # Должен добавить номер
-    
-    def test_check_artist_exists_success(self):
-        """Тест успешной проверки художника"""
-        mock_db = Mock()
-        mock_artist = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_artist
-        
-        result = _check_artist_exists(1, mock_db)
-        assert result is True
-    
-    def test_check_artist_exists_not_found(self):
+        # Все занятые варианты получены одним запросом
+        assert mock_db.scalars.await_count == 1
+
+    def test_next_free_unique_title_fills_gap(self):
+        """Тест выбора первого свободного номера"""
+        taken = {"test_2024", "test_2024_1", "test_2024_3", "test_2024_abc"}
+
+        assert _next_free_unique_title("test_2024", taken) == "test_2024_2"
+
+    def test_next_free_unique_title_ignores_other_bases(self):
+        """Тест что номера других названий не учитываются"""
+        taken = {"test", "test_2024"}
+
+        assert _next_free_unique_title("test", taken) == "test_1"
+        assert _next_free_unique_title("test_1", taken) == "test_1"
+
+    @pytest.mark.asyncio
+    async def test_get_artist_long_name_success(self):
+        """Тест получения полного имени художника"""
+        mock_db = AsyncMock()
+        mock_db.scalar.return_value = "Тестовый Художник Полное Имя"
+
+        result = await _get_artist_long_name(1, mock_db)
+        assert result == "Тестовый Художник Полное Имя"
+
+    @pytest.mark.asyncio
+    async def test_get_artist_long_name_not_found(self):
         """Тест проверки несуществующего художника"""
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        
+        mock_db = AsyncMock()
+        mock_db.scalar.return_value = None
+
         with pytest.raises(HTTPException) as exc_info:
-            _check_artist_exists(999, mock_db)
-        assert exc_info.value.status_code == 404
\ No newline at end of file
+            await _get_artist_long_name(999, mock_db)
+        assert exc_info.value.status_code == 404
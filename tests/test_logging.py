@@ -0,0 +1,82 @@
+import logging
+import queue
+
+import pytest
+
+from app import logger as app_logger
+from app.logger import log_execution
+from app.logging_config import BoundedQueueHandler, setup_logging
+
+@pytest.fixture
+def captured_records(log_records, monkeypatch):
+    monkeypatch.setattr(logging.getLogger("app.test_logging"), "propagate", False)
+    return log_records("app.test_logging")
+
+class TestBoundedQueueHandler:
+    def _record(self, level=logging.INFO, msg="запись"):
+        return logging.makeLogRecord({"name": "app.test", "levelno": level, "levelname": logging.getLevelName(level), "msg": msg})
+
+    def test_drop_policy_drops_info_when_full(self):
+        """Тест что при переполнении INFO-записи отбрасываются, а не блокируют обработчик"""
+        log_queue = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue, "drop")
+
+        handler.emit(self._record(msg="первая"))
+        handler.emit(self._record(msg="вторая"))
+
+        assert handler.dropped == 1
+        assert log_queue.get_nowait().getMessage() == "первая"
+
+    def test_drop_is_reported_after_queue_drains(self):
+        """Тест что число пропущенных записей попадает в лог предупреждением"""
+        log_queue = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue, "drop")
+        handler.emit(self._record())
+        handler.emit(self._record())
+        log_queue.get_nowait()
+
+        log_queue.maxsize = 2
+        handler.emit(self._record(msg="после"))
+
+        assert log_queue.get_nowait().getMessage() == "после"
+        warning = log_queue.get_nowait()
+        assert warning.levelno == logging.WARNING
+        assert "пропущено записей: 1" in warning.getMessage()
+
+    def test_unknown_overflow_policy(self):
+        """Тест неизвестной политики переполнения"""
+        with pytest.raises(ValueError):
+            BoundedQueueHandler(queue.Queue(), "spill")
+
+    def test_setup_logging_moves_handlers_to_listener(self):
+        """Тест что файловые и консольный обработчики вызываются из фонового потока"""
+        setup_logging(use_queue=True)
+
+        handlers = logging.getLogger("app").handlers
+        assert len(handlers) == 1
+        assert isinstance(handlers[0], BoundedQueueHandler)
+
+class TestLogExecutionSampling:
+    def test_success_logs_are_sampled(self, captured_records, monkeypatch):
+        """Тест что при LOG_SUCCESS_SAMPLE_RATE=0 успешные вызовы не логируются"""
+        monkeypatch.setattr(app_logger, "LOG_SUCCESS_SAMPLE_RATE", 0.0)
+
+        @log_execution("test_logging")
+        def handler():
+            return "ok"
+
+        assert handler() == "ok"
+        assert captured_records == []
+
+    @pytest.mark.asyncio
+    async def test_errors_are_always_logged(self, captured_records, monkeypatch):
+        """Тест что ошибки логируются независимо от выборки"""
+        monkeypatch.setattr(app_logger, "LOG_SUCCESS_SAMPLE_RATE", 0.0)
+
+        @log_execution("test_logging")
+        async def handler():
+            raise RuntimeError("сбой")
+
+        with pytest.raises(RuntimeError):
+            await handler()
+        assert [record.levelno for record in captured_records] == [logging.ERROR]
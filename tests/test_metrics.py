@@ -0,0 +1,55 @@
+from fastapi import status
+from prometheus_client import REGISTRY
+
+from app.routers import paintings
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+class TestPrometheusMetrics:
+    def test_requests_counted_by_route(self, client, sample_painting):
+        """Тест счетчиков и гистограммы по имени маршрута из log_execution"""
+        labels = {"route": "/paintings", "method": "GET", "status": "200"}
+        before = _sample("http_requests_total", **labels)
+        observed_before = _sample("http_request_duration_seconds_count", route="/paintings", method="GET")
+
+        client.get("/paintings")
+        client.get("/paintings")
+
+        assert _sample("http_requests_total", **labels) == before + 2
+        assert _sample("http_request_duration_seconds_count", route="/paintings", method="GET") == observed_before + 2
+
+    def test_errors_counted(self, client, monkeypatch):
+        """Тест счетчика ошибок сервера"""
+        async def broken_count(*args, **kwargs):
+            raise RuntimeError("сбой подсчета")
+
+        monkeypatch.setattr(paintings, "_count_paintings", broken_count)
+        labels = {"route": "/paintings", "method": "GET", "status": "500"}
+        before = _sample("http_request_errors_total", **labels)
+
+        response = client.get("/paintings")
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert _sample("http_request_errors_total", **labels) == before + 1
+
+    def test_cache_hits_and_misses(self, client, sample_painting):
+        """Тест учета попаданий в кэш ответов"""
+        hits = _sample("cache_lookups_total", cache="paintings_response", result="hit")
+        misses = _sample("cache_lookups_total", cache="paintings_response", result="miss")
+
+        client.get(f"/paintings/{sample_painting.id}")
+        client.get(f"/paintings/{sample_painting.id}")
+
+        assert _sample("cache_lookups_total", cache="paintings_response", result="miss") == misses + 1
+        assert _sample("cache_lookups_total", cache="paintings_response", result="hit") == hits + 1
+
+    def test_metrics_endpoint(self, client):
+        """Тест эндпоинта /metrics в формате Prometheus"""
+        client.get("/")
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="root",status="200"}' in response.text
+        assert "db_pool_wait_seconds_bucket" in response.text
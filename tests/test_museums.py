@@ -0,0 +1,149 @@
+import pytest
+from fastapi import status
+
+from app.cache import invalidate_painting_caches
+from app.summaries import rebuild_museum_summaries
+
+class TestMuseumsEndpoints:
+    """Тесты API музеев и сводок коллекций"""
+
+    @pytest.fixture
+    def museums(self, test_db, sample_museum):
+        """Музеи в двух городах двух стран"""
+        from app.models import Museum
+
+        rows = [
+            Museum(name="Эрмитаж", name_unique="hermitage", city="Санкт-Петербург", country="Россия"),
+            Museum(name="Лувр", name_unique="louvre", city="Париж", country="Франция"),
+        ]
+        test_db.add_all(rows)
+        test_db.commit()
+        return [sample_museum, *rows]
+
+    def _create(self, client, artist, museum, **data):
+        response = client.post("/paintings", json={
+            "title": "Картина", "artist_id": artist.id, "museum_id": museum.id, **data,
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["id"]
+
+    def test_summary_refreshed_on_create(self, client, museums, sample_artist):
+        """Тест что создание картин обновляет сводку музея"""
+        museum = museums[0]
+        self._create(client, sample_artist, museum, genre="Пейзаж", year=1910)
+        self._create(client, sample_artist, museum, genre="Пейзаж", year=1925)
+        self._create(client, sample_artist, museum, genre="Портрет", year=1901)
+
+        data = client.get(f"/museums/{museum.id}").json()
+        assert data["painting_count"] == 3
+        assert (data["first_year"], data["last_year"]) == (1901, 1925)
+        assert data["top_genres"] == [{"genre": "Пейзаж", "count": 2}, {"genre": "Портрет", "count": 1}]
+
+    def test_summary_follows_update_and_delete(self, client, museums, sample_artist):
+        """Тест переноса картины в другой музей и удаления"""
+        painting_id = self._create(client, sample_artist, museums[0], genre="Пейзаж", year=1910)
+
+        client.put(f"/paintings/{painting_id}", json={"museum_id": museums[1].id})
+        assert client.get(f"/museums/{museums[0].id}").json()["painting_count"] == 0
+        assert client.get(f"/museums/{museums[1].id}").json()["painting_count"] == 1
+
+        client.delete(f"/paintings/{painting_id}")
+        data = client.get(f"/museums/{museums[1].id}").json()
+        assert (data["painting_count"], data["first_year"], data["top_genres"]) == (0, None, [])
+
+    def test_summary_refreshed_on_bulk_import(self, client, museums, sample_artist):
+        """Тест что массовый импорт обновляет сводки всех затронутых музеев"""
+        lines = "".join(
+            f'{{"title": "Импорт {i}", "genre": "Графика", "artist_id": {sample_artist.id}, "museum_id": {museum.id}}}\n'
+            for i, museum in enumerate([museums[0], museums[0], museums[2]])
+        )
+        client.post("/paintings/bulk", content=lines.encode(), headers={"Content-Type": "application/x-ndjson"})
+
+        assert client.get(f"/museums/{museums[0].id}").json()["painting_count"] == 2
+        assert client.get(f"/museums/{museums[2].id}").json()["painting_count"] == 1
+
+    def test_single_writes_apply_deltas_without_aggregating(self, client, museums, sample_artist, sql_statements):
+        """Тест что создание и удаление картины не перечитывают коллекцию музея"""
+        museum = museums[0]
+        self._create(client, sample_artist, museum, genre="Пейзаж", year=1901)
+        middle = self._create(client, sample_artist, museum, genre="Пейзаж", year=1910)
+        self._create(client, sample_artist, museum, genre="Портрет", year=1925)
+        client.delete(f"/paintings/{middle}")
+
+        assert not any("GROUP BY" in statement for statement in sql_statements)
+        data = client.get(f"/museums/{museum.id}").json()
+        assert (data["painting_count"], data["first_year"], data["last_year"]) == (2, 1901, 1925)
+        assert data["top_genres"] == [{"genre": "Пейзаж", "count": 1}, {"genre": "Портрет", "count": 1}]
+
+    def test_removing_boundary_year_rereads_years(self, client, museums, sample_artist):
+        """Тест что удаление картины с первым или последним годом перечитывает границы лет"""
+        museum = museums[0]
+        first = self._create(client, sample_artist, museum, year=1901)
+        self._create(client, sample_artist, museum, year=1910)
+        last = self._create(client, sample_artist, museum, year=1925)
+
+        client.delete(f"/paintings/{first}")
+        client.put(f"/paintings/{last}", json={"year": 1905})
+
+        data = client.get(f"/museums/{museum.id}").json()
+        assert (data["painting_count"], data["first_year"], data["last_year"]) == (2, 1905, 1910)
+
+    def test_list_reads_summaries_without_aggregating_paintings(self, client, museums, sample_artist, sql_statements):
+        """Тест что справочник музеев не обращается к таблице картин"""
+        self._create(client, sample_artist, museums[0], genre="Пейзаж")
+        sql_statements.clear()
+
+        data = client.get("/museums").json()["data"]
+
+        assert [row["painting_count"] for row in data] == [1, 0, 0]
+        assert not any("FROM paintings" in statement for statement in sql_statements)
+
+    def test_filter_by_country_and_city(self, client, museums):
+        """Тест фильтров по стране и городу"""
+        russian = client.get("/museums", params={"country": "Россия"}).json()["data"]
+        assert {row["name"] for row in russian} == {"Тестовый Музей", "Эрмитаж"}
+
+        moscow = client.get("/museums", params={"country": "Россия", "city": "Москва"}).json()["data"]
+        assert [row["name"] for row in moscow] == ["Тестовый Музей"]
+
+    def test_cursor_pagination(self, client, museums):
+        """Тест курсорной пагинации по id"""
+        first = client.get("/museums", params={"page_size": 2}).json()
+        second = client.get("/museums", params={"page_size": 2, "cursor": first["next_cursor"]}).json()
+
+        ids = [row["id"] for row in first["data"] + second["data"]]
+        assert ids == [museum.id for museum in museums]
+        assert second["has_next"] is False
+
+    def test_locations(self, client, museums, sample_artist):
+        """Тест группировки музеев по стране и городу"""
+        self._create(client, sample_artist, museums[1])
+
+        response = client.get("/museums/locations")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {"country": "Россия", "city": "Москва", "museum_count": 1, "painting_count": 0},
+            {"country": "Россия", "city": "Санкт-Петербург", "museum_count": 1, "painting_count": 1},
+            {"country": "Франция", "city": "Париж", "museum_count": 1, "painting_count": 0},
+        ]
+
+    def test_get_museum_not_found(self, client):
+        """Тест получения несуществующего музея"""
+        assert client.get("/museums/999").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_rebuild_matches_incremental_refresh(self, client, test_db, museums, sample_artist):
+        """Тест что полный пересчет дает те же сводки, что и приращения при записи"""
+        self._create(client, sample_artist, museums[0], genre="Пейзаж", year=1910)
+        moved = self._create(client, sample_artist, museums[0], genre="Пейзаж", year=1915)
+        self._create(client, sample_artist, museums[1], genre="Портрет", year=1920)
+        removed = self._create(client, sample_artist, museums[1], genre="Графика", year=1890)
+        client.put(f"/paintings/{moved}", json={"museum_id": museums[1].id, "genre": "Графика"})
+        client.delete(f"/paintings/{removed}")
+        before = client.get("/museums").json()["data"]
+
+        assert rebuild_museum_summaries(test_db.connection()) == 2
+        test_db.commit()
+
+        invalidate_painting_caches()
+        assert client.get("/museums").json()["data"] == before
@@ -0,0 +1,321 @@
+import json
+import pytest
+from fastapi import status
+from app.models import Painting
+
+def _ndjson(*rows) -> bytes:
+    return "\n".join(row if isinstance(row, str) else json.dumps(row, ensure_ascii=False) for row in rows).encode()
+
+class TestPaintingsBulkImport:
+    def test_bulk_import_success(self, client, test_db, sample_artist, sample_museum):
+        """Тест импорта нескольких картин одним запросом"""
+        rows = [
+            {"title": "Без названия", "year": 1915, "artist_id": sample_artist.id, "museum_id": sample_museum.id}
+            for _ in range(3)
+        ]
+        rows.append({"title": "Композиция", "artist_id": sample_artist.id, "museum_id": sample_museum.id,
+                     "style": ["авангард"]})
+
+        response = client.post("/paintings/bulk", content=_ndjson(*rows),
+                               headers={"Content-Type": "application/x-ndjson"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"inserted": 4, "failed": 0, "errors": []}
+        titles = sorted(test_db.query(Painting.unique_title).all())
+        assert [title for (title,) in titles] == [
+            "bez_nazvanija_1915", "bez_nazvanija_1915_1", "bez_nazvanija_1915_2", "kompozitsija"
+        ]
+
+    def test_bulk_import_continues_existing_suffixes(self, client, sample_artist, sample_museum):
+        """Тест что номера unique_title продолжают уже занятые в базе"""
+        data = {"title": "Композиция", "year": 1915, "artist_id": sample_artist.id, "museum_id": sample_museum.id}
+        client.post("/paintings", json=data)
+
+        client.post("/paintings/bulk", content=_ndjson(data, data))
+
+        response = client.get("/paintings?page_size=10")
+        assert sorted(item["unique_title"] for item in response.json()["data"]) == [
+            "kompozitsija_1915", "kompozitsija_1915_1", "kompozitsija_1915_2"
+        ]
+
+    def test_bulk_import_reports_errors_per_line(self, client, sample_artist, sample_museum):
+        """Тест отчета об ошибках по номерам строк"""
+        body = _ndjson(
+            {"title": "Хорошая", "artist_id": sample_artist.id, "museum_id": sample_museum.id},
+            {"title": "Без художника", "artist_id": 999, "museum_id": sample_museum.id},
+            "",
+            "{не json",
+            {"title": "Без музея", "artist_id": sample_artist.id, "museum_id": 999},
+            {"artist_id": sample_artist.id, "museum_id": sample_museum.id},
+        )
+
+        response = client.post("/paintings/bulk", content=body)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["inserted"] == 1
+        assert data["failed"] == 4
+        assert [error["line"] for error in data["errors"]] == [2, 4, 5, 6]
+        assert data["errors"][0]["detail"] == "Художник не найден"
+        assert data["errors"][2]["detail"] == "Музей не найден"
+        assert "title" in data["errors"][3]["detail"]
+
+    def test_bulk_import_spans_several_chunks(self, client, test_db, sample_artist, sample_museum, monkeypatch):
+        """Тест импорта, разбитого на несколько пакетов"""
+        from app.routers import paintings
+        monkeypatch.setattr(paintings, "BULK_IMPORT_CHUNK_SIZE", 2)
+
+        rows = [
+            {"title": "Этюд", "artist_id": sample_artist.id, "museum_id": sample_museum.id}
+            for _ in range(5)
+        ]
+        response = client.post("/paintings/bulk", content=_ndjson(*rows))
+
+        assert response.json()["inserted"] == 5
+        titles = {title for (title,) in test_db.query(Painting.unique_title).all()}
+        assert titles == {"etjud", "etjud_1", "etjud_2", "etjud_3", "etjud_4"}
+
+    def test_bulk_import_invalidates_count_cache(self, client, sample_artist, sample_museum):
+        """Тест что импорт сбрасывает кэш total"""
+        assert client.get("/paintings").json()["total"] == 0
+
+        client.post("/paintings/bulk", content=_ndjson(
+            {"title": "Картина", "artist_id": sample_artist.id, "museum_id": sample_museum.id}
+        ))
+
+        assert client.get("/paintings").json()["total"] == 1
+
+    def test_bulk_import_failure_keeps_caches_of_committed_chunks_fresh(self, client, sample_artist, sample_museum, monkeypatch):
+        """Тест что кэш сбрасывается после закоммиченного пакета, даже если следующий пакет падает"""
+        from app.routers import paintings
+
+        import_chunk = paintings._import_paintings_chunk
+        calls = []
+
+        async def failing_second_chunk(chunk, db, errors):
+            calls.append(chunk)
+            if len(calls) > 1:
+                raise RuntimeError("сбой пакета")
+            return await import_chunk(chunk, db, errors)
+
+        monkeypatch.setattr(paintings, "BULK_IMPORT_CHUNK_SIZE", 1)
+        monkeypatch.setattr(paintings, "_import_paintings_chunk", failing_second_chunk)
+        assert client.get("/paintings").json()["total"] == 0
+
+        row = {"title": "Картина", "artist_id": sample_artist.id, "museum_id": sample_museum.id}
+        response = client.post("/paintings/bulk", content=_ndjson(row, row))
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert client.get("/paintings").json()["total"] == 1
+
+    def test_bulk_import_empty_body(self, client):
+        """Тест пустого тела запроса"""
+        response = client.post("/paintings/bulk", content=b"")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"inserted": 0, "failed": 0, "errors": []}
+
+class TestPaintingsBulkChanges:
+    """Тесты массового изменения и удаления картин"""
+
+    @pytest.fixture
+    def imported(self, client, sample_artist, sample_museum):
+        rows = [
+            {"title": "Этюд", "year": 1910, "genre": "Пейзаж", "artist_id": sample_artist.id, "museum_id": sample_museum.id},
+            {"title": "Этюд", "year": 1912, "genre": "Пейзаж", "artist_id": sample_artist.id, "museum_id": sample_museum.id},
+            {"title": "Портрет", "year": 1915, "genre": "Портрет", "artist_id": sample_artist.id, "museum_id": sample_museum.id},
+        ]
+        client.post("/paintings/bulk", content=_ndjson(*rows))
+        return {item["unique_title"]: item["id"] for item in client.get("/paintings").json()["data"]}
+
+    def test_bulk_update_by_filter(self, client, test_db, imported, sql_statements):
+        """Тест изменения по фильтру одним UPDATE без пересчета unique_title"""
+        from app.models import Museum
+
+        other = Museum(name="Другой музей", name_unique="other")
+        test_db.add(other)
+        test_db.commit()
+
+        response = client.patch("/paintings/bulk", json={
+            "filter": {"genre": "Пейзаж"}, "changes": {"museum_id": other.id, "period": "Ранний период"}
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"updated": 2, "unique_titles_changed": 0}
+        assert len([s for s in sql_statements if s.startswith("UPDATE paintings")]) == 1
+
+        moved = client.get("/paintings", params={"museum_id": other.id}).json()["data"]
+        assert {item["period"] for item in moved} == {"Ранний период"}
+        assert client.get(f"/museums/{other.id}").json()["painting_count"] == 2
+        assert client.get("/paintings/search", params={"q": "Ранний"}).json()["data"] != []
+
+    def test_bulk_update_recomputes_unique_titles(self, client, imported):
+        """Тест пакетного пересчета unique_title при смене года"""
+        ids = [imported["etjud_1910"], imported["etjud_1912"]]
+
+        response = client.patch("/paintings/bulk", json={"ids": ids, "changes": {"year": 1920}})
+
+        assert response.json() == {"updated": 2, "unique_titles_changed": 2}
+        titles = sorted(client.get(f"/paintings/{painting_id}").json()["unique_title"] for painting_id in ids)
+        assert titles == ["etjud_1920", "etjud_1920_1"]
+
+    def test_bulk_update_keeps_matching_unique_title(self, client, imported):
+        """Тест что unique_title, уже соответствующий названию и году, не меняется"""
+        painting_id = imported["portret_1915"]
+
+        response = client.patch("/paintings/bulk", json={"ids": [painting_id], "changes": {"title": "Портрет", "genre": "Жанр"}})
+
+        assert response.json() == {"updated": 1, "unique_titles_changed": 0}
+        assert client.get(f"/paintings/{painting_id}").json()["unique_title"] == "portret_1915"
+
+    def test_bulk_update_validation(self, client, imported):
+        """Тест выбора картин и изменяемых полей"""
+        both = {"ids": [1], "filter": {"genre": "Пейзаж"}, "changes": {"genre": "Жанр"}}
+        assert client.patch("/paintings/bulk", json=both).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        empty_filter = {"filter": {}, "changes": {"genre": "Жанр"}}
+        assert client.patch("/paintings/bulk", json=empty_filter).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        no_changes = {"ids": [1], "changes": {}}
+        assert client.patch("/paintings/bulk", json=no_changes).status_code == status.HTTP_400_BAD_REQUEST
+        missing_artist = {"ids": [1], "changes": {"artist_id": 999}}
+        assert client.patch("/paintings/bulk", json=missing_artist).status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize("selection_filter", [{"style": []}, {"materials": []}, {"artist_name": ""}])
+    def test_empty_filter_values_do_not_select_whole_catalogue(self, client, imported, selection_filter):
+        """Тест что фильтр только из пустых значений отклоняется, а не выбирает все картины"""
+        response = client.request("DELETE", "/paintings/bulk", json={"filter": selection_filter})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = client.patch("/paintings/bulk", json={"filter": selection_filter, "changes": {"genre": "Жанр"}})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        assert client.get("/paintings", params={"genre": "Жанр"}).json()["total"] == 0
+        assert client.get("/paintings").json()["total"] == 3
+
+    def test_selection_condition_rejects_filter_without_conditions(self):
+        """Тест второй защиты: фильтр без SQL-условий не превращается в WHERE без условий"""
+        from fastapi import HTTPException
+        from app.routers.paintings import _selection_condition
+        from app.schemas import PaintingFilters, PaintingSelection
+
+        selection = PaintingSelection.model_construct(ids=None, filter=PaintingFilters.model_construct(style=[]))
+
+        with pytest.raises(HTTPException) as exc_info:
+            _selection_condition(selection, "sqlite")
+        assert exc_info.value.status_code == 400
+
+    def test_bulk_delete(self, client, imported, sample_museum):
+        """Тест удаления по списку ID и по фильтру"""
+        response = client.request("DELETE", "/paintings/bulk", json={"ids": [imported["portret_1915"], 999]})
+        assert response.json() == {"deleted": 1}
+
+        response = client.request("DELETE", "/paintings/bulk", json={"filter": {"year_to": 1910}})
+        assert response.json() == {"deleted": 1}
+
+        assert client.get("/paintings").json()["total"] == 1
+        assert client.get(f"/museums/{sample_museum.id}").json()["painting_count"] == 1
+
+class TestPaintingsUpsert:
+    """Тесты идемпотентной записи картин по unique_title"""
+
+    @pytest.fixture
+    def painting_data(self, sample_artist, sample_museum):
+        return {"title": "Закат", "year": 1905, "genre": "Пейзаж", "artist_id": sample_artist.id, "museum_id": sample_museum.id}
+
+    def test_upsert_creates_updates_and_skips_unchanged(self, client, painting_data, sql_statements):
+        """Тест создания, обновления и пропуска записи без изменений"""
+        response = client.put("/paintings/by-unique-title/sunset_ext", json=painting_data)
+        assert response.status_code == status.HTTP_201_CREATED
+        created = response.json()
+        assert created["unique_title"] == "sunset_ext"
+
+        response = client.put("/paintings/by-unique-title/sunset_ext", json={**painting_data, "genre": "Марина"})
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.json()["id"], response.json()["genre"]) == (created["id"], "Марина")
+        assert client.get("/paintings/search", params={"q": "Марина"}).json()["data"] != []
+
+        sql_statements.clear()
+        response = client.put("/paintings/by-unique-title/sunset_ext", json={**painting_data, "genre": "Марина"})
+        assert response.status_code == status.HTTP_200_OK
+        assert not any(s.startswith(("INSERT", "UPDATE", "DELETE")) for s in sql_statements)
+
+    def test_upsert_not_found(self, client, painting_data):
+        """Тест записи с несуществующим художником или музеем"""
+        response = client.put("/paintings/by-unique-title/x", json={**painting_data, "artist_id": 999})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = client.put("/paintings/by-unique-title/x", json={**painting_data, "museum_id": 999})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_bulk_upsert_counts(self, client, test_db, painting_data, sample_museum):
+        """Тест повторной синхронизации: неизмененные строки не перезаписываются"""
+        rows = [{**painting_data, "unique_title": f"ext_{i}", "year": 1900 + i} for i in range(3)]
+        headers = {"Content-Type": "application/x-ndjson"}
+
+        response = client.put("/paintings/by-unique-title", content=_ndjson(*rows), headers=headers)
+        assert response.json() == {"created": 3, "updated": 0, "unchanged": 0, "failed": 0, "errors": []}
+
+        rows[1]["title"] = "Рассвет"
+        response = client.put("/paintings/by-unique-title", content=_ndjson(*rows, "{}"), headers=headers)
+        data = response.json()
+        assert (data["created"], data["updated"], data["unchanged"], data["failed"]) == (0, 1, 2, 1)
+        assert data["errors"][0]["line"] == 4
+        assert client.get(f"/museums/{sample_museum.id}").json()["painting_count"] == 3
+
+    def test_bulk_upsert_duplicate_in_batch(self, client, painting_data):
+        """Тест что при повторе unique_title в пакете применяется последняя строка"""
+        rows = [{**painting_data, "unique_title": "dup"}, {**painting_data, "unique_title": "dup", "year": 1906}]
+
+        data = client.put("/paintings/by-unique-title", content=_ndjson(*rows)).json()
+
+        assert (data["created"], data["failed"], data["errors"][0]["line"]) == (1, 1, 1)
+        assert client.get("/paintings").json()["data"][0]["year"] == 1906
+
+    def test_regular_update_resets_content_hash(self, client, test_db, painting_data):
+        """Тест что правка через PUT /paintings/{id} не дает синхронизации пропустить строку"""
+        painting_id = client.put("/paintings/by-unique-title/ext", json=painting_data).json()["id"]
+        client.put(f"/paintings/{painting_id}", json={"genre": "Портрет"})
+
+        response = client.put("/paintings/by-unique-title/ext", json=painting_data)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["genre"] == "Пейзаж"
+        test_db.expire_all()
+        assert test_db.get(Painting, painting_id).content_hash is not None
+
+    def test_local_edit_keeps_external_unique_title(self, client, painting_data):
+        """Тест что правка названия не меняет ключ синхронизации и не приводит к дублю"""
+        painting_id = client.put("/paintings/by-unique-title/ext-42", json=painting_data).json()["id"]
+
+        response = client.put(f"/paintings/{painting_id}", json={"title": "Внешняя правка", "year": 1900})
+        assert response.json()["unique_title"] == "ext-42"
+        client.patch("/paintings/bulk", json={"ids": [painting_id], "changes": {"year": 1901}})
+        assert client.get(f"/paintings/{painting_id}").json()["unique_title"] == "ext-42"
+
+        response = client.put("/paintings/by-unique-title/ext-42", json=painting_data)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == painting_id
+        assert response.json()["title"] == painting_data["title"]
+        assert client.get("/paintings").json()["total"] == 1
+
+    def test_bulk_upsert_failure_keeps_caches_of_committed_chunks_fresh(self, client, painting_data, monkeypatch):
+        """Тест что кэш сбрасывается после закоммиченного пакета синхронизации, даже если следующий падает"""
+        from app.routers import paintings
+
+        upsert_chunk = paintings._upsert_paintings_chunk
+        calls = []
+
+        async def failing_second_chunk(chunk, db, errors):
+            calls.append(chunk)
+            if len(calls) > 1:
+                raise RuntimeError("сбой пакета")
+            return await upsert_chunk(chunk, db, errors)
+
+        monkeypatch.setattr(paintings, "BULK_IMPORT_CHUNK_SIZE", 1)
+        monkeypatch.setattr(paintings, "_upsert_paintings_chunk", failing_second_chunk)
+        assert client.get("/paintings").json()["total"] == 0
+
+        rows = [{**painting_data, "unique_title": f"ext_{i}"} for i in range(2)]
+        response = client.put("/paintings/by-unique-title", content=_ndjson(*rows))
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert client.get("/paintings").json()["total"] == 1
@@ -0,0 +1,116 @@
+import pytest
+from fastapi import status
+
+class TestPaintingsResponseCache:
+    def test_detail_has_etag_and_revalidates(self, client, sample_data):
+        """Тест ETag и ответа 304 на совпадающий If-None-Match"""
+        url = f"/paintings/{sample_data['painting'].id}"
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+
+        revalidated = client.get(url, headers={"If-None-Match": etag})
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+        assert revalidated.headers["etag"] == etag
+        assert revalidated.content == b""
+
+    def test_if_none_match_list_and_weak_tags(self, client, sample_data):
+        """Тест списка тегов и слабого сравнения в If-None-Match"""
+        etag = client.get("/paintings").headers["etag"]
+
+        response = client.get("/paintings", headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = client.get("/paintings", headers={"If-None-Match": '"other"'})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_cached_read_does_not_query_database(self, client, sample_data, sql_statements):
+        """Тест что повторное чтение отдается из кэша"""
+        url = f"/paintings/{sample_data['painting'].id}"
+        first = client.get(url)
+        queries_after_first = len(sql_statements)
+
+        second = client.get(url)
+        client.get("/paintings")
+        queries_after_list = len(sql_statements)
+        third_list = client.get("/paintings")
+
+        assert second.content == first.content
+        assert queries_after_first > 0
+        assert len(sql_statements) == queries_after_list
+        assert third_list.status_code == status.HTTP_200_OK
+
+    def test_update_invalidates_cached_responses(self, client, sample_data):
+        """Тест что обновление картины меняет ответ и ETag"""
+        url = f"/paintings/{sample_data['painting'].id}"
+        detail_etag = client.get(url).headers["etag"]
+        list_etag = client.get("/paintings").headers["etag"]
+
+        client.put(url, json={"title": "Новое Название"})
+
+        response = client.get(url, headers={"If-None-Match": detail_etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "Новое Название"
+        assert response.headers["etag"] != detail_etag
+        assert client.get("/paintings").headers["etag"] != list_etag
+
+    def test_delete_invalidates_cached_detail(self, client, sample_data):
+        """Тест что удаленная картина не отдается из кэша"""
+        url = f"/paintings/{sample_data['painting'].id}"
+        assert client.get(url).status_code == status.HTTP_200_OK
+
+        client.delete(url)
+
+        assert client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_not_found_is_not_cached(self, client, sample_artist, sample_museum):
+        """Тест что 404 не попадает в кэш"""
+        assert client.get("/paintings/1").status_code == status.HTTP_404_NOT_FOUND
+
+        client.post("/paintings", json={
+            "title": "Картина",
+            "artist_id": sample_artist.id,
+            "museum_id": sample_museum.id
+        })
+
+        assert client.get("/paintings/1").status_code == status.HTTP_200_OK
+
+    def test_stale_read_is_not_cached_after_concurrent_write(self):
+        """Тест что ответ, прочитанный до сброса кэша, не сохраняется"""
+        from app.cache import ResponseCache, TTLCache
+
+        cache = ResponseCache(TTLCache())
+        generation = cache.generation
+        cache.clear()  # запись в каталог во время чтения
+
+        cached = cache.set("key", b"{}", generation)
+
+        assert cached.etag
+        assert cache.get("key") is None
+
+    def test_stale_count_is_not_cached_after_concurrent_write(self):
+        """Тест что total, посчитанный до сброса кэша, не сохраняется"""
+        from app.cache import TTLCache
+
+        cache = TTLCache()
+        generation = cache.generation
+        cache.clear()  # запись в каталог во время COUNT
+
+        cache.set("key", 10, generation)
+        assert cache.get("key") is None
+
+        cache.set("key", 11, cache.generation)
+        assert cache.get("key") == 11
+
+    def test_incomplete_cache_backend_cannot_be_created(self):
+        """Тест что хранилище без всех методов интерфейса не создается"""
+        from app.cache import CacheBackend
+
+        class GetOnly(CacheBackend):
+            def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            GetOnly()
@@ -1,7 +1,6 @@
 import pytest
 from fastapi import status
 from app.models import Artist, Museum
-from app.dependencies import get_db
 
 class TestPaintingsCRUD:
     # ТЕСТЫ СОЗДАНИЯ (POST)
@@ -90,10 +89,10 @@ class TestPaintingsCRUD:
         response = client.put("/paintings/999", json=data)
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
-    def test_update_painting_change_artist(self, client, sample_painting, sample_artist):
+    def test_update_painting_change_artist(self, client, test_db, sample_painting, sample_artist):
         """Тест смены художника"""
         
-        db = next(client.app.dependency_overrides[get_db]())
+        db = test_db
         new_artist = Artist(
             artist_short_name="Другой Художник",
             artist_long_name="Другой Художник Полное Имя"
@@ -130,7 +129,7 @@ class TestPaintingsCRUD:
         response = client.delete("/paintings/999")
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
-    def test_delete_painting_and_verify_relationships(self, client, sample_data):
+    def test_delete_painting_and_verify_relationships(self, client, test_db, sample_data):
         """Тест что удаление картины не затрагивает художника и музей"""
         painting_id = sample_data["painting"].id
         artist_id = sample_data["artist"].id
@@ -141,7 +140,7 @@ class TestPaintingsCRUD:
         assert response.status_code == status.HTTP_200_OK
         
         # Проверяем что художник и музей остались
-        db = next(client.app.dependency_overrides[get_db]())
+        db = test_db
         artist = db.query(Artist).filter(Artist.id == artist_id).first()
         museum = db.query(Museum).filter(Museum.id == museum_id).first()
         
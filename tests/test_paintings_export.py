@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+import pytest
+from fastapi import status
+
+class TestPaintingsExport:
+    @pytest.fixture
+    def catalogue(self, client, sample_artist, sample_museum):
+        """Несколько картин, созданных через API"""
+        for i in range(5):
+            client.post("/paintings", json={
+                "title": f"Картина {i}",
+                "year": 1900 + i,
+                "style": ["авангард", "кубизм"],
+                "artist_id": sample_artist.id,
+                "museum_id": sample_museum.id
+            })
+
+    def test_export_ndjson(self, client, catalogue, monkeypatch):
+        """Тест выгрузки NDJSON, читаемой несколькими пачками"""
+        from app.routers import paintings
+        monkeypatch.setattr(paintings, "EXPORT_BATCH_SIZE", 2)
+
+        response = client.get("/paintings/export")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="paintings.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["title"] for row in rows] == [f"Картина {i}" for i in range(5)]
+        # Каждая строка совпадает с ответом детального эндпоинта
+        assert rows[0] == client.get(f"/paintings/{rows[0]['id']}").json()
+
+    def test_export_csv(self, client, catalogue, sample_artist, sample_museum):
+        """Тест выгрузки CSV с развернутыми художником и музеем"""
+        response = client.get("/paintings/export?format=csv")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 5
+        assert rows[0]["title"] == "Картина 0"
+        assert rows[0]["style"] == "авангард; кубизм"
+        assert rows[0]["artist_artist_short_name"] == sample_artist.artist_short_name
+        assert rows[0]["museum_name_unique"] == sample_museum.name_unique
+
+    def test_export_empty_catalogue(self, client):
+        """Тест выгрузки пустого каталога"""
+        assert client.get("/paintings/export").text == ""
+
+        response = client.get("/paintings/export?format=csv")
+        assert response.text.splitlines()[0].startswith("id,title,unique_title")
+        assert len(response.text.splitlines()) == 1
+
+    def test_export_invalid_format(self, client):
+        """Тест некорректного формата"""
+        response = client.get("/paintings/export?format=xml")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
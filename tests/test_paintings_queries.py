@@ -41,6 +41,20 @@ class TestPaintingsEndpoints:
         assert len(data["data"]) == 1
         assert data["data"][0]["title"] == "Тестовая Картина"
 
+    def test_get_all_paintings_filter_by_artist_case_insensitive(self, client, sample_data):
+        """Тест регистронезависимой фильтрации по кириллической фамилии"""
+        response = client.get("/paintings?artist_name=тестовый художник")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 1
+
+    def test_get_all_paintings_filter_by_artist_escapes_wildcards(self, client, sample_data):
+        """Тест что % и _ в фильтре ищутся буквально"""
+        response = client.get("/paintings", params={"artist_name": "%"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 0
+
     def test_get_all_paintings_sort_order(self, client, sample_data):
         """Тест сортировки"""
         response = client.get("/paintings?sort_order=desc")
@@ -57,4 +71,452 @@ class TestPaintingsEndpoints:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["title"] == "Тестовая Картина"
-        assert data["id"] == painting_id     
\ No newline at end of file
+        assert data["id"] == painting_id     
+
+class TestPaintingsQueryCount:
+    @pytest.fixture
+    def many_paintings(self, test_db):
+        """Несколько картин разных художников и музеев"""
+        from app.models import Artist, Museum, Painting
+
+        for i in range(5):
+            artist = Artist(
+                artist_short_name=f"Художник {i}",
+                artist_long_name=f"Художник {i} Полное Имя"
+            )
+            museum = Museum(name=f"Музей {i}", name_unique=f"museum_{i}")
+            test_db.add_all([artist, museum])
+            test_db.flush()
+            test_db.add(Painting(
+                title=f"Картина {i}",
+                unique_title=f"kartina_{i}",
+                year=1900 + i,
+                artist_id=artist.id,
+                museum_id=museum.id
+            ))
+        test_db.commit()
+
+    def test_list_query_count_does_not_depend_on_page_size(self, client, many_paintings, sql_statements):
+        """Тест что список картин не подгружает художников и музеи построчно"""
+        response = client.get("/paintings?page_size=5")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert len(data) == 5
+        assert all(item["artist"] is not None and item["museum"] is not None for item in data)
+        # Страница вместе со связями и подсчет total
+        assert len(sql_statements) == 2
+
+    def test_list_with_artist_filter_query_count(self, client, many_paintings, sql_statements):
+        """Тест количества запросов при фильтрации по художнику"""
+        response = client.get("/paintings?artist_name=Художник")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == 5
+        assert len(sql_statements) == 2
+
+    def test_detail_query_count(self, client, sample_data, sql_statements):
+        """Тест что детальная картина загружается одним запросом"""
+        response = client.get(f"/paintings/{sample_data['painting'].id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["artist"]["id"] == sample_data["artist"].id
+        assert response.json()["museum"]["id"] == sample_data["museum"].id
+        assert len(sql_statements) == 1
+
+
+class TestPaintingsCursorPagination:
+    @pytest.fixture
+    def paintings_with_years(self, test_db, sample_artist, sample_museum):
+        """Картины с повторяющимися и пустыми годами"""
+        from app.models import Painting
+
+        years = [1910, None, 1905, 1910, None, 1920, 1905]
+        for i, year in enumerate(years):
+            test_db.add(Painting(
+                title=f"Картина {i}",
+                unique_title=f"kartina_{i}",
+                year=year,
+                artist_id=sample_artist.id,
+                museum_id=sample_museum.id
+            ))
+        test_db.commit()
+
+    def _walk(self, client, params, cursor_key):
+        """Проходит все страницы по курсору и возвращает id в порядке выдачи"""
+        response = client.get("/paintings", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        pages = [response.json()]
+        while pages[-1][cursor_key]:
+            response = client.get("/paintings", params={**params, "cursor": pages[-1][cursor_key]})
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.json())
+        return pages
+
+    def test_cursor_pages_cover_all_rows_in_order(self, client, paintings_with_years):
+        """Тест что курсорные страницы дают стабильный порядок (year, id) без пропусков"""
+        pages = self._walk(client, {"pagination": "cursor", "page_size": 3}, "next_cursor")
+
+        rows = [row for page in pages for row in page["data"]]
+        keys = [(row["year"] is None, row["year"] or 0, row["id"]) for row in rows]
+        assert len(rows) == 7
+        assert keys == sorted(keys)
+        assert [len(page["data"]) for page in pages] == [3, 3, 1]
+        assert pages[0]["has_prev"] is False and pages[0]["prev_cursor"] is None
+        assert pages[-1]["has_next"] is False and pages[-1]["next_cursor"] is None
+        assert all(page["page"] is None for page in pages)
+
+    def test_cursor_desc_is_reverse_of_asc(self, client, paintings_with_years):
+        """Тест что сортировка desc обратна asc"""
+        asc = self._walk(client, {"pagination": "cursor", "page_size": 2}, "next_cursor")
+        desc = self._walk(client, {"pagination": "cursor", "page_size": 2, "sort_order": "desc"}, "next_cursor")
+
+        asc_ids = [row["id"] for page in asc for row in page["data"]]
+        desc_ids = [row["id"] for page in desc for row in page["data"]]
+        assert desc_ids == list(reversed(asc_ids))
+
+    def test_prev_cursor_returns_previous_page(self, client, paintings_with_years):
+        """Тест перехода назад по prev_cursor"""
+        pages = self._walk(client, {"pagination": "cursor", "page_size": 3}, "next_cursor")
+
+        response = client.get("/paintings", params={"page_size": 3, "cursor": pages[2]["prev_cursor"]})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [row["id"] for row in data["data"]] == [row["id"] for row in pages[1]["data"]]
+        assert data["has_next"] is True
+        assert data["has_prev"] is True
+
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_cursor_pages_seek_year_id_index(self, client, test_db, paintings_with_years, sort_order):
+        """Тест что каждая следующая страница ищет по индексу (year, id), а не читает его с начала"""
+        from sqlalchemy import event
+        from tests.conftest import async_engine
+
+        params = {"pagination": "cursor", "page_size": 2, "count": "none", "sort_order": sort_order}
+        cursor = client.get("/paintings", params=params).json()["next_cursor"]
+
+        queries = []
+
+        def before_cursor_execute(conn, db_cursor, statement, parameters, context, executemany):
+            queries.append((statement, parameters))
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            while cursor:
+                cursor = client.get("/paintings", params={**params, "cursor": cursor}).json()["next_cursor"]
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+        assert queries
+        for statement, parameters in queries:
+            plan = test_db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            paintings_step = next(row[-1] for row in plan if " paintings " in f"{row[-1]} ")
+            assert paintings_step.startswith("SEARCH paintings USING INDEX ix_paintings_year_id"), paintings_step
+
+    def test_invalid_cursor(self, client):
+        """Тест некорректного курсора"""
+        response = client.get("/paintings?cursor=not-a-cursor")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestPaintingsCount:
+    def test_count_is_cached_between_pages(self, client, sample_data, sql_statements):
+        """Тест что повторный запрос берет total из кэша"""
+        first = client.get("/paintings").json()
+        statements_after_first = len(sql_statements)
+        second = client.get("/paintings?page=2").json()
+
+        assert first["total"] == second["total"] == 1
+        assert first["count_type"] == "exact"
+        assert second["count_type"] == "cached"
+        # Второй запрос выполняет только выборку страницы
+        assert len(sql_statements) - statements_after_first == 1
+
+    def test_count_cache_is_per_filter(self, client, sample_data):
+        """Тест что кэш total учитывает фильтры"""
+        assert client.get("/paintings").json()["total"] == 1
+
+        response = client.get("/paintings?artist_name=Несуществующий")
+        assert response.json()["total"] == 0
+        assert response.json()["count_type"] == "exact"
+
+    def test_count_cache_invalidated_on_create(self, client, sample_data):
+        """Тест сброса кэша total при создании картины"""
+        assert client.get("/paintings").json()["total"] == 1
+
+        client.post("/paintings", json={
+            "title": "Еще Картина",
+            "artist_id": sample_data["artist"].id,
+            "museum_id": sample_data["museum"].id
+        })
+
+        data = client.get("/paintings").json()
+        assert data["total"] == 2
+        assert data["count_type"] == "exact"
+
+    def test_count_cache_invalidated_on_delete(self, client, sample_data):
+        """Тест сброса кэша total при удалении картины"""
+        assert client.get("/paintings").json()["total"] == 1
+
+        client.delete(f"/paintings/{sample_data['painting'].id}")
+
+        assert client.get("/paintings").json()["total"] == 0
+
+    def test_count_none(self, client, sample_data, sql_statements):
+        """Тест списка без подсчета total"""
+        response = client.get("/paintings?count=none")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        assert data["total_pages"] is None
+        assert data["count_type"] == "none"
+        assert data["has_next"] is False
+        assert len(data["data"]) == 1
+        assert len(sql_statements) == 1
+
+    def test_count_none_detects_next_page(self, client, sample_artist, sample_museum):
+        """Тест has_next без total"""
+        for title in ["Первая", "Вторая"]:
+            client.post("/paintings", json={
+                "title": title,
+                "artist_id": sample_artist.id,
+                "museum_id": sample_museum.id
+            })
+
+        data = client.get("/paintings?count=none&page_size=1").json()
+        assert len(data["data"]) == 1
+        assert data["has_next"] is True
+
+    def test_count_estimated_falls_back_to_exact(self, client, sample_data):
+        """Тест что без статистики PostgreSQL оценка заменяется точным подсчетом"""
+        data = client.get("/paintings?count=estimated").json()
+
+        assert data["total"] == 1
+        assert data["count_type"] == "exact"
+
+    def test_invalid_count_mode(self, client):
+        """Тест некорректного способа подсчета"""
+        response = client.get("/paintings?count=approximate")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+class TestPaintingsSparseFields:
+    def test_fields_narrow_payload_and_select(self, client, sample_data, sql_statements):
+        """Тест что fields= сокращает и ответ, и список колонок SELECT"""
+        response = client.get("/paintings", params={"fields": "title,year,profile_path", "count": "none"})
+
+        assert response.status_code == status.HTTP_200_OK
+        row = response.json()["data"][0]
+        # Поля выводятся в порядке PaintingResponse, id - всегда
+        assert list(row) == ["title", "profile_path", "year", "id"]
+        assert row["title"] == "Тестовая Картина"
+
+        page_query = sql_statements[-1]
+        assert "profile_path" in page_query
+        assert "materials" not in page_query
+        assert "artists" not in page_query and "museums" not in page_query
+
+    def test_include_selects_relations(self, client, sample_data):
+        """Тест что include= выводит только перечисленные связи"""
+        row = client.get("/paintings", params={"include": "artist"}).json()["data"][0]
+
+        assert row["artist"]["artist_short_name"] == "Тестовый Художник"
+        assert "museum" not in row
+        assert "genre" in row
+
+    def test_fields_with_include(self, client, sample_data):
+        """Тест сочетания fields= и include="""
+        row = client.get("/paintings", params={"fields": "title", "include": "museum"}).json()["data"][0]
+
+        assert set(row) == {"id", "title", "museum"}
+        assert row["museum"]["name"] == "Тестовый Музей"
+
+    def test_fields_with_cursor_pagination(self, client, sample_artist, sample_museum):
+        """Тест что курсор строится и при сокращенном наборе полей"""
+        for i in range(3):
+            client.post("/paintings", json={
+                "title": f"Картина {i}",
+                "year": 1900 + i,
+                "artist_id": sample_artist.id,
+                "museum_id": sample_museum.id,
+            })
+
+        first = client.get("/paintings", params={"pagination": "cursor", "page_size": 2, "fields": "title"}).json()
+        second = client.get("/paintings", params={"cursor": first["next_cursor"], "page_size": 2, "fields": "title"}).json()
+
+        assert [row["title"] for row in first["data"] + second["data"]] == ["Картина 0", "Картина 1", "Картина 2"]
+        assert "year" not in first["data"][0]
+
+    def test_detail_fields(self, client, sample_data):
+        """Тест сокращенной карточки картины"""
+        painting_id = sample_data["painting"].id
+        response = client.get(f"/paintings/{painting_id}", params={"fields": "title,year"})
+
+        assert response.json() == {"title": "Тестовая Картина", "year": 1950, "id": painting_id}
+
+    def test_unknown_field(self, client):
+        """Тест неизвестного поля"""
+        response = client.get("/paintings", params={"fields": "title,secret"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "secret" in response.json()["detail"]
+
+@pytest.fixture
+def catalog(test_db, sample_artist, sample_museum):
+    """Картины с разными жанрами, годами, стилями и материалами"""
+    from app.models import Artist, Museum, Painting
+
+    other_artist = Artist(artist_short_name="Другой Х.", artist_long_name="Другой Художник")
+    other_museum = Museum(name="Другой музей", name_unique="other_museum")
+    test_db.add_all([other_artist, other_museum])
+    test_db.flush()
+
+    rows = [
+        ("Велосипедист", "Бытовой", "живопись", 1913, ["кубофутуризм", "авангард"], ["холст", "масло"], sample_artist, sample_museum),
+        ("Черное на черном", "Абстрактный", "живопись", 1918, ["супрематизм", "авангард"], ["холст"], other_artist, sample_museum),
+        ("Ресторан", "Городской пейзаж", "графика", 1915, ["кубизм"], ["бумага", "уголь"], sample_artist, other_museum),
+        ("Без года", "Бытовой", "графика", None, None, None, other_artist, other_museum),
+    ]
+    paintings = {}
+    for i, (title, genre, kind, year, style, materials, artist, museum) in enumerate(rows):
+        paintings[title] = Painting(
+            title=title, unique_title=f"filter_{i}", genre=genre, type=kind, year=year,
+            style=style, materials=materials, artist_id=artist.id, museum_id=museum.id,
+        )
+    test_db.add_all(paintings.values())
+    test_db.commit()
+    return {"paintings": paintings, "other_artist": other_artist, "other_museum": other_museum}
+
+class TestPaintingsFilters:
+    def _titles(self, client, **params):
+        response = client.get("/paintings", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == len(data["data"])
+        return sorted(row["title"] for row in data["data"])
+
+    def test_filter_by_genre_and_type(self, client, catalog):
+        """Тест фильтров по жанру и типу"""
+        assert self._titles(client, genre="Бытовой") == ["Без года", "Велосипедист"]
+        assert self._titles(client, genre="Бытовой", type="графика") == ["Без года"]
+
+    def test_filter_by_year_range(self, client, catalog):
+        """Тест диапазона годов включительно; картины без года не попадают"""
+        assert self._titles(client, year_from=1915) == ["Ресторан", "Черное на черном"]
+        assert self._titles(client, year_from=1913, year_to=1915) == ["Велосипедист", "Ресторан"]
+
+    def test_filter_by_artist_and_museum(self, client, catalog):
+        """Тест фильтров по художнику и музею"""
+        artist_id = catalog["other_artist"].id
+        museum_id = catalog["other_museum"].id
+
+        assert self._titles(client, artist_id=artist_id) == ["Без года", "Черное на черном"]
+        assert self._titles(client, artist_id=artist_id, museum_id=museum_id) == ["Без года"]
+
+    def test_filter_by_style_contains_all(self, client, catalog):
+        """Тест фильтра по JSON-массиву стилей: нужны все перечисленные значения"""
+        assert self._titles(client, style="авангард") == ["Велосипедист", "Черное на черном"]
+        assert self._titles(client, style=["авангард", "супрематизм"]) == ["Черное на черном"]
+        assert self._titles(client, style=["авангард", "кубизм"]) == []
+
+    def test_filter_by_materials(self, client, catalog):
+        """Тест фильтра по JSON-массиву материалов"""
+        assert self._titles(client, materials="холст") == ["Велосипедист", "Черное на черном"]
+        assert self._titles(client, materials=["бумага", "уголь"]) == ["Ресторан"]
+
+    def test_count_cache_is_per_full_filter_set(self, client, catalog):
+        """Тест что кэш total различает все фильтры, а не только artist_name"""
+        assert client.get("/paintings", params={"genre": "Бытовой"}).json()["total"] == 2
+        assert client.get("/paintings", params={"genre": "Абстрактный"}).json()["total"] == 1
+        assert client.get("/paintings", params={"style": "авангард"}).json()["total"] == 2
+        assert client.get("/paintings", params={"style": "кубизм"}).json()["total"] == 1
+
+    def test_invalid_year_range(self, client):
+        """Тест year_from больше year_to"""
+        response = client.get("/paintings", params={"year_from": 1920, "year_to": 1910})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+class TestPaintingsFacets:
+    """Тесты фасетов каталога"""
+
+    def _facet(self, data, name):
+        return {bucket["value"]: bucket["count"] for bucket in data[name]}
+
+    def test_facets_without_filters(self, client, catalog, sql_statements):
+        """Тест всех фасетов одним запросом; NULL-значения не учитываются"""
+        response = client.get("/paintings/facets")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 4
+        assert self._facet(data, "genre") == {"Бытовой": 2, "Абстрактный": 1, "Городской пейзаж": 1}
+        assert self._facet(data, "style") == {"авангард": 2, "кубофутуризм": 1, "супрематизм": 1, "кубизм": 1}
+        assert self._facet(data, "materials") == {"холст": 2, "масло": 1, "бумага": 1, "уголь": 1}
+        assert self._facet(data, "decade") == {1910: 3}
+        assert data["genre"][0] == {"value": "Бытовой", "label": None, "count": 2}
+
+        museums = {bucket["label"]: bucket["count"] for bucket in data["museum"]}
+        assert museums == {"Тестовый Музей": 2, "Другой музей": 2}
+        assert all(isinstance(bucket["value"], int) for bucket in data["museum"])
+
+        facet_queries = [s for s in sql_statements if "UNION ALL" in s]
+        assert len(facet_queries) == 1
+
+    def test_facets_use_list_filters(self, client, catalog):
+        """Тест что фасеты считаются по тем же фильтрам, что и список"""
+        data = client.get("/paintings/facets", params={"style": "авангард"}).json()
+
+        assert data["total"] == 2
+        assert self._facet(data, "genre") == {"Бытовой": 1, "Абстрактный": 1}
+        assert self._facet(data, "materials") == {"холст": 2, "масло": 1}
+        assert self._facet(data, "museum") == {catalog["paintings"]["Велосипедист"].museum_id: 2}
+
+    def test_facets_cache_invalidated_on_write(self, client, catalog, sample_artist, sample_museum):
+        """Тест что ответ кэшируется с ETag и сбрасывается при создании картины"""
+        first = client.get("/paintings/facets")
+        etag = first.headers["ETag"]
+        assert client.get("/paintings/facets", headers={"If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.post("/paintings", json={
+            "title": "Новая", "genre": "Портрет", "year": 1925,
+            "artist_id": sample_artist.id, "museum_id": sample_museum.id,
+        })
+
+        second = client.get("/paintings/facets", headers={"If-None-Match": etag})
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["total"] == 5
+        assert self._facet(second.json(), "decade") == {1910: 3, 1920: 1}
+
+class TestPaintingsBatchGet:
+    """Тесты получения нескольких картин по ID"""
+
+    def test_batch_get_in_request_order(self, client, catalog, sql_statements):
+        """Тест порядка запроса, ненайденных ID и одного SELECT"""
+        ids = [catalog["paintings"][title].id for title in ("Ресторан", "Велосипедист", "Без года")]
+
+        response = client.post("/paintings/batch-get", json={"ids": [ids[0], 999, ids[1], ids[0], ids[2]]})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [row["id"] for row in data["data"]] == ids
+        assert data["not_found"] == [999]
+        assert data["data"][0]["artist"]["artist_short_name"] == "Тестовый Художник"
+        assert data["data"][0]["museum"]["name"] == "Другой музей"
+        assert len([s for s in sql_statements if "FROM paintings" in s]) == 1
+
+    def test_batch_get_sparse_fields(self, client, catalog):
+        """Тест сокращенного ответа через fields"""
+        painting_id = catalog["paintings"]["Ресторан"].id
+
+        response = client.post("/paintings/batch-get", params={"fields": "title"}, json={"ids": [painting_id]})
+
+        assert response.json()["data"] == [{"id": painting_id, "title": "Ресторан"}]
+
+    def test_batch_get_limits(self, client):
+        """Тест пустого и слишком длинного списка ID"""
+        assert client.post("/paintings/batch-get", json={"ids": []}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        too_many = {"ids": list(range(1, 502))}
+        assert client.post("/paintings/batch-get", json=too_many).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
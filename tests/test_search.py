@@ -0,0 +1,97 @@
+import pytest
+from fastapi import status
+
+from app.search import search_document
+
+class TestPaintingsSearch:
+    """Тесты поиска картин (в тестах - SQLite FTS5)"""
+
+    @pytest.fixture
+    def created(self, client, sample_artist, sample_museum):
+        """Картины, созданные через API: поисковый документ заполняется при записи"""
+        ids = {}
+        for title, genre in (
+            ("Вечерний пейзаж у реки", "Пейзаж"),
+            ("Портрет жены", "Портрет"),
+            ("Пейзаж с мостом", "Пейзаж"),
+        ):
+            response = client.post("/paintings", json={
+                "title": title, "genre": genre, "year": 1910,
+                "artist_id": sample_artist.id, "museum_id": sample_museum.id,
+            })
+            assert response.status_code == status.HTTP_201_CREATED
+            ids[title] = response.json()["id"]
+        return ids
+
+    def _titles(self, client, **params):
+        response = client.get("/paintings/search", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [row["title"] for row in response.json()["data"]]
+
+    def test_search_document_text(self):
+        """Тест состава поискового документа"""
+        assert search_document("Ресторан", None, "Русский авангард", "Удальцова Надежда") == \
+            "Ресторан  Русский авангард Удальцова Надежда"
+
+    def test_search_by_title_genre_and_artist(self, client, created):
+        """Тест поиска по названию, жанру и полному имени художника"""
+        assert self._titles(client, q="мостом") == ["Пейзаж с мостом"]
+        assert set(self._titles(client, q="пейзаж")) == {"Вечерний пейзаж у реки", "Пейзаж с мостом"}
+        assert len(self._titles(client, q="Полное Имя")) == 3
+
+    def test_search_by_prefix_and_case(self, client, created):
+        """Тест поиска по началу слова без учета регистра"""
+        assert self._titles(client, q="ПОРТР") == ["Портрет жены"]
+
+    def test_search_pagination_by_cursor(self, client, created):
+        """Тест курсорной пагинации результатов без повторов"""
+        first = client.get("/paintings/search", params={"q": "Тестовый", "page_size": 2}).json()
+        assert first["has_next"] is True
+        assert first["total"] is None
+
+        second = client.get(
+            "/paintings/search",
+            params={"q": "Тестовый", "page_size": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert second["has_next"] is False
+        assert second["has_prev"] is True
+
+        ids = [row["id"] for row in first["data"] + second["data"]]
+        assert sorted(ids) == sorted(created.values())
+
+    def test_search_follows_updates_and_deletes(self, client, created):
+        """Тест синхронизации поискового документа при изменении и удалении"""
+        painting_id = created["Портрет жены"]
+
+        client.put(f"/paintings/{painting_id}", json={"title": "Автопортрет"})
+        assert self._titles(client, q="жены") == []
+        assert self._titles(client, q="Автопортрет") == ["Автопортрет"]
+
+        client.delete(f"/paintings/{painting_id}")
+        assert self._titles(client, q="Автопортрет") == []
+
+    def test_search_bulk_imported(self, client, sample_artist, sample_museum):
+        """Тест что массовый импорт заполняет поисковый документ"""
+        line = (
+            f'{{"title": "Черный квадрат", "artist_id": {sample_artist.id}, '
+            f'"museum_id": {sample_museum.id}}}\n'
+        )
+        response = client.post(
+            "/paintings/bulk",
+            content=line.encode(),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert response.json()["inserted"] == 1
+
+        assert self._titles(client, q="квадрат") == ["Черный квадрат"]
+
+    def test_search_query_syntax_is_not_interpreted(self, client, created):
+        """Тест что спецсинтаксис FTS в запросе не ломает поиск"""
+        assert self._titles(client, q='пейзаж" OR NEAR(') == []
+        assert client.get("/paintings/search", params={"q": "!!!"}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_cursor(self, client):
+        """Тест некорректного курсора"""
+        response = client.get("/paintings/search", params={"q": "пейзаж", "cursor": "broken"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from app import models, schemas
+from app.serialization import dump_json, painting_to_dict, paintings_page_to_dict
+
+def _pydantic_json(response_model, content) -> bytes:
+    """Эталон: сериализация FastAPI по response_model и JSONResponse"""
+    data = response_model.model_validate(content).model_dump(mode="json", by_alias=True)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def _painting(painting_id: int, created_at, with_relations: bool = True) -> models.Painting:
+    painting = models.Painting(
+        id=painting_id,
+        title="Черное на черном \"эскиз\"\n",
+        unique_title=f"black_on_black_{painting_id}",
+        genre="Абстрактный",
+        materials=["холст", "масло"],
+        style=None,
+        year=1918,
+        created_at=created_at,
+    )
+    if with_relations:
+        painting.artist = models.Artist(
+            id=1, artist_short_name="Родченко А.М.", artist_long_name="Родченко Александр Михайлович",
+            created_at=created_at,
+        )
+        painting.museum = models.Museum(
+            id=2, name="Третьяковская галерея", name_unique="tretyakov", zipcode=119017, created_at=None,
+        )
+    return painting
+
+class TestFastSerialization:
+    def test_painting_matches_pydantic(self):
+        """Тест побайтного совпадения карточки картины с сериализацией pydantic"""
+        for created_at in (
+            datetime(2024, 1, 2, 3, 4, 5),
+            datetime(2024, 1, 2, 3, 4, 5, 120000, tzinfo=timezone.utc),
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+            None,
+        ):
+            painting = _painting(1, created_at)
+            assert dump_json(painting_to_dict(painting)) == _pydantic_json(schemas.PaintingResponse, painting)
+
+    def test_page_matches_pydantic(self):
+        """Тест побайтного совпадения страницы с сериализацией pydantic"""
+        content = {
+            "data": [_painting(1, datetime(2024, 1, 2, tzinfo=timezone.utc)), _painting(2, None, with_relations=False)],
+            "total": None,
+            "count_type": "none",
+            "page_size": 2,
+            "has_next": True,
+            "has_prev": False,
+            "next_cursor": "abc",
+        }
+        expected = _pydantic_json(schemas.PaginatedResponse[schemas.PaintingResponse], content)
+
+        assert dump_json(paintings_page_to_dict(content)) == expected
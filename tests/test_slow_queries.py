@@ -0,0 +1,36 @@
+import pytest
+
+from app import slow_queries
+
+@pytest.fixture
+def slow_query_records(log_records):
+    return log_records(slow_queries.logger.name)
+
+class TestSlowQueryLog:
+    def test_slow_query_logged_with_route(self, client, sample_painting, slow_query_records, monkeypatch):
+        """Тест записи медленного запроса с маршрутом и параметрами"""
+        monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+
+        client.get("/paintings", params={"artist_name": "Гонч"})
+
+        assert slow_query_records
+        record = slow_query_records[-1]
+        assert record.route == "/paintings"
+        assert record.duration_ms >= 0
+        assert "paintings" in record.statement
+        assert any("%Гонч%" in logged.getMessage() for logged in slow_query_records)
+
+    def test_fast_queries_not_logged(self, client, sample_painting, slow_query_records, monkeypatch):
+        """Тест что запросы быстрее порога не логируются"""
+        monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD_MS", 60_000.0)
+
+        client.get("/paintings")
+
+        assert slow_query_records == []
+
+    def test_explain_only_for_reads(self):
+        """Тест что EXPLAIN ANALYZE не выполняется для изменяющих запросов"""
+        assert slow_queries._explainable("SELECT * FROM paintings")
+        assert slow_queries._explainable("  with t as (select 1) select * from t")
+        assert not slow_queries._explainable("UPDATE paintings SET year = 1")
+        assert not slow_queries._explainable("WITH d AS (DELETE FROM paintings RETURNING id) SELECT * FROM d")
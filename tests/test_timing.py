@@ -0,0 +1,44 @@
+import re
+
+from fastapi import status
+
+def _server_timing(response) -> dict:
+    """Разбирает Server-Timing в {метрика: (dur, desc)}"""
+    metrics = {}
+    for entry in response.headers["server-timing"].split(","):
+        name, *params = (part.strip() for part in entry.split(";"))
+        values = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return metrics
+
+class TestServerTiming:
+    def test_server_timing_header(self, client, sample_painting):
+        """Тест заголовка Server-Timing со временем SQL и сериализации"""
+        response = client.get("/paintings")
+
+        assert response.status_code == status.HTTP_200_OK
+        metrics = _server_timing(response)
+        assert set(metrics) == {"app", "db", "pool", "serialize"}
+        assert re.fullmatch(r"\d+ queries", metrics["db"][1])
+        assert int(metrics["db"][1].split()[0]) >= 2  # total и страница
+        assert metrics["serialize"][0] > 0
+        assert metrics["app"][0] >= metrics["db"][0]
+
+    def test_cached_response_has_no_queries(self, client, sample_painting):
+        """Тест что ответ из кэша не выполняет SQL"""
+        client.get(f"/paintings/{sample_painting.id}")
+        response = client.get(f"/paintings/{sample_painting.id}")
+
+        assert _server_timing(response)["db"] == (0.0, "0 queries")
+
+    def test_success_log_has_structured_fields(self, client, sample_painting, log_records):
+        """Тест что запись об успешном завершении содержит замеры запроса"""
+        records = log_records("app./paintings")
+
+        client.get("/paintings")
+
+        record = records[-1]
+        assert record.route == "/paintings"
+        assert record.db_queries >= 2
+        assert record.duration_ms >= record.db_ms
+        assert record.serialize_ms > 0